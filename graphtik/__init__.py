@@ -34,7 +34,7 @@ __author__ = "hnguyen, ankostis"  # chronologically ordered
 
 
 from .autograph import Autograph, FnHarvester, autographed
-from .base import AbortedException, IncompleteExecutionError
+from .base import AbortedException, CancelToken, IncompleteExecutionError
 from .fnop import NO_RESULT, NO_RESULT_BUT_SFX, operation
 from .modifier import (
     hcat,
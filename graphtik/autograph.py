@@ -541,8 +541,8 @@ class Autograph(Prefkey):
         """Collect the rest operation arguments from `autographed` decoration."""
         # NOTE: append more arguments as graphtik lib evolves.
         rest_op_args = (
-            "cwd returns_dict aliases endured parallel marshalled node_props".split()
-        )
+            "cwd returns_dict aliases endured parallel marshalled node_props memoize"
+        ).split()
         return {k: v for k, v in decors.items() if k in rest_op_args}
 
     def yield_wrapped_ops(
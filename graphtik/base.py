@@ -14,6 +14,8 @@
 import abc
 import inspect
 import logging
+import threading
+import time
 from collections import abc as cabc
 from functools import partial, partialmethod, wraps
 from typing import (
@@ -37,10 +39,99 @@ class AbortedException(Exception):
     """
     Raised from Network when :func:`.abort_run()` is called, and contains the solution ...
 
-    with any values populated so far.
+    with any values populated so far, the reason in its :attr:`.Solution.aborted`,
+    also when a :class:`CancelToken` of the run got canceled or its deadline expired.
     """
 
 
+class CancelToken:
+    """
+    A per-run :term:`cancellation` signal, with an optional deadline.
+
+    Give it as the `cancel` argument of :meth:`.Pipeline.compute()` & co,
+    and call :meth:`cancel()` from any thread to abort just the runs watching it.
+    """
+
+    def __init__(
+        self,
+        deadline: float = None,
+        *,
+        timeout: float = None,
+        parent: "CancelToken" = None,
+    ):
+        """
+        :param deadline:
+            a :func:`time.time()` timestamp after which the token counts as canceled
+        :param timeout:
+            seconds from now, like `deadline` (the earliest of the two applies)
+        :param parent:
+            another token to cancel this one as well (e.g. a request's token,
+            while this one adds a deadline for some run)
+        """
+        if timeout is not None:
+            expiry = time.time() + timeout
+            deadline = expiry if deadline is None else min(deadline, expiry)
+        self.deadline = deadline
+        self.parent = parent
+        self._event = threading.Event()
+        self._reason = None
+        self._callbacks: List[Callable[[], None]] = []
+
+    def __repr__(self):
+        state = f"canceled: {self.reason}" if self.is_canceled else "active"
+        return f"{type(self).__name__}({state})"
+
+    def cancel(self, reason: str = "canceled") -> None:
+        """Signal cancellation, waking up any executors waiting on this token."""
+        if not self._event.is_set():
+            self._reason = reason
+            self._event.set()
+            for cb in list(self._callbacks):
+                cb()
+
+    @property
+    def is_canceled(self) -> bool:
+        """True if :meth:`cancel()`-ed, the deadline expired, or the `parent` canceled."""
+        return self.reason is not None
+
+    @property
+    def reason(self) -> Optional[str]:
+        """Why it got canceled (or None, if still active)."""
+        if self._event.is_set():
+            return self._reason
+        if self.deadline is not None and time.time() >= self.deadline:
+            return "deadline exceeded"
+        if self.parent is not None:
+            return self.parent.reason
+        return None
+
+    def remaining(self) -> Optional[float]:
+        """Seconds until the earliest deadline (never negative), or None if no deadline."""
+        deadlines = []
+        token = self
+        while token is not None:
+            if token.deadline is not None:
+                deadlines.append(token.deadline)
+            token = token.parent
+        if not deadlines:
+            return None
+        return max(0.0, min(deadlines) - time.time())
+
+    def add_callback(self, cb: Callable[[], None]) -> None:
+        """Call `cb` (from the canceling thread) on :meth:`cancel()` of this or `parent` tokens."""
+        token = self
+        while token is not None:
+            token._callbacks.append(cb)
+            token = token.parent
+
+    def remove_callback(self, cb: Callable[[], None]) -> None:
+        token = self
+        while token is not None:
+            if cb in token._callbacks:
+                token._callbacks.remove(cb)
+            token = token.parent
+
+
 class IncompleteExecutionError(Exception):
     """
     Reported when any :term:`endured`/:term:`reschedule` operations were are canceled.
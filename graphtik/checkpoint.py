@@ -0,0 +1,208 @@
+# Copyright 2023-2023, Kostis Anagnostopoulos;
+# Licensed under the terms of the Apache License, Version 2.0. See the LICENSE file associated with the project for terms.
+"""
+:term:`checkpoint` stores, persisting operation outputs to :term:`resume` crashed runs.
+
+.. seealso:: the `checkpoint` & `resume` arguments of :meth:`.ExecutionPlan.execute()`
+    and :meth:`.Pipeline.compute()`.
+"""
+import hashlib
+import json
+import logging
+import os
+import pickle
+import threading
+from typing import Any, Iterator, List, Mapping, Optional, Tuple
+
+log = logging.getLogger(__name__)
+
+
+def inputs_fingerprint(named_inputs: Mapping) -> Optional[str]:
+    """
+    A stable hash of the `named_inputs`, to detect checkpoints of different runs.
+
+    :return:
+        the hex-digest, or None if some value could not be pickled
+    """
+    try:
+        items = sorted(((str(k), v) for k, v in named_inputs.items()), key=lambda i: i[0])
+        blob = pickle.dumps(items, pickle.HIGHEST_PROTOCOL)
+    except Exception as ex:
+        log.debug("Cannot fingerprint checkpoint inputs due to: %s", ex)
+        return None
+
+    return hashlib.sha1(blob).hexdigest()
+
+
+def net_fingerprint(net) -> str:
+    """
+    A stable hash of the operations in `net` (names, functions & dependencies).
+
+    Detects checkpoints saved by a different pipeline, even with the same op names
+    (but not any changes in the code of the functions).
+    """
+    from .base import func_name
+    from .planning import yield_ops
+
+    ops = [
+        (
+            op.name,
+            func_name(getattr(op, "fn", None), None, mod=1, fqdn=1, partials=1),
+            [str(n) for n in op.needs],
+            [str(p) for p in op.provides],
+        )
+        for op in yield_ops(net.graph)
+    ]
+    blob = json.dumps(ops).encode("utf-8")
+
+    return hashlib.sha1(blob).hexdigest()
+
+
+class CheckpointStore:
+    """
+    A directory keeping the outputs of each operation executed, to :term:`resume` a run.
+
+    The outputs of each operation are pickled in a separate file, and then
+    its name is appended in a json-lines *manifest* (after a header line written
+    atomically), so a crash may lose at most the operation being saved,
+    never corrupt the store.
+    """
+
+    manifest_fname = "manifest.jsonl"
+    suffix = ".ckpt.pkl"
+
+    def __init__(self, directory: str):
+        """
+        :param directory:
+            where to store the files (created if missing)
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self._lock = threading.Lock()
+        # the number of steps in the manifest, if known (not to re-read it)
+        self._nsteps = None
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.directory!r})"
+
+    def _fpath(self, fname):
+        return os.path.join(self.directory, fname)
+
+    def _write_atomically(self, fname, write, mode="wb"):
+        fpath = self._fpath(fname)
+        tmp_fpath = f"{fpath}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_fpath, mode) as f:
+            write(f)
+        os.replace(tmp_fpath, fpath)
+
+    def read_manifest(self) -> Optional[dict]:
+        """
+        Return the manifest dict (``inputs``, ``net`` & ``steps`` keys) or None if missing.
+
+        Any truncated line (crashed while appended) is ignored.
+        """
+        try:
+            with open(self._fpath(self.manifest_fname), "rt") as f:
+                header, *lines = f.readlines()
+        except (FileNotFoundError, ValueError):
+            return None
+
+        manifest = json.loads(header)
+        steps: List[list] = []
+        manifest["steps"] = steps
+        for line in lines:
+            try:
+                steps.append(json.loads(line))
+            except ValueError:
+                log.warning("Ignoring corrupted line in %s manifest: %s", self, line)
+        return manifest
+
+    def _write_header(self, inputs_key, net_key):
+        header = json.dumps({"inputs": inputs_key, "net": net_key})
+        self._write_atomically(
+            self.manifest_fname, lambda f: f.write(f"{header}\n"), mode="wt"
+        )
+        self._nsteps = 0
+
+    def start(self, inputs_key: Optional[str], net_key: str = None) -> None:
+        """Drop any previous outputs, and begin a new run for `inputs_key` of `net_key`."""
+        with self._lock:
+            self._clear_files()
+            self._write_header(inputs_key, net_key)
+
+    def save(self, op_name: str, outputs: Mapping) -> None:
+        """Pickle the `outputs` of an operation, and append its name in the manifest."""
+        with self._lock:
+            nsteps, line_sep = self._nsteps, ""
+            if nsteps is None:
+                manifest = self.read_manifest()
+                if manifest is None:
+                    self._write_header(None, None)
+                    nsteps = 0
+                else:
+                    nsteps = len(manifest["steps"])
+                    # Terminate any line truncated by a crash.
+                    with open(self._fpath(self.manifest_fname), "rb") as f:
+                        f.seek(-1, os.SEEK_END)
+                        if f.read(1) != b"\n":
+                            line_sep = "\n"
+            fname = f"{nsteps:05d}{self.suffix}"
+            self._write_atomically(
+                fname,
+                lambda f: pickle.dump(dict(outputs), f, pickle.HIGHEST_PROTOCOL),
+            )
+            with open(self._fpath(self.manifest_fname), "at") as f:
+                f.write(f"{line_sep}{json.dumps([op_name, fname])}\n")
+            self._nsteps = nsteps + 1
+
+    def load(
+        self, inputs_key: Optional[str], net_key: str = None
+    ) -> Iterator[Tuple[str, Mapping[str, Any]]]:
+        """
+        Yield ``(op_name, outputs)`` of the operations saved, in execution order.
+
+        :param inputs_key:
+            the :func:`inputs_fingerprint()` of the run to resume;
+            nothing is yielded unless it equals the stored one (and is not None)
+        :param net_key:
+            the :func:`net_fingerprint()` of the run to resume;
+            nothing is yielded unless it equals the stored one
+        """
+        manifest = self.read_manifest()
+        if not manifest:
+            return
+        stored_key = manifest.get("inputs")
+        if inputs_key is None or stored_key != inputs_key:
+            log.warning(
+                "Ignoring %s, taken for different (or unhashable) inputs (%s != %s).",
+                self,
+                stored_key,
+                inputs_key,
+            )
+            return
+        if manifest.get("net") != net_key:
+            log.warning(
+                "Ignoring %s, taken by a different pipeline (%s != %s).",
+                self,
+                manifest.get("net"),
+                net_key,
+            )
+            return
+        for op_name, fname in manifest["steps"]:
+            with open(self._fpath(fname), "rb") as f:
+                yield op_name, pickle.load(f)
+
+    def _clear_files(self):
+        for f in os.listdir(self.directory):
+            if f.endswith(self.suffix) or f == self.manifest_fname:
+                os.remove(self._fpath(f))
+
+    def clear(self) -> None:
+        """Delete the manifest and all outputs files."""
+        with self._lock:
+            self._clear_files()
+            self._nsteps = None
+
+    def __len__(self):
+        manifest = self.read_manifest()
+        return len(manifest["steps"]) if manifest else 0
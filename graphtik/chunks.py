@@ -0,0 +1,167 @@
+# Copyright 2023-2023, Kostis Anagnostopoulos;
+# Licensed under the terms of the Apache License, Version 2.0. See the LICENSE file associated with the project for terms.
+"""
+:term:`chunked` values flowing lazily between operations.
+
+.. seealso:: the `chunked` argument of :func:`.operation()`
+"""
+import logging
+import threading
+from collections import deque
+from itertools import chain
+from typing import Any, Callable, Iterable, Iterator, Optional, Sequence
+
+log = logging.getLogger(__name__)
+
+
+def concat_chunks(chunks: Sequence) -> Any:
+    """
+    Concatenate `chunks` according to the type of the 1st one.
+
+    - :mod:`pandas` objects with :func:`pandas.concat()`,
+    - :mod:`numpy` arrays with :func:`numpy.concatenate()`,
+    - strings & bytes joined,
+    - lists & tuples chained into a list,
+    - anything else collected into a list (as if scalar chunks).
+    """
+    if not chunks:
+        return []
+
+    first = chunks[0]
+    module = type(first).__module__
+    if module.startswith("pandas"):
+        import pandas as pd
+
+        return pd.concat(chunks)
+    if module.startswith("numpy") and hasattr(first, "ndim") and first.ndim:
+        import numpy as np
+
+        return np.concatenate(chunks)
+    if isinstance(first, str):
+        return "".join(chunks)
+    if isinstance(first, (bytes, bytearray)):
+        return b"".join(chunks)
+    if isinstance(first, (list, tuple)):
+        return list(chain.from_iterable(chunks))
+
+    return list(chunks)
+
+
+class Chunks:
+    """
+    A :term:`chunked` value, pulling lazily the chunks of a single-pass iterator.
+
+    The producing operation calls its function once, and the chunks of the iterator
+    returned are shared among the `readers` (each :func:`iter()` call claims one),
+    buffering only those not yet read by all of them, so that consumers advancing
+    in lockstep (like chained chunked operations) keep a bounded number of chunks alive.
+
+    While the number of readers is unknown (see :meth:`expect()`), all chunks
+    are kept, and it may be iterated any number of times.
+    """
+
+    def __init__(
+        self,
+        chunks: Iterable,
+        concat: Callable[[Sequence], Any] = None,
+        producer: str = None,
+    ):
+        """
+        :param chunks:
+            an iterable of chunks, iterated just once
+        :param concat:
+            a callable receiving the list of chunks, to give the whole value
+            to non-chunked consumers (default :func:`concat_chunks()`)
+        :param producer:
+            the name of the operation producing the chunks, for messages
+        """
+        self.concat = concat
+        self.producer = producer
+        self._source = iter(chunks)
+        self._error = None
+        self._buffer = deque()
+        self._base = 0  # the index of the 1st chunk in buffer
+        self._readers = None  # expected readers, or None if unknown (keep all)
+        self._cursors = []  # a 1-item list with the next index of each reader
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        producer = f" of op({self.producer})" if self.producer else ""
+        return (
+            f"{type(self).__name__}{producer}(x{self._base + len(self._buffer)} read,"
+            f" x{len(self._buffer)} buffered)"
+        )
+
+    def __getstate__(self):
+        raise TypeError(f"Cannot pickle lazy {self}!")
+
+    def expect(self, readers: Optional[int]) -> None:
+        """
+        Declare how many readers will iterate the chunks (None: unknown, keep all).
+
+        Readers beyond that scream, and chunks read by all of them are dropped;
+        if 0, the source iterator is closed right away.
+        """
+        with self._lock:
+            self._readers = readers
+            if readers == 0:
+                close = getattr(self._source, "close", None)
+                if close:
+                    close()
+                self._source = iter(())
+            self._trim()
+
+    def _trim(self):
+        if self._readers is not None and len(self._cursors) >= self._readers:
+            low = min((c[0] for c in self._cursors), default=self._base)
+            buffer = self._buffer
+            while self._base < low and buffer:
+                buffer.popleft()
+                self._base += 1
+
+    def __iter__(self) -> Iterator:
+        with self._lock:
+            readers = self._readers
+            if readers is not None and len(self._cursors) >= readers:
+                raise RuntimeError(f"{self} already read by all its x{readers} readers!")
+            cursor = [0]
+            self._cursors.append(cursor)
+        return self._read(cursor)
+
+    def _read(self, cursor: list) -> Iterator:
+        try:
+            while True:
+                with self._lock:
+                    i = cursor[0] - self._base
+                    if i < len(self._buffer):
+                        chunk = self._buffer[i]
+                    elif self._error is not None:
+                        raise self._error
+                    else:
+                        try:
+                            chunk = next(self._source)
+                        except StopIteration:
+                            return
+                        except Exception as ex:
+                            self._error = ex
+                            log.debug("Chunked op(%s) failed while read: %s", self.producer, ex)
+                            raise
+                        self._buffer.append(chunk)
+                    cursor[0] += 1
+                    self._trim()
+                yield chunk
+                chunk = None
+        finally:
+            with self._lock:
+                cursor[0] = float("inf")  # an abandoned reader holds nothing
+                self._trim()
+
+    def value(self) -> Any:
+        """Read all chunks and concatenate them into the whole value."""
+        return (self.concat or concat_chunks)(list(self))
+
+
+def _pick_chunks(chunks: Iterable, key) -> Iterator:
+    """Yield just the `key` item of each (multi-output) chunk."""
+    for chunk in chunks:
+        yield chunk[key]
@@ -21,7 +21,7 @@ from contextlib import contextmanager
 from contextvars import ContextVar
 from functools import partial
 from multiprocessing import Value
-from typing import Optional
+from typing import Optional, Union
 
 _debug_env_var = os.environ.get("GRAPHTIK_DEBUG")
 _debug: ContextVar[Optional[bool]] = ContextVar(
@@ -32,10 +32,19 @@ _abort: ContextVar[Optional[bool]] = ContextVar(
     "abort", default=Value(ctypes.c_bool, lock=False)
 )
 _skip_evictions: ContextVar[Optional[bool]] = ContextVar("skip_evictions", default=None)
+_compact_planning: ContextVar[Optional[bool]] = ContextVar(
+    "compact_planning", default=None
+)
+_share_plan_caches: ContextVar[Optional[bool]] = ContextVar(
+    "share_plan_caches", default=None
+)
+_account_memory: ContextVar[Optional[bool]] = ContextVar(
+    "account_memory", default=None
+)
 _layered_solution: ContextVar[Optional[bool]] = ContextVar(
     "layered_solution", default=None
 )
-_execution_pool: ContextVar[Optional["Pool"]] = ContextVar(
+_execution_pool: ContextVar[Union["Pool", "Executor", None]] = ContextVar(
     "execution_pool", default=None
 )
 _parallel_tasks: ContextVar[Optional[bool]] = ContextVar("parallel_tasks", default=None)
@@ -46,6 +55,13 @@ _endure_operations: ContextVar[Optional[bool]] = ContextVar(
 _reschedule_operations: ContextVar[Optional[bool]] = ContextVar(
     "reschedule_operations", default=None
 )
+_memoize_operations: ContextVar[Optional[bool]] = ContextVar(
+    "memoize_operations", default=None
+)
+_memo_store: ContextVar[Optional["MemoStore"]] = ContextVar("memo_store", default=None)
+_plan_cache_size: ContextVar[Optional[int]] = ContextVar("plan_cache_size", default=256)
+_op_costs: ContextVar[Optional["OpCosts"]] = ContextVar("op_costs", default=None)
+_profiler: ContextVar[Optional["Profiler"]] = ContextVar("profiler", default=None)
 
 
 def _getter(context_var) -> Optional[bool]:
@@ -155,6 +171,63 @@ regardless of asked outputs.
 """
 
 
+planning_compacted = partial(_tristate_armed, _compact_planning)
+"""
+Like :func:`set_compact_planning()` as a context-manager, resetting back to old value.
+
+.. seealso:: disclaimer about context-managers at the top of this :mod:`.config` module.
+"""
+is_compact_planning = partial(_getter, _compact_planning)
+"""see :func:`set_compact_planning()`"""
+set_compact_planning = partial(_tristate_set, _compact_planning)
+"""
+When true, :term:`compile` plans with the integer-indexed :term:`compact planning` backend.
+
+It produces the same plans as the default :mod:`networkx` backend
+(which is still used to report any cycles), much faster for big networks.
+
+:return:
+    a "reset" token (see :meth:`.ContextVar.set`)
+"""
+
+
+plan_caches_shared = partial(_tristate_armed, _share_plan_caches)
+"""
+Like :func:`set_share_plan_caches()` as a context-manager, resetting back to old value.
+
+.. seealso:: disclaimer about context-managers at the top of this :mod:`.config` module.
+"""
+is_share_plan_caches = partial(_getter, _share_plan_caches)
+"""see :func:`set_share_plan_caches()`"""
+set_share_plan_caches = partial(_tristate_set, _share_plan_caches)
+"""
+When true, new networks share their :term:`plan cache` with networks of the same operations.
+
+Otherwise (the default), each network gets a private cache,
+unless one is given explicitly (see :class:`.Network`).
+
+:return:
+    a "reset" token (see :meth:`.ContextVar.set`)
+"""
+
+
+memory_accounted = partial(_tristate_armed, _account_memory)
+"""
+Like :func:`set_account_memory()` as a context-manager, resetting back to old value.
+
+.. seealso:: disclaimer about context-managers at the top of this :mod:`.config` module.
+"""
+is_account_memory = partial(_getter, _account_memory)
+"""see :func:`set_account_memory()`"""
+set_account_memory = partial(_tristate_set, _account_memory)
+"""
+When true, :term:`memory accounting` of solution values, into :attr:`.Solution.memory`.
+
+:return:
+    a "reset" token (see :meth:`.ContextVar.set`)
+"""
+
+
 solution_layered = partial(_tristate_armed, _layered_solution)
 """
 Like :func:`set_layered_solution()` as a context-manager, resetting back to old value.
@@ -178,7 +251,7 @@ whether to store operation results into separate :term:`solution layer`
 
 
 @contextmanager
-def execution_pool_plugged(pool: "Optional[Pool]"):
+def execution_pool_plugged(pool: "Union[Pool, Executor, None]"):
     """
     Like :func:`set_execution_pool()` as a context-manager, resetting back to old value.
 
@@ -191,17 +264,22 @@ def execution_pool_plugged(pool: "Optional[Pool]"):
         _execution_pool.reset(resetter)
 
 
-def set_execution_pool(pool: "Optional[Pool]"):
+def set_execution_pool(pool: "Union[Pool, Executor, None]"):
     """
     (deprecated) Set the process-pool for :term:`parallel` plan executions.
 
+    :param pool:
+        a :class:`multiprocessing.pool.Pool` or any :class:`concurrent.futures.Executor`
+        (e.g. a :class:`~concurrent.futures.ThreadPoolExecutor` shared with other code,
+        or a :class:`~concurrent.futures.ProcessPoolExecutor`)
+
     You may have to :also func:`set_marshal_tasks()` to resolve
     pickling issues.
     """
     return _execution_pool.set(pool)
 
 
-def get_execution_pool() -> "Optional[Pool]":
+def get_execution_pool() -> "Union[Pool, Executor, None]":
     """(deprecated) Get the process-pool for :term:`parallel` plan executions."""
     return _execution_pool.get()
 
@@ -292,3 +370,157 @@ Enable/disable globally :term:`rescheduling` for operations returning only *part
     a "reset" token (see :meth:`.ContextVar.set`)
 
 ."""
+
+
+operations_memoized = partial(_tristate_armed, _memoize_operations)
+"""
+Like :func:`set_memoize_operations()` as a context-manager, resetting back to old value.
+
+.. seealso:: disclaimer about context-managers at the top of this :mod:`.config` module.
+"""
+is_memoize_operations = partial(_getter, _memoize_operations)
+"""see :func:`set_memoize_operations()`"""
+set_memoize_operations = partial(_tristate_set, _memoize_operations)
+"""
+Enable/disable globally :term:`memoization` of operation outputs.
+
+:param enable:
+    - If ``None`` (default), respect the `memoize` flag on each operation;
+    - If true/false, force it for all operations.
+
+:return:
+    a "reset" token (see :meth:`.ContextVar.set`)
+
+."""
+
+
+@contextmanager
+def memo_store_plugged(store: "Optional[MemoStore]"):
+    """
+    Like :func:`set_memo_store()` as a context-manager, resetting back to old value.
+
+    .. seealso:: disclaimer about context-managers at the top of this :mod:`.config` module.
+    """
+    resetter = _memo_store.set(store)
+    try:
+        yield
+    finally:
+        _memo_store.reset(resetter)
+
+
+def set_memo_store(store: "Optional[MemoStore]"):
+    """
+    Set the :term:`memoization` store for operations not specifying their own.
+
+    :param store:
+        a :class:`.memoize.MemoStore` instance (e.g. :class:`.memoize.LRUMemoStore`,
+        :class:`.memoize.DirMemoStore`), or None for the :func:`.memoize.default_memo_store()`
+
+    :return:
+        a "reset" token (see :meth:`.ContextVar.set`)
+    """
+    return _memo_store.set(store)
+
+
+def get_memo_store() -> "Optional[MemoStore]":
+    """Get the :term:`memoization` store plugged, if any (see :func:`set_memo_store()`)."""
+    return _memo_store.get()
+
+
+@contextmanager
+def op_costs_plugged(costs: "Optional[OpCosts]"):
+    """
+    Like :func:`set_op_costs()` as a context-manager, resetting back to old value.
+
+    .. seealso:: disclaimer about context-managers at the top of this :mod:`.config` module.
+    """
+    resetter = _op_costs.set(costs)
+    try:
+        yield
+    finally:
+        _op_costs.reset(resetter)
+
+
+def set_op_costs(costs: "Optional[OpCosts]"):
+    """
+    Set where to record & read the :term:`operation cost`\\s for :term:`critical path` scheduling.
+
+    :param costs:
+        a :class:`.costs.OpCosts` instance, or None for the :func:`.costs.default_op_costs()`
+
+    :return:
+        a "reset" token (see :meth:`.ContextVar.set`)
+    """
+    return _op_costs.set(costs)
+
+
+def get_op_costs() -> "Optional[OpCosts]":
+    """Get the :term:`operation cost`\\s plugged, if any (see :func:`set_op_costs()`)."""
+    return _op_costs.get()
+
+
+@contextmanager
+def profiler_plugged(profiler: "Optional[Profiler]"):
+    """
+    Like :func:`set_profiler()` as a context-manager, resetting back to old value.
+
+    .. seealso:: disclaimer about context-managers at the top of this :mod:`.config` module.
+    """
+    resetter = _profiler.set(profiler)
+    try:
+        yield
+    finally:
+        _profiler.reset(resetter)
+
+
+def set_profiler(profiler: "Optional[Profiler]"):
+    """
+    Enable :term:`profiling` of operations into the given `profiler`.
+
+    :param profiler:
+        a :class:`.profiling.Profiler` instance aggregating measurements across runs,
+        or None to stop profiling (the default)
+
+    :return:
+        a "reset" token (see :meth:`.ContextVar.set`)
+    """
+    return _profiler.set(profiler)
+
+
+def get_profiler() -> "Optional[Profiler]":
+    """Get the :term:`profiling` :class:`.Profiler` plugged, if any (see :func:`set_profiler()`)."""
+    return _profiler.get()
+
+
+@contextmanager
+def plan_cache_sized(maxsize: Optional[int]):
+    """
+    Like :func:`set_plan_cache_size()` as a context-manager, resetting back to old value.
+
+    .. seealso:: disclaimer about context-managers at the top of this :mod:`.config` module.
+    """
+    resetter = _plan_cache_size.set(maxsize)
+    try:
+        yield
+    finally:
+        _plan_cache_size.reset(resetter)
+
+
+def set_plan_cache_size(maxsize: Optional[int]):
+    """
+    Set the capacity of :term:`plan cache`\\s created for new networks.
+
+    :param maxsize:
+        the maximum number of :term:`execution plan`\\s kept by each cache
+        (least-recently-used dropped first), or None for unbounded caches;
+        existing caches keep their own :attr:`.PlanCache.maxsize`.
+
+    :return:
+        a "reset" token (see :meth:`.ContextVar.set`)
+    """
+    return _plan_cache_size.set(maxsize)
+
+
+def get_plan_cache_size() -> Optional[int]:
+    """Get the capacity of new :term:`plan cache`\\s (see :func:`set_plan_cache_size()`)."""
+    return _plan_cache_size.get()
@@ -0,0 +1,150 @@
+# Copyright 2023-2023, Kostis Anagnostopoulos;
+# Licensed under the terms of the Apache License, Version 2.0. See the LICENSE file associated with the project for terms.
+"""
+:term:`operation cost`\\s, to prioritize ops along the :term:`critical path` of parallel runs.
+
+.. seealso:: :func:`.op_costs_plugged()` and the ``cost`` key
+    of the `node_props` argument of :func:`.operation`.
+"""
+import logging
+import threading
+import weakref
+from typing import Callable, Mapping, Optional, Tuple
+
+from .base import Operation
+
+log = logging.getLogger(__name__)
+
+_default_costs = None
+
+
+class OpCosts:
+    """
+    The exponential moving average (EMA) of the durations of operations, keyed by identity.
+
+    Durations are recorded for every operation executed ok in parallel runs
+    (or in any run, while plugged with :func:`.op_costs_plugged()`), across runs,
+    and are used to weigh each op when scheduling parallel runs.
+    Operations are keyed by identity (not name, that may clash among pipelines),
+    and forgotten when garbage-collected.
+    """
+
+    def __init__(self, smoothing: float = 0.3, default_cost: float = 1.0):
+        """
+        :param smoothing:
+            the weight (0, 1] of each new duration, vs the older average
+        :param default_cost:
+            the cost of operations never executed, nor declaring a ``cost``
+        """
+        if not 0 < smoothing <= 1:
+            raise ValueError(f"EMA `smoothing` must be in (0, 1], got: {smoothing}")
+        self.smoothing = smoothing
+        self.default_cost = default_cost
+        self._costs = {}  # id(op) --> averaged-ms
+        self._names = {}  # id(op) --> op-name
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"{type(self).__name__}(x{len(self._costs)} ops, smoothing={self.smoothing})"
+
+    def _forget(self, key: int) -> None:
+        with self._lock:
+            self._costs.pop(key, None)
+            self._names.pop(key, None)
+
+    def record(self, op: Operation, elapsed_ms: float) -> None:
+        """Merge a new duration of `op` into its moving average."""
+        key = id(op)
+        with self._lock:
+            old = self._costs.get(key)
+            if old is None:
+                weakref.finalize(op, self._forget, key)
+                self._names[key] = op.name
+            self._costs[key] = (
+                elapsed_ms
+                if old is None
+                else old + self.smoothing * (elapsed_ms - old)
+            )
+
+    def get(self, op: Operation) -> Optional[float]:
+        """The averaged duration (ms) of `op`, or None if never recorded."""
+        return self._costs.get(id(op))
+
+    def cost(self, op: Operation) -> float:
+        """
+        The weight of `op` for scheduling, in this order of precedence:
+
+        - the ``cost`` declared in the op's `node_props`,
+        - the averaged duration recorded (ms),
+        - the :attr:`default_cost`.
+        """
+        declared = (getattr(op, "node_props", None) or {}).get("cost")
+        if declared is not None:
+            return declared
+        cost = self._costs.get(id(op))
+        return self.default_cost if cost is None else cost
+
+    def clear(self) -> None:
+        """Forget all recorded durations."""
+        with self._lock:
+            self._costs.clear()
+            self._names.clear()
+
+    def as_dict(self) -> Mapping[str, float]:
+        """A ``{op-name: averaged-ms}`` of the ops recorded (same-named ones clash)."""
+        names = self._names
+        return {names[k]: cost for k, cost in list(self._costs.items())}
+
+    def __contains__(self, op):
+        return id(op) in self._costs
+
+    def __len__(self):
+        return len(self._costs)
+
+
+def default_op_costs() -> OpCosts:
+    """The process-wide :class:`OpCosts` used when none plugged in configs."""
+    global _default_costs
+
+    if _default_costs is None:
+        _default_costs = OpCosts()
+    return _default_costs
+
+
+def active_op_costs() -> OpCosts:
+    """The :class:`OpCosts` plugged in configs, or the :func:`default_op_costs()` (to schedule parallel runs)."""
+    from .config import get_op_costs
+
+    costs = get_op_costs()
+    return default_op_costs() if costs is None else costs
+
+
+def critical_path_ranks(
+    downstreams: Mapping[Operation, Tuple[Operation, ...]],
+    cost: Callable[[Operation], float],
+) -> Mapping[Operation, float]:
+    """
+    The cost of the longest path from each op until the end of the plan (inclusive).
+
+    Ops providing the same outputs (:term:`overwrite`\\s) are ranked no lower
+    than their later providers, to be started in the order of the plan,
+    as in sequential runs.
+
+    :param downstreams:
+        the ops immediately depending on each op, ordered topologically
+        (as from :meth:`.ExecutionPlan._op_dependencies`)
+    :param cost:
+        a callable returning the weight of each op (e.g. :meth:`OpCosts.cost()`)
+    :return:
+        a dict ``{op: rank}``, to start first the ops with the highest ranks
+    """
+    ranks = {}
+    provider_ranks = {}  # output --> max rank of its (later) providers
+    for op in reversed(list(downstreams)):
+        rank = cost(op) + max((ranks[dop] for dop in downstreams[op]), default=0)
+        provides = getattr(op, "provides", ())
+        rank = max([rank, *(provider_ranks.get(p, rank) for p in provides)])
+        for p in provides:
+            provider_ranks[p] = rank
+        ranks[op] = rank
+    return ranks
@@ -0,0 +1,300 @@
+# Copyright 2023-2023, Kostis Anagnostopoulos;
+# Licensed under the terms of the Apache License, Version 2.0. See the LICENSE file associated with the project for terms.
+"""
+:term:`compact planning` on an integer-indexed (CSR) copy of a :term:`network` graph.
+
+Nodes are numbered in graph-insertion order, and adjacencies are kept
+in "compressed sparse row" arrays, so that pruning, collecting ancestors and
+topo-sorting run on integer arrays & byte-maps, without copying
+any :mod:`networkx` graph, until the final :term:`execution dag` is built.
+
+.. seealso:: :func:`.set_compact_planning()`
+"""
+import heapq
+import logging
+from array import array
+from typing import Collection, Iterable, Iterator, Optional, Tuple
+
+import networkx as nx
+from boltons.setutils import IndexedSet as iset
+
+from .base import Operation
+
+log = logging.getLogger(__name__)
+
+
+class CsrGraph:
+    """
+    The integer-indexed adjacencies of a network graph, built once and immutable.
+
+    :ivar nodes:
+        the graph nodes, in insertion order (their index is their id)
+    :ivar index:
+        the ``{node: id}`` inverse of :attr:`nodes`
+    :ivar is_op:
+        a byte-map of which nodes are operations
+    :ivar succ_ptr, succ, succ_subdoc:
+        the successors of node ``i`` are ``succ[succ_ptr[i]:succ_ptr[i+1]]``,
+        with their "subdoc" edge-flags at the same positions in ``succ_subdoc``
+    :ivar pred_ptr, pred, pred_subdoc, pred_optional:
+        likewise for predecessors, with also their "optional" edge-flags
+    """
+
+    def __init__(self, graph: nx.DiGraph):
+        self.graph = graph
+        self.nodes = nodes = list(graph.nodes)
+        self.index = index = {n: i for i, n in enumerate(nodes)}
+        self.is_op = bytearray(isinstance(n, Operation) for n in nodes)
+
+        def csr(adjacencies, *flags):
+            ptr, idx = array("l", [0]), array("l")
+            flagmaps = [bytearray() for _ in flags]
+            for n in nodes:
+                for nbr, data in adjacencies[n].items():
+                    idx.append(index[nbr])
+                    for fm, flag in zip(flagmaps, flags):
+                        fm.append(bool(data.get(flag)))
+                ptr.append(len(idx))
+            return (ptr, idx, *flagmaps)
+
+        self.succ_ptr, self.succ, self.succ_subdoc = csr(graph.succ, "subdoc")
+        self.pred_ptr, self.pred, self.pred_subdoc, self.pred_optional = csr(
+            graph.pred, "subdoc", "optional"
+        )
+
+    def __repr__(self):
+        return f"{type(self).__name__}(x{len(self.nodes)} nodes, x{len(self.succ)} edges)"
+
+    def ids(self, nodes: Iterable) -> Iterator[int]:
+        """The ids of `nodes`, skipping those not in the graph."""
+        index = self.index
+        return (index[n] for n in nodes if n in index)
+
+    def _chained_docs(
+        self, i: int, dirs: Tuple[bool, ...], stop: bytearray, alive: bytearray = None
+    ) -> Iterator[int]:
+        """
+        Mimic :func:`.planning._yield_also_chained_docs()` on ids.
+
+        :param dirs:
+            true to dig subdocs (successors), false for superdocs (predecessors)
+        :param stop:
+            (growing) byte-map of ids not to yield nor dig into
+        :param alive:
+            byte-map of ids considered in the graph, or None for all
+        """
+        if (alive is not None and not alive[i]) or stop[i]:
+            return
+        yield i
+        for down in dirs:
+            if down:
+                ptr, adj, flags = self.succ_ptr, self.succ, self.succ_subdoc
+            else:
+                ptr, adj, flags = self.pred_ptr, self.pred, self.pred_subdoc
+            for e in range(ptr[i], ptr[i + 1]):
+                if flags[e]:
+                    yield from self._chained_docs(adj[e], (down,), stop, alive)
+
+    def _mark_chaindocs(self, ids: Iterable[int], marks: bytearray, alive=None):
+        """Mark `ids` & their :term:`doc chain`\\s, like ``set.update(yield_chaindocs())``."""
+        for i in ids:
+            for j in self._chained_docs(i, (True, False), marks, alive):
+                marks[j] = 1
+
+    def _topo_sort(self, alive: bytearray, edge_alive) -> Optional[list]:
+        """
+        Topo-sort `alive` ids, breaking ties by insertion order (like :func:`._topo_sort_nodes()`).
+
+        :return:
+            the sorted ids, or None if a cycle remains
+        """
+        succ_ptr, succ, succ_subdoc = self.succ_ptr, self.succ, self.succ_subdoc
+        n_nodes = len(self.nodes)
+        indegree = [0] * n_nodes
+        for u in range(n_nodes):
+            if alive[u]:
+                for e in range(succ_ptr[u], succ_ptr[u + 1]):
+                    v = succ[e]
+                    if edge_alive(v, succ_subdoc[e]):
+                        indegree[v] += 1
+
+        heap = [i for i in range(n_nodes) if alive[i] and not indegree[i]]
+        heapq.heapify(heap)
+        order = []
+        while heap:
+            u = heapq.heappop(heap)
+            order.append(u)
+            for e in range(succ_ptr[u], succ_ptr[u + 1]):
+                v = succ[e]
+                if edge_alive(v, succ_subdoc[e]):
+                    indegree[v] -= 1
+                    if not indegree[v]:
+                        heapq.heappush(heap, v)
+
+        if len(order) != sum(alive):
+            return None
+        return order
+
+    def prune(
+        self,
+        inputs: Optional[Collection],
+        outputs: Optional[Collection],
+        satisfied_inputs: Collection,
+        predicate_filtered: Collection[Operation] = (),
+    ) -> Optional[Tuple[nx.DiGraph, iset, dict]]:
+        """
+        The equivalent of the "broken-dag" middle part of :meth:`.Network._prune_graph()`.
+
+        :param inputs, outputs, satisfied_inputs:
+            as prepared by :meth:`.Network._prune_graph()`
+        :param predicate_filtered:
+            the ops filtered-out by some :term:`node predicate`
+        :return:
+            a 3-tuple (pruned-dag, topo-sorted-nodes, {op: prune-comments}),
+            or None if there were cycles (to let :mod:`networkx` report them)
+        """
+        nodes, index, is_op = self.nodes, self.index, self.is_op
+        pred_ptr, pred, pred_subdoc = self.pred_ptr, self.pred, self.pred_subdoc
+        succ_ptr, succ, succ_subdoc = self.succ_ptr, self.succ, self.succ_subdoc
+        n_nodes = len(nodes)
+
+        alive = bytearray(b"\x01") * n_nodes
+        for i in self.ids(predicate_filtered):
+            alive[i] = 0
+
+        ## Break the incoming (non-subdoc) edges to all given inputs.
+        #
+        broken_in = bytearray(n_nodes)
+        if inputs:
+            for i in self.ids(inputs):
+                broken_in[i] = 1
+
+        def edge_alive(dst, subdoc) -> bool:
+            """Whether the edge to `dst` is in the broken-dag (given its src is)."""
+            return alive[dst] and (subdoc or not broken_in[dst])
+
+        comments = {}
+        if outputs is not None:
+            ## Keep only ancestors of outputs (& their doc-chains) in broken-dag.
+            #
+            ending = bytearray(n_nodes)
+            for out in self.ids(outputs):
+                for doc in self._chained_docs(out, (True, False), ending):
+                    if not alive[doc]:
+                        raise nx.NetworkXError(
+                            f"The node {nodes[doc]} is not in the digraph."
+                        )
+                    stack = [doc]
+                    while stack:
+                        v = stack.pop()
+                        if broken_in[v]:
+                            edges = (
+                                pred[e]
+                                for e in range(pred_ptr[v], pred_ptr[v + 1])
+                                if pred_subdoc[e]
+                            )
+                        else:
+                            edges = pred[pred_ptr[v] : pred_ptr[v + 1]]
+                        for u in edges:
+                            if alive[u] and not ending[u]:
+                                ending[u] = 1
+                                stack.append(u)
+                    ending[doc] = 1
+
+            irrelevant_ops = [
+                op for i, op in enumerate(nodes) if is_op[i] and not ending[i]
+            ]
+            if irrelevant_ops:
+                comments.update((op, "outputs-irrelevant") for op in irrelevant_ops)
+                log.info(
+                    "... dropping output-irrelevant ops%s.\n    +--outputs: %s",
+                    irrelevant_ops,
+                    outputs,
+                )
+            for i in range(n_nodes):
+                alive[i] = alive[i] and ending[i]
+
+        order = self._topo_sort(alive, edge_alive)
+        if order is None:
+            return None
+        sorted_nodes = iset(nodes[i] for i in order)
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug(
+                "...topo-sorted nodes: %s",
+                [getattr(n, "name", n) for n in sorted_nodes],
+            )
+
+        ## Prune unsatisfied operations (those with partial inputs or no outputs),
+        #  like :func:`.unsatisfied_operations()`.
+        #
+        ok_data = bytearray(n_nodes)
+        self._mark_chaindocs(self.ids(satisfied_inputs), ok_data, alive)
+        satisfied = bytearray(n_nodes)  # data ok when visited, in topo-order
+        unsatisfied = bytearray(n_nodes)
+        pred_optional = self.pred_optional
+        for pos, i in enumerate(order):
+            if is_op[i]:
+                outs = [
+                    succ[e]
+                    for e in range(succ_ptr[i], succ_ptr[i + 1])
+                    if edge_alive(succ[e], succ_subdoc[e])
+                ]
+                node = nodes[i]
+                if not outs:
+                    unsatisfied[i] = 1
+                    comments[node] = "needless-outputs"
+                    log.info(
+                        "... pruned step #%i due to needless-outputs\n  %s", pos, node
+                    )
+                    continue
+                real_needs = [
+                    pred[e]
+                    for e in range(pred_ptr[i], pred_ptr[i + 1])
+                    if alive[pred[e]] and not pred_optional[e]
+                ]
+                if all(satisfied[n] for n in real_needs):
+                    self._mark_chaindocs(outs, ok_data, alive)
+                else:
+                    missing = {nodes[n] for n in real_needs} - {
+                        nodes[n] for n in real_needs if satisfied[n]
+                    }
+                    unsatisfied[i] = 1
+                    comments[node] = msg = f"unsatisfied-needs{list(missing)}"
+                    log.info("... pruned step #%i due to %s\n  %s", pos, msg, node)
+            elif ok_data[i]:
+                satisfied[i] = 1
+
+        ## Build the pruned dag from the net's graph (not broken),
+        #  cleaning unlinked data-nodes (except those both given & asked).
+        #
+        kept = bytearray(alive[i] and not unsatisfied[i] for i in range(n_nodes))
+        linked = bytearray(n_nodes)
+        graph = self.graph
+        succ_attrs = graph.succ
+        edges = []
+        for u in range(n_nodes):
+            if kept[u]:
+                src = nodes[u]
+                src_adj = succ_attrs[src]
+                for e in range(succ_ptr[u], succ_ptr[u + 1]):
+                    v = succ[e]
+                    if kept[v]:
+                        dst = nodes[v]
+                        edges.append((src, dst, src_adj[dst].copy()))
+                        linked[u] = linked[v] = 1
+        if outputs is not None:
+            outputs = set(outputs)
+            for i in self.ids(n for n in satisfied_inputs if n in outputs):
+                linked[i] = 1
+
+        node_attrs = graph.nodes
+        pruned_dag = graph.__class__()
+        pruned_dag.graph.update(graph.graph)
+        pruned_dag.add_nodes_from(
+            (n, node_attrs[n].copy())
+            for i, n in enumerate(nodes)
+            if kept[i] and linked[i]
+        )
+        pruned_dag.add_edges_from(edges)
+
+        return pruned_dag, sorted_nodes, comments
@@ -1,14 +1,19 @@
 # Copyright 2016, Yahoo Inc.
 # Licensed under the terms of the Apache License, Version 2.0. See the LICENSE file associated with the project for terms.
 """:term:`execute` the :term:`plan` to derrive the :term:`solution`."""
+import heapq
 import logging
+import os
 import random
 import sys
+import threading
 import time
 from collections import ChainMap, abc, defaultdict, namedtuple
+from concurrent.futures import Executor
 from contextvars import ContextVar, copy_context
-from functools import partial
+from functools import partial, wraps
 from itertools import chain
+from queue import Empty, SimpleQueue
 from typing import Any, Callable, Collection, List, Mapping, Optional, Tuple, Union
 
 import networkx as nx
@@ -17,6 +22,7 @@ from boltons.setutils import IndexedSet as iset
 from .base import (
     UNSET,
     AbortedException,
+    CancelToken,
     IncompleteExecutionError,
     Items,
     Operation,
@@ -26,17 +32,24 @@ from .base import (
     astuple,
     first_solid,
 )
+from .chunks import Chunks
 from .config import (
     get_execution_pool,
+    get_op_costs,
+    get_profiler,
     is_abort,
+    is_account_memory,
     is_debug,
     is_endure_operations,
     is_layered_solution,
     is_marshal_tasks,
+    is_memoize_operations,
     is_parallel_tasks,
     is_reschedule_operations,
     is_skip_evictions,
 )
+from .fnop import NO_RESULT, NO_RESULT_BUT_SFX
+from .memory import Spilled
 from .modifier import (
     acc_contains,
     acc_delitem,
@@ -46,15 +59,20 @@ from .modifier import (
     dep_stripped,
     get_accessor,
     get_jsonp,
+    get_keyword,
+    is_implicit,
+    is_optional,
     is_sfx,
+    is_vararg,
+    is_varargs,
 )
 from .planning import (
     OpMap,
-    unsatisfied_operations,
     yield_chaindocs,
     yield_node_names,
     yield_ops,
 )
+from .profiling import ProfiledResult
 
 #: If this logger is *eventually* DEBUG-enabled,
 #: the string-representation of network-objects (network, plan, solution)
@@ -97,18 +115,48 @@ class Solution(ChainMap, Plottable):
     #: due to upstream failures.
     canceled: OpMap = {}
     elapsed_ms = {}
+    #: A {op: measurements} dictionary, filled only while :term:`profiling`
+    #: (see :data:`.profiling.PROFILE_FIELDS`).
+    profiles: OpMap = {}
+    #: The :class:`.Profiler` aggregating :attr:`profiles` across runs, if plugged.
+    profiler = None
+    #: A {op: (start, end)} dictionary with the timestamps of each task,
+    #: from being prepared until handled (ok or failed).
+    op_spans: OpMap = {}
+    #: A list of ``(timestamp, kind, name, args-dict)`` instant events,
+    #: for ``evict``-ed or ``spill``-ed data and ``failed`` or ``reschedule``-d ops.
+    events: List[tuple] = []
+    #: The :class:`.MemoryTracker` of values alive, while :term:`memory accounting`.
+    memory = None
+    #: The `memory_budget` given to :meth:`.ExecutionPlan.execute()`, if any.
+    memory_budget: Optional[int] = None
+    #: The :class:`.SpillStore` receiving values :term:`spill`\\ed to respect
+    #: the :attr:`memory_budget`.
+    spill_store = None
+    # index in plan's steps of the 1st op still pending, to scan next ops to :term:`spill`
+    _spill_cursor = 0
+    # ``{key: [Spilled, ...]}`` memory-mapped back, to delete their files on eviction
+    _mapped_spills: Mapping[str, list] = {}
+    #: The :class:`.CancelToken` watched while executing, for :term:`cancellation`.
+    cancel_token = None
+    #: Why execution was aborted (e.g. ``"deadline exceeded"``), or None;
+    #: the ops completed until then are in :attr:`executed`.
+    aborted: Optional[str] = None
     #: A unique identifier to distinguish separate flows in execution logs.
     solid: str
-    # FIXME: SPURIOUS dag reversals on multi-threaded runs (see below next assertion)!
-    #: Cloned from `plan` will be modified, by removing the downstream edges of:
-    #:
-    #: - any partial outputs not provided, or
-    #: - all `provides` of failed operations.
-    dag: nx.DiGraph
     #: the plan that produced this solution
     plan = "ExecutionPlan"
     # optimization for the expensive :attr:`.overwrites` dictionary
     _overwrites_cache = None
+    #: The (copy-on-write) edges removed from the plan's dag (see :attr:`dag`).
+    _broken_edges: set
+    # the :attr:`dag` view, recreated when :attr:`_broken_edges` change
+    _dag_view = None
+    # lazily built {key: newest-map} for plain keys of :term:`solution layer`\s
+    _key_index = None
+    #: The :class:`.CheckpointStore` saving the outputs of each operation executed,
+    #: if a `checkpoint` was given to :meth:`.ExecutionPlan.execute()`.
+    checkpoint = None
 
     def __init__(
         self,
@@ -147,6 +195,9 @@ class Solution(ChainMap, Plottable):
         self.canceled = {}
         self.broken = {}
         self.elapsed_ms = {}
+        self.profiles = {}
+        self.op_spans = {}
+        self.events = []
         self.solid = "%X" % random.randint(0, 2**16)
 
         ## Cache context-var flags.
@@ -155,10 +206,17 @@ class Solution(ChainMap, Plottable):
         self.is_reschedule = is_reschedule_operations()
         self.is_parallel = is_parallel_tasks()
         self.is_marshal = is_marshal_tasks()
+        self.profiler = get_profiler()
+        if is_account_memory():
+            self._start_memory_accounting()
+
+        self._broken_edges = set()
+
+    def _start_memory_accounting(self):
+        from .memory import MemoryTracker
 
-        # FIXME: SPURIOUS dag reversals on multi-threaded runs (see below next assertion)!
-        self.dag = plan.dag.copy()
-        # assert next(iter(dag.edges))[0] == next(iter(plan.dag.edges))[0]:
+        self.memory = MemoryTracker()
+        self.memory.add(self.maps[-1].items(), "<inputs>", replace=False)
 
     def copy(self):
         """Deep-copy user's `input_data` and pass the rest into a new Solution."""
@@ -174,14 +232,15 @@ class Solution(ChainMap, Plottable):
         ## replicate "layers"" machinery.
         #
         props = (
-            "is_layered is_endurance is_reschedule is_parallel is_marshal dag"
-            " _initial_inputs executed canceled broken elapsed_ms"
+            "is_layered is_endurance is_reschedule is_parallel is_marshal"
+            " _initial_inputs executed canceled broken elapsed_ms profiles op_spans"
+            " events _broken_edges"
         ).split()
 
         for p in props:
             val = getattr(self, p)
-            if isinstance(val, dict):
-                val = dict(val)
+            if isinstance(val, (dict, set, list)):
+                val = type(val)(val)
             setattr(clone, p, val)
 
         ## Replicate layer setup in constructor, here
@@ -211,30 +270,115 @@ class Solution(ChainMap, Plottable):
         """Outputs by operation, in execution order (last, most recently executed)."""
         return [v for v in self.executed.values() if not isinstance(v, Exception)]
 
-    def _reschedule(self, dag, reason, op):
+    @property
+    def dag(self) -> nx.DiGraph:
+        """
+        The plan's :attr:`.ExecutionPlan.dag`, minus any edges removed during execution.
+
+        Downstream edges are removed (without copying or modifying the plan's dag):
+
+        - from any partial outputs not provided, or
+        - from all `provides` of failed operations.
+
+        :return:
+            the plan's dag itself, if no edges were removed, or a read-only view of it
+        """
+        if not self._broken_edges:
+            return self.plan.dag
+        if self._dag_view is None:
+            self._dag_view = nx.restricted_view(self.plan.dag, (), self._broken_edges)
+        return self._dag_view
+
+    def _break_edges(self, edges):
+        """Hide `edges` from :attr:`dag`, and return the new dag view."""
+        self._broken_edges.update(edges)
+        self._dag_view = None
+        return self.dag
+
+    def _is_data_satisfied(self, dag, node) -> bool:
         """
-        Re-prune dag, and then update and return any newly-canceled ops.
+        Whether `node` (or any of its :term:`doc chain`) exists or is still producible.
+
+        Values exist if in solution (except canceled sideffects),
+        and are producible if some non-canceled operation still provides them in `dag`.
+        """
+        canceled = self.canceled
+        for doc in yield_chaindocs(dag, (node,)):
+            # don't count canceled SFXs as Inputs.
+            if doc in self and (not is_sfx(doc) or self.get(doc, True)):
+                return True
+            if any(
+                isinstance(pred, Operation) and pred not in canceled
+                for pred in dag.predecessors(doc)
+            ):
+                return True
+        return False
+
+    def _reschedule(self, dag, reason, op, broken_nodes: Collection[str]):
+        """
+        Cancel any ops downstream of `broken_nodes` that became :term:`unsatisfied <unsatisfied operation>`.
+
+        Instead of re-pruning the whole `dag`, it walks (in :attr:`.ExecutionPlan.steps`
+        order) only the consumers of `broken_nodes` & their :term:`doc chain`,
+        descending to the outputs of any newly canceled ops.
 
         :param dag:
-            The dag to discover :term:`unsatisfied operation`\\s from.
+            The dag to discover :term:`unsatisfied operation`\\s from,
+            already without the edges from the op to the `broken_nodes`.
         :param reason:
             for logging
         :param op:
             for logging
+        :param broken_nodes:
+            the data-nodes no longer provided by `op`
         """
-        canceled, _sorted_nodes = unsatisfied_operations(
-            dag,
-            [
-                i
-                for i in self
-                # don't send canceled SFXs as Inputs.
-                if not is_sfx(i) or self.get(i, True)
-            ],
-        )
-        # Minus executed, bc partial-out op might not have any provides left.
-        newly_canceled = canceled.keys() - self.canceled.keys() - self.executed.keys()
-        self.canceled.update((k, canceled[k]) for k in newly_canceled)
+        op_index = self.plan._op_index
+        executed, canceled = self.executed, self.canceled
+        candidates = []  # a heap of (step-index, op)
+        pushed = set()
+
+        def push_consumers(nodes):
+            for doc in yield_chaindocs(dag, nodes):
+                for consumer in dag.successors(doc):
+                    if isinstance(consumer, Operation) and consumer not in pushed:
+                        pushed.add(consumer)
+                        heapq.heappush(candidates, (op_index[consumer], consumer))
+
+        newly_canceled = []
+        if not all(self._is_data_satisfied(dag, n) for n in broken_nodes):
+            push_consumers(broken_nodes)
+        while candidates:
+            _, candidate = heapq.heappop(candidates)
+            if candidate in executed or candidate in canceled:
+                continue
+
+            unsatisfied = [
+                n
+                for n, _, opt in dag.in_edges(candidate, data="optional")
+                if not opt and not self._is_data_satisfied(dag, n)
+            ]
+            if unsatisfied:
+                canceled[candidate] = msg = f"unsatisfied-needs{unsatisfied}"
+                newly_canceled.append(candidate)
+                log.info(
+                    "... canceled step #%i due to %s\n  %s",
+                    op_index[candidate],
+                    msg,
+                    candidate,
+                )
+                push_consumers(
+                    out
+                    for out in dag.successors(candidate)
+                    if not self._is_data_satisfied(dag, out)
+                )
 
+        if newly_canceled:
+            self._record_event(
+                "reschedule",
+                op.name,
+                reason=reason,
+                canceled=[n.name for n in newly_canceled],
+            )
         if log.isEnabledFor(logging.INFO):
             log.info(
                 "... (%s) +%s  newly CANCELED ops%s due to %s op(%s).",
@@ -245,22 +389,72 @@ class Solution(ChainMap, Plottable):
                 op.name,
             )
 
+    def to_chrome_trace(self, fpath: str = None) -> dict:
+        """
+        Export the :term:`execution timeline` as Chrome Trace Event json (and write it in `fpath`).
+
+        Worker tracks & task phases are included only if run while :term:`profiling`.
+
+        .. seealso:: :func:`.trace.write_chrome_trace()`
+        """
+        from .trace import write_chrome_trace
+
+        return write_chrome_trace(self, fpath)
+
+    def _record_event(self, kind: str, name: str, **args) -> None:
+        """Append an instant event in :attr:`events` (e.g. for :meth:`to_chrome_trace()`)."""
+        self.events.append((time.time(), kind, name, args))
+
+    def _newest_map(self, key) -> Optional[dict]:
+        """
+        The most recent map containing (plain) `key`, or None, without scanning layers.
+
+        The index is built on first use, and then updated on every modification
+        (or dropped, for modifications through :term:`accessor`\\s).
+        """
+        index = self._key_index
+        if index is None:
+            index = self._key_index = {}
+            for m in reversed(self.maps):
+                index.update(dict.fromkeys(m, m))
+        return index.get(key)
+
     def __contains__(self, key):
+        acc = getattr(key, "_accessor", None)
+        if self.is_layered and not acc:
+            return self._newest_map(key) is not None
+
         acc = acc_contains(key)
         return any(acc(m, key) for m in self.maps)
 
     def __getitem__(self, key):
+        acc = getattr(key, "_accessor", None)
+        if self.is_layered and not acc:
+            mapping = self._newest_map(key)
+            if mapping is not None:
+                val = mapping[key]
+                if type(val) is Spilled:
+                    val = self._unspill(key, val)
+                return val
+            return self.__missing__(key)
+
         acc = acc_getitem(key)
         for mapping in self.maps:
             try:
-                return acc(mapping, key)
+                val = acc(mapping, key)
             except KeyError:
                 pass
+            else:
+                if type(val) is Spilled:
+                    val = self._unspill(key, val)
+                return val
         return self.__missing__(key)
 
     def __setitem__(self, key, val):
         self._overwrites_cache = None
         super().__setitem__(key, val)
+        if self._key_index is not None:
+            self._key_index[key] = self.maps[0]
 
     def __delitem__(self, key):
         self._overwrites_cache = None
@@ -270,9 +464,23 @@ class Solution(ChainMap, Plottable):
         if not matches:
             raise KeyError(key)
 
+        if self.spill_store is not None:
+            spills = self._mapped_spills.pop(key, [])
+            for m in matches:
+                val = m.get(key)
+                if type(val) is Spilled:
+                    spills.append(val)
+            for spilled in spills:
+                self.spill_store.discard(spilled)
+
         acc = acc_delitem(key)
         for m in matches:
             acc(m, key)
+        if self._key_index is not None:
+            if get_accessor(key):
+                self._key_index = None
+            else:
+                self._key_index.pop(key, None)
 
         ## Delete it from extra places when non-layered.
         #
@@ -282,6 +490,9 @@ class Solution(ChainMap, Plottable):
 
             self._initial_inputs.pop(key, None)
 
+        if self.memory is not None:
+            self.memory.evict(key)
+
     def update(
         self,
         other,
@@ -311,13 +522,34 @@ class Solution(ChainMap, Plottable):
 
         # First update keys without any :attr:`._accessor.update`,
         # to install any container-values in the "root" level.
-        target_map.update(update_groups.pop(None, ()))
+        plain_kvs = update_groups.pop(None, ())
+        target_map.update(plain_kvs)
+
+        index = self._key_index
+        if index is not None:
+            if update_groups:
+                # Accessors may have installed any "root" keys.
+                self._key_index = None
+            else:
+                index.update((k, target_map) for k, _ in plain_kvs)
 
         ## Then update accessor (e.g. deeper nested `jsonp` keys).
         #
         for upd, pairs in update_groups.items():
             upd(target_map, pairs)
 
+    def pop(self, key, *args):
+        self._key_index = None
+        return super().pop(key, *args)
+
+    def popitem(self):
+        self._key_index = None
+        return super().popitem()
+
+    def clear(self):
+        self._key_index = None
+        super().clear()
+
     def _populate_op_layer_with_outputs(self, op, outputs) -> dict:
         """
         Installs & populates a new 1st chained-map, if layered, or use `named_inputs`.
@@ -335,6 +567,130 @@ class Solution(ChainMap, Plottable):
 
         if outputs:
             self.update(outputs)
+            if getattr(op, "chunked", None):
+                self._expect_chunk_readers(outputs)
+            if self.memory is not None:
+                self.memory.add(outputs.items(), op.name, replace=not self.is_layered)
+                if self.memory_budget is not None:
+                    self._enforce_memory_budget()
+
+    def _expect_chunk_readers(self, outputs: Mapping):
+        """
+        Tell :term:`chunked` outputs how many ops will read them, if to be :term:`evict`\\ed.
+
+        Outputs kept in the solution keep all their chunks, to be read later.
+        """
+        readers = {} if is_skip_evictions() else self.plan._chunk_readers
+        for key, val in outputs.items():
+            if type(val) is Chunks and key in readers:
+                val.expect(readers[key])
+
+    def _value_holders(self) -> List[dict]:
+        """The maps holding values of executed ops (not inputs), to :term:`spill` from."""
+        if self.is_layered:
+            return self.maps[:-1]
+        return [self.maps[0], *self.executed.values()]
+
+    def _upcoming_needs(self, lookahead: int) -> set:
+        """The inputs of the next `lookahead` ops of the plan still pending."""
+        steps, done = self.plan.steps, (self.executed, self.canceled)
+        input_keys = self.plan._op_input_keys
+        needs = set()
+        i, n_ops = self._spill_cursor, 0
+        while i < len(steps) and n_ops < lookahead:
+            step = steps[i]
+            if isinstance(step, Operation) and not any(step in d for d in done):
+                if not n_ops:
+                    self._spill_cursor = i
+                keys = input_keys.get(step)
+                needs.update(step.needs if keys is None else keys)
+                n_ops += 1
+            i += 1
+        if not n_ops:
+            self._spill_cursor = i
+
+        return needs
+
+    def _enforce_memory_budget(self):
+        """
+        :term:`spill` the largest values not needed soon, until within :attr:`memory_budget`.
+
+        Input values are never spilled, since the caller keeps them alive, anyway,
+        nor values to be :term:`evict`\\ed next, not needed by any pending op.
+        """
+        mem, budget, store = self.memory, self.memory_budget, self.spill_store
+        if mem.live_bytes <= budget:
+            return
+
+        needed = self._upcoming_needs(store.lookahead)
+        inputs = self.maps[-1] if self.is_layered else self._initial_inputs
+        if is_skip_evictions():
+            evicted_after = {}
+        else:
+            evicted_after = self.plan._evicted_after
+            done = (self.executed, self.canceled)
+
+        def is_doomed(key):
+            if key not in evicted_after:
+                return False
+            last_op = evicted_after[key]
+            return last_op is None or any(last_op in d for d in done)
+
+        candidates = sorted(
+            (
+                (sum(sizes), key)
+                for key, sizes in mem.sizes.items()
+                if key not in needed and key not in inputs and not is_doomed(key)
+            ),
+            key=lambda pair: pair[0],
+            reverse=True,
+        )
+        holders = self._value_holders()
+        for nbytes, key in candidates:
+            if mem.live_bytes <= budget:
+                break
+            # Spill each distinct value once (overwrites live in older layers).
+            placeholders = {}
+            for m in holders:
+                val = m.get(key, UNSET)
+                # Lazy chunks cannot be pickled.
+                if val is UNSET or type(val) in (Spilled, Chunks):
+                    continue
+                spilled = placeholders.get(id(val))
+                if spilled is None:
+                    spilled = placeholders[id(val)] = store.spill(val, mem.sizer(val))
+                m[key] = spilled
+            if placeholders:
+                mem.spill(key)
+                self._record_event("spill", key, nbytes=nbytes)
+                log.debug(
+                    "... (%s) spilled %r (%s bytes) into: %s",
+                    self.solid,
+                    key,
+                    nbytes,
+                    [s.fpath for s in placeholders.values()],
+                )
+
+    def _unspill(self, key, spilled):
+        """
+        Load back a :term:`spill`\\ed value, re-installing it where it was.
+
+        Memory-mapped arrays are backed by their file (deleted on :term:`eviction`),
+        so they are not accounted as live (nor spilled again);  the files
+        of any other value are deleted right away.
+        """
+        val = spilled.load()
+        for m in self._value_holders():
+            if m.get(key) is spilled:
+                m[key] = val
+        if spilled.is_mapped:
+            self._mapped_spills.setdefault(key, []).append(spilled)
+        else:
+            self.spill_store.discard(spilled)
+            if self.memory is not None:
+                self.memory.add([(key, val)], None, replace=False)
+
+        return val
 
     def operation_executed(self, op, outputs):
         """
@@ -379,9 +735,8 @@ class Solution(ChainMap, Plottable):
             )
 
             if outs_to_break:
-                dag = self.dag
-                dag.remove_edges_from((op, out) for out in outs_to_break)
-                self._reschedule(dag, "rescheduled", op)
+                dag = self._break_edges((op, out) for out in outs_to_break)
+                self._reschedule(dag, "rescheduled", op, outs_to_break)
                 # list used by `check_if_incomplete()`
                 self.broken[op] = outs_to_break
 
@@ -392,10 +747,11 @@ class Solution(ChainMap, Plottable):
         It will update :attr:`executed` with the operation status and
         the :attr:`canceled` with the unsatisfied ops downstream of `op`.
         """
-        dag = self.dag
         self.executed[op] = ex
-        dag.remove_edges_from(tuple(dag.out_edges(op)))
-        self._reschedule(dag, "failure of", op)
+        self._record_event("failed", op.name, error=f"{type(ex).__name__}: {ex}")
+        out_edges = tuple(self.dag.out_edges(op))
+        dag = self._break_edges(out_edges)
+        self._reschedule(dag, "failure of", op, [out for _, out in out_edges])
 
     def is_failed(self, op):
         """returns Non(not executed), False(ok), Exception(failed)"""
@@ -459,6 +815,140 @@ class Solution(ChainMap, Plottable):
         if ex:
             raise ex
 
+    def _invalidate_ops(self, ops: Collection[Operation]) -> None:
+        """Forget the execution status & outputs of `ops`, as if never executed."""
+        executed = self.executed
+        if self.is_layered:
+            drop_ids = {id(executed[op]) for op in ops if isinstance(executed.get(op), dict)}
+            self.maps = [m for m in self.maps if id(m) not in drop_ids]
+        else:
+            values, inputs = self.maps[0], self._initial_inputs
+            for op in ops:
+                outputs = executed.get(op)
+                if isinstance(outputs, dict):
+                    for k in outputs:
+                        if k in inputs:
+                            values[k] = inputs[k]
+                        else:
+                            values.pop(k, None)
+
+        for status in (
+            executed,
+            self.canceled,
+            self.broken,
+            self.elapsed_ms,
+            self.profiles,
+            self.op_spans,
+        ):
+            for op in ops:
+                status.pop(op, None)
+        self._broken_edges = {e for e in self._broken_edges if e[0] not in ops}
+        self._dag_view = self._key_index = self._overwrites_cache = None
+        if self.memory is not None:
+            self.memory.reset((k, v) for m in self.maps for k, v in m.items())
+
+    def recompute(self, changed_inputs: Mapping, *, name="") -> "Solution":
+        """
+        Update some input values, and re-execute only the operations downstream of them.
+
+        All values produced by other operations are kept (not copied) in this solution,
+        the :term:`layer`\\s (or outputs) of the affected operations are dropped,
+        and those operations are re-executed (in :attr:`.ExecutionPlan.steps` order),
+        as if the plan had run from scratch with the updated inputs.
+
+        :param changed_inputs:
+            the new values of (some of) the :attr:`.ExecutionPlan.needs`
+            (values for deps not in the plan are just stored)
+        :param name:
+            name of the pipeline used for logging
+        :return:
+            this (modified) solution
+
+        :raises ValueError:
+            - if any key in `changed_inputs` is provided by an operation, with msg:
+
+                *Cannot recompute with changed values for outputs...*
+
+            - if the plan evicts intermediate values, with msg:
+
+                *Cannot recompute solution of a plan with evictions...*
+
+        .. Note::
+            Only solutions of plans without evictions can be recomputed
+            (e.g. when no `outputs` asked, or with :func:`.set_skip_evictions()`),
+            since re-executed operations may need values evicted by the original run.
+        """
+        plan = self.plan
+        dag = plan.dag
+        changed = [k for k in changed_inputs if k in dag.nodes]
+        provided = [
+            k
+            for k in changed
+            if any(isinstance(p, Operation) for p in dag.predecessors(k))
+        ]
+        if provided:
+            raise ValueError(
+                f"Cannot recompute with changed values for outputs{provided}!"
+                f"\n  {plan}"
+            )
+        if any(isinstance(s, str) for s in plan.steps):
+            raise ValueError(
+                "Cannot recompute solution of a plan with evictions!"
+                "\n  (hint: compute all outputs or `set_skip_evictions(True)`)"
+                f"\n  {plan}"
+            )
+
+        ## Collect all ops strictly downstream of changed inputs,
+        #  hopping through any :term:`doc chain`\s.
+        #
+        dirty = set()
+        frontier = changed
+        while frontier:
+            ops = {
+                op
+                for doc in yield_chaindocs(dag, frontier)
+                for op in dag.successors(doc)
+                if isinstance(op, Operation) and op not in dirty
+            }
+            dirty.update(ops)
+            frontier = [out for op in ops for out in dag.successors(op)]
+
+        ## Install new input values, without touching user's (layered) inputs.
+        #
+        if self.is_layered:
+            self.maps[-1] = self._initial_inputs = {**self.maps[-1], **changed_inputs}
+        else:
+            self.maps[0].update(changed_inputs)
+            self._initial_inputs.update(changed_inputs)
+
+        self._invalidate_ops(dirty)
+        ## Re-cancel dirty ops that remain unsatisfied from untouched failures.
+        #
+        broken_outs = defaultdict(list)
+        for op, out in self._broken_edges:
+            broken_outs[op].append(out)
+        for op, outs in broken_outs.items():
+            self._reschedule(self.dag, "failure/partial outputs of", op, outs)
+
+        in_parallel, executor = plan._pick_executor()
+        log.info(
+            "=== (%s) Recomputing pipeline(%s)%s x%i ops%s, due to changed inputs%s...",
+            self.solid,
+            name,
+            ", in parallel" if in_parallel else "",
+            len(dirty),
+            [op.name for op in dirty],
+            list(changed_inputs),
+        )
+        ok = False
+        try:
+            executor(self)
+            ok = True
+        finally:
+            plan._log_completion(self, name, ok)
+
+        return self
+
     @property
     def graph(self):
         return self.dag
@@ -480,7 +970,7 @@ class OpTask:
     This intermediate class is needed to solve pickling issue with process executor.
     """
 
-    __slots__ = ("op", "sol", "solid", "result")
+    __slots__ = ("op", "sol", "solid", "result", "memo", "profile")
     logname = __name__
 
     def __init__(self, op, sol, solid, result=UNSET):
@@ -493,29 +983,101 @@ class OpTask:
         #: Initially would :data:`.UNSET`, will be set after execution
         #: with operation's outputs or exception.
         self.result = result
+        #: The :term:`memoization` store (or None), decided here, on the main thread,
+        #: where :term:`configurations` are visible.
+        self.memo = None
+        if getattr(op, "memoize", None) is not None or is_memoize_operations():
+            from .memoize import op_memo_store
+
+            self.memo = op_memo_store(op)
+        #: A dict to fill with measurements of the execution while :term:`profiling`
+        #: (or None), returned along with the outputs in a :class:`.ProfiledResult`.
+        self.profile = None if get_profiler() is None else {}
+
+    def _memo_lookup(self) -> Tuple[Optional[str], Any]:
+        """Return the :term:`memoization` key and any stored outputs (or :data:`.UNSET`)."""
+        from .memoize import memo_key
+
+        key = memo_key(self.op, self.sol)
+        outputs = UNSET if key is None else self.memo.get(key)
+        if outputs is not UNSET:
+            log = logging.getLogger(self.logname)
+            log.debug("+++ (%s) Memoized %s.", self.solid, self)
+            outputs = dict(outputs)
 
-        # if
+        return key, outputs
 
     def marshalled(self):
         import dill
 
         return dill.dumps(self)
 
+    def _start_profile(self) -> Optional[float]:
+        if self.profile is not None:
+            thread = threading.current_thread()
+            self.profile.update(
+                started=time.time(),
+                pid=os.getpid(),
+                tid=thread.ident,
+                thread=thread.name,
+            )
+            return time.perf_counter()
+
+    def _profiled_result(self, t0):
+        """Return the :attr:`result` (wrapped along with the :attr:`profile`, if any)."""
+        if self.profile is None:
+            return self.result
+        if t0 is not None:
+            self.profile["compute_ms"] = 1000 * (time.perf_counter() - t0)
+        return ProfiledResult(self.result, self.profile)
+
     def __call__(self):
+        t0 = None
         if self.result == UNSET:
             self.result = None
             log = logging.getLogger(self.logname)
             log.debug("+++ (%s) Executing %s...", self.solid, self)
+            t0 = self._start_profile()
             token = task_context.set(self)
             try:
-                self.result = self.op.compute(self.sol)
+                key, outputs = (
+                    (None, UNSET) if self.memo is None else self._memo_lookup()
+                )
+                if outputs is UNSET:
+                    outputs = self.op.compute(self.sol)
+                    if key is not None:
+                        self.memo.set(key, dict(outputs))
+                self.result = outputs
             finally:
                 task_context.reset(token)
 
-        return self.result
+        return self._profiled_result(t0)
 
     get = __call__
 
+    async def acall(self):
+        """Like :meth:`__call__()` but awaiting :meth:`.FnOp.compute_async()`."""
+        t0 = None
+        if self.result == UNSET:
+            self.result = None
+            log = logging.getLogger(self.logname)
+            log.debug("+++ (%s) Executing async %s...", self.solid, self)
+            t0 = self._start_profile()
+            token = task_context.set(self)
+            try:
+                key, outputs = (
+                    (None, UNSET) if self.memo is None else self._memo_lookup()
+                )
+                if outputs is UNSET:
+                    outputs = await self.op.compute_async(self.sol)
+                    if key is not None:
+                        self.memo.set(key, dict(outputs))
+                self.result = outputs
+            finally:
+                task_context.reset(token)
+
+        return self._profiled_result(t0)
+
     def __repr__(self):
         try:
             sol_items = list(self.sol)
@@ -532,6 +1094,39 @@ class OpTask:
 task_context: ContextVar[OpTask] = ContextVar("task_context")
 
 
+def _plan_cached(method):
+    """
+    A read-only property memoized in the (immutable) plan's ``__dict__``.
+
+    Used for the indices derived once from the plan's steps & dag
+    (ie. on the 1st execution after :term:`compile`, since plans are cached).
+    """
+    name = method.__name__
+
+    @wraps(method)
+    def wrapper(self):
+        try:
+            return self.__dict__[name]
+        except KeyError:
+            val = self.__dict__[name] = method(self)
+            return val
+
+    return property(wrapper)
+
+
+def _is_task_done(task) -> bool:
+    """Whether a pool `task` (:class:`~concurrent.futures.Future` or ``AsyncResult``) completed."""
+    done = getattr(task, "done", None)
+    return done() if done else task.ready()
+
+
+def _cancel_task(task):
+    """Cancel a :class:`~concurrent.futures.Future` if not started (``AsyncResult``\\s can't)."""
+    cancel = getattr(task, "cancel", None)
+    if cancel:
+        cancel()
+
+
 def _do_task(task):
     """
     Un-dill the *simpler* :class:`OpTask` & Dill the results, to pass through pool-processes.
@@ -544,9 +1139,18 @@ def _do_task(task):
     if isinstance(task, bytes):
         import dill
 
+        t0 = time.perf_counter()
         task = dill.loads(task)
+        loads_ms = 1000 * (time.perf_counter() - t0)
         result = copy_context().run(task)
-        result = dill.dumps(result)
+        if task.profile is None:
+            result = dill.dumps(result)
+        else:
+            t0 = time.perf_counter()
+            outputs = dill.dumps(result.outputs)
+            result.profile["task_loads_ms"] = loads_ms
+            result.profile["result_dumps_ms"] = 1000 * (time.perf_counter() - t0)
+            result = result._replace(outputs=outputs)
     else:
         result = task()
 
@@ -685,24 +1289,231 @@ class ExecutionPlan(
                     f"\n for graph: {self}\n  {self}"
                 )
 
+    @_plan_cached
+    def _op_dependencies(self) -> Tuple[Mapping[Operation, int], OpMap]:
+        """
+        The # of upstream ops for each op, and the downstream ops of each one.
+
+        :return:
+            a 2-tuple of dicts ``({op: in-degree}, {op: (downstream-op, ...)})``,
+            with ops ordered as in :attr:`steps`, and edges following data nodes
+            (and :term:`doc chain`\\s) in :attr:`dag`, until reaching another op.
+        """
+        dag = self.dag
+        ops = list(yield_ops(self.steps))
+        indegrees = dict.fromkeys(ops, 0)
+        downstreams = {op: [] for op in ops}
+        for op in ops:
+            upstreams = set()
+            seen = set()
+            dnodes = list(dag.predecessors(op))
+            while dnodes:
+                node = dnodes.pop()
+                if node in seen:
+                    continue
+                seen.add(node)
+                for pred in dag.predecessors(node):
+                    if isinstance(pred, Operation):
+                        upstreams.add(pred)
+                    else:  # a superdoc
+                        dnodes.append(pred)
+            indegrees[op] = len(upstreams)
+            for up in upstreams:
+                downstreams[up].append(op)
+
+        return indegrees, {op: tuple(dops) for op, dops in downstreams.items()}
+
+    @_plan_cached
+    def _eviction_refs(self) -> Tuple[Mapping[int, int], Mapping[Operation, tuple]]:
+        """
+        The ops each :term:`eviction` step waits for, to evict asap when not sequential.
+
+        An eviction step in :attr:`steps` waits for the ops preceding it that need
+        or provide any dependency in its :term:`doc chain` (:term:`sideffected`
+        stripped), so it can run the instant the last of them completes
+        (as by planning, the chain is not used further down).
+
+        :return:
+            a 2-tuple of dicts ``({evict-step index: refcount}, {op: (evict-step index, ...)})``
+        """
+        dag = self.dag
+        users = defaultdict(list)  # dep --> preceding ops using it
+        refs = {}
+        waiters = defaultdict(list)
+        for i, step in enumerate(self.steps):
+            if isinstance(step, Operation):
+                for dep in {dep_stripped(d) for d in (*step.needs, *step.provides)}:
+                    users[dep].append(step)
+            else:
+                chain = {step, *(dep_stripped(d) for d in yield_chaindocs(dag, (step,)))}
+                waited = {op for dep in chain for op in users.get(dep, ())}
+                refs[i] = len(waited)
+                for op in waited:
+                    waiters[op].append(i)
+
+        return refs, {op: tuple(idx) for op, idx in waiters.items()}
+
+    def _eviction_refcounter(self, solution: Solution) -> Callable[[Operation], None]:
+        """
+        Return ``evict_after(op)`` to call when each `op` is done (ok, failed or canceled),
+        evicting the data whose last user it was (see :meth:`_eviction_refs`).
+        """
+        refs, waiters = self._eviction_refs
+        refs = dict(refs)  # decremented as ops complete
+        steps = self.steps
+
+        def evict_after(op):
+            for i in waiters.get(op, ()):
+                refs[i] -= 1
+                if not refs[i]:
+                    self._evict(solution, steps[i])
+
+        return evict_after
+
+    @_plan_cached
+    def _op_index(self) -> Mapping[Operation, int]:
+        """The position of each op in :attr:`steps` (a topological order)."""
+        return {op: i for i, op in enumerate(yield_ops(self.steps))}
+
+    @_plan_cached
+    def _evicted_after(self) -> Mapping[str, Optional[Operation]]:
+        """
+        The last op needing each key that gets :term:`evict`\\ed, not to :term:`spill` it.
+
+        Keys needed by no op (e.g. outputs not asked) map to None.
+        """
+        evicted = {step for step in self.steps if isinstance(step, str)}
+        last_ops = dict.fromkeys(evicted)
+        for op, keys in self._op_input_keys.items():
+            for key in op.needs if keys is None else keys:
+                if key in evicted:
+                    last_ops[key] = op
+
+        return last_ops
+
+    @_plan_cached
+    def _chunk_readers(self) -> Mapping[str, int]:
+        """The number of ops needing each key that gets :term:`evict`\\ed, for :class:`.Chunks`."""
+        evicted = {step for step in self.steps if isinstance(step, str)}
+        readers = dict.fromkeys(evicted, 0)
+        for op, keys in self._op_input_keys.items():
+            for key in set(op.needs if keys is None else keys):
+                if key in readers:
+                    readers[key] += 1
+
+        return readers
+
+    @_plan_cached
+    def _op_input_keys(self) -> Mapping[Operation, Optional[Tuple[str, ...]]]:
+        """
+        The solution keys read by each op (its ``_fn_needs``), to slice task inputs.
+
+        Ops without ``_fn_needs`` (e.g. custom :class:`.Operation` subclasses)
+        map to ``None``, to receive the whole solution.
+        """
+        return {
+            op: None if needs is None else tuple(needs)
+            for op in yield_ops(self.steps)
+            for needs in [getattr(op, "_fn_needs", None)]
+        }
+
+    def _ready_ops_queue(self) -> Tuple[list, Callable[[Operation], None]]:
+        """
+        A heap of the ops ready to run, prioritized on the :term:`critical path`.
+
+        Ops with the costliest remaining path (see :func:`.costs.critical_path_ranks()`)
+        are popped first, ties broken by their position in :attr:`steps`.
+
+        :return:
+            a 2-tuple ``(heap, release)``, where ``heapq.heappop(heap)[-1]``
+            gives the next op ready, and ``release(op)`` marks an `op` done
+            (ok, failed or canceled), pushing any downstream ops becoming ready
+        """
+        from .costs import active_op_costs, critical_path_ranks
+
+        indegrees, downstreams = self._op_dependencies
+        indegrees = dict(indegrees)  # decremented as upstream ops complete
+        op_index = self._op_index
+        ranks = critical_path_ranks(downstreams, active_op_costs().cost)
+        ready = [(-ranks[op], op_index[op], op) for op, n in indegrees.items() if not n]
+        heapq.heapify(ready)
+
+        def release(op):
+            for dop in downstreams[op]:
+                indegrees[dop] -= 1
+                if not indegrees[dop]:
+                    heapq.heappush(ready, (-ranks[dop], op_index[dop], dop))
+
+        return ready, release
+
+    def _task_inputs_slicer(self, solution) -> Callable[[Operation], dict]:
+        """
+        Return a callable giving just the input values of each op, as a plain dict.
+
+        Values are resolved through the `solution` (e.g. :term:`jsonp` subdocs),
+        so that pooled & :term:`marshalling` tasks ship only what their op reads,
+        and not the whole solution.
+        """
+        input_keys = self._op_input_keys
+        all_values = None
+
+        def task_inputs(op):
+            nonlocal all_values
+
+            keys = input_keys.get(op)
+            if keys is None:
+                if all_values is None:
+                    all_values = dict(solution)
+                return all_values
+            return {n: solution[n] for n in keys if n in solution}
+
+        return task_inputs
+
     def _check_if_aborted(self, solution):
+        """Raise :class:`.AbortedException` on :term:`abort run` or :term:`cancellation`."""
         if is_abort():
+            solution.aborted = "abort_run()"
+        else:
+            token = solution.cancel_token
+            solution.aborted = token and token.reason
+        if solution.aborted:
+            log.warning(
+                "... (%s) aborted (%s) after executing ops%s.",
+                solution.solid,
+                solution.aborted,
+                [op.name for op in solution.executed],
+            )
             raise AbortedException(solution)
 
     def _prepare_tasks(
-        self, operations, solution, pool, global_parallel, global_marshal
+        self,
+        operations,
+        solution,
+        pool,
+        global_parallel,
+        global_marshal,
+        on_done: Callable[[Operation], None] = None,
     ) -> Union["Future", OpTask, bytes]:
         """
         Combine ops+inputs, apply :term:`marshalling`, and submit to :term:`execution pool` (or not) ...
 
          based on global/pre-op configs.
+
+        The pool may be a :class:`multiprocessing.pool.Pool` (tasks submitted with
+        ``apply_async()``) or a :class:`concurrent.futures.Executor` (with ``submit()``).
+
+        :param on_done:
+            if given, called with the `op` (from some pool-thread)
+            when its submitted task has completed (ok or not);
+            it is NOT called for non-parallel tasks (they run when "got").
         """
         ## Selectively DILL the *simpler* OpTask & `sol` dict
         #  so as to pass through pool-processes,
         #  (s)ee https://stackoverflow.com/a/24673524/548792)
         #  and handle results in this thread, to evade Solution locks.
+        #  Each task receives just the values its op needs.
         #
-        input_values = dict(solution)
+        task_inputs = self._task_inputs_slicer(solution)
 
         def prep_task(op):
             ok = False
@@ -710,9 +1521,16 @@ class ExecutionPlan(
                 # Mark start time here, to include also marshalling overhead.
                 solution.elapsed_ms[op] = time.time()
 
-                task = OpTask(op, input_values, solution.solid)
+                task = OpTask(op, task_inputs(op), solution.solid)
+                if task.profile is None:
+                    task.profile = {}  # for the compute time of :term:`operation cost`
                 if first_solid(global_marshal, getattr(op, "marshalled", None)):
+                    t0 = time.perf_counter()
                     task = task.marshalled()
+                    if solution.profiler is not None:
+                        solution.profiles[op] = {
+                            "task_dumps_ms": 1000 * (time.perf_counter() - t0)
+                        }
 
                 if first_solid(global_parallel, getattr(op, "parallel", None)):
                     if not pool:
@@ -720,7 +1538,17 @@ class ExecutionPlan(
                             "With `parallel` you must `set_execution_pool().`"
                         )
 
-                    task = pool.apply_async(_do_task, (task,))
+                    if isinstance(pool, Executor):
+                        task = pool.submit(_do_task, task)
+                        if on_done:
+                            task.add_done_callback(lambda _fut, op=op: on_done(op))
+                    elif on_done:
+                        done_cb = lambda _res_or_ex, op=op: on_done(op)
+                        task = pool.apply_async(
+                            _do_task, (task,), callback=done_cb, error_callback=done_cb
+                        )
+                    else:
+                        task = pool.apply_async(_do_task, (task,))
                 elif isinstance(task, bytes):
                     # Marshalled (but non-parallel) tasks still need `_do_task()`.
                     task = partial(_do_task, task)
@@ -737,16 +1565,19 @@ class ExecutionPlan(
 
         return [prep_task(op) for op in operations]
 
-    def _handle_task(self, future: Union[OpTask, "AsyncResult"], op, solution) -> None:
+    def _handle_task(
+        self, future: Union[OpTask, "AsyncResult", "Future"], op, solution
+    ) -> None:
         """Un-dill parallel task results (if marshalled), and update solution / handle failure."""
 
         def elapsed_ms(op):
-            t0 = solution.elapsed_ms[op]
-            solution.elapsed_ms[op] = elapsed = round(1000 * (time.time() - t0), 3)
+            t0, t1 = solution.elapsed_ms[op], time.time()
+            solution.elapsed_ms[op] = elapsed = round(1000 * (t1 - t0), 3)
+            solution.op_spans[op] = (t0, t1)
 
             return elapsed
 
-        result = UNSET
+        result = profile = UNSET
         try:
             ## Reset start time for Sequential tasks
             #  (bummer, they will miss marshalling overhead).
@@ -756,12 +1587,22 @@ class ExecutionPlan(
 
                 if solution.callbacks[0]:
                     solution.callbacks[0](future)
+            submitted = solution.elapsed_ms[op]
 
-            outputs = result = future.get()
+            # Pool's `AsyncResult` has `get()`, other futures `result()`.
+            outputs = result = (
+                future.get() if hasattr(future, "get") else future.result()
+            )
+            if isinstance(outputs, ProfiledResult):
+                outputs, profile = outputs
+                output_size = outputs
             if isinstance(outputs, bytes):
                 import dill
 
+                t0 = time.perf_counter()
                 outputs = dill.loads(outputs)
+                if profile is not UNSET:
+                    profile["result_loads_ms"] = 1000 * (time.perf_counter() - t0)
 
             solution.operation_executed(op, outputs)
 
@@ -769,6 +1610,10 @@ class ExecutionPlan(
             log.info(
                 "... (%s) op(%s) completed in %sms.", solution.solid, op.name, elapsed
             )
+            if profile is not UNSET and solution.profiler is not None:
+                self._record_profile(
+                    op, solution, profile, submitted, elapsed, output_size
+                )
         except Exception as ex:
             result = ex
             is_endured = first_solid(
@@ -800,15 +1645,86 @@ class ExecutionPlan(
                 # add it again, in case compile()/execute() is called separately.
                 save_jetsam(ex, locals(), "solution", task="future", plan="self")
                 raise
+        else:
+            costs = get_op_costs()
+            if costs is None and not isinstance(future, OpTask):
+                from .costs import default_op_costs
+
+                costs = default_op_costs()
+            if costs is not None:
+                # Pooled tasks weigh their compute time, without any queue wait.
+                compute_ms = None if profile is UNSET else profile.get("compute_ms")
+                costs.record(op, elapsed if compute_ms is None else compute_ms)
+            # Lazy chunks cannot be pickled, re-run those ops when resuming.
+            if solution.checkpoint is not None and not getattr(op, "chunked", None):
+                solution.checkpoint.save(op.name, outputs)
         finally:
             if isinstance(future, OpTask) and solution.callbacks[1]:
                 solution.callbacks[1](future)
 
-    def _execute_thread_pool_barrier_method(self, solution: Solution):
+    def _record_profile(
+        self, op, solution: Solution, profile: dict, submitted, elapsed, outputs
+    ) -> None:
+        """
+        Merge the `profile` measured in the worker with the main-thread's :attr:`.Solution.profiles`.
+
+        Besides the :data:`.profiling.PROFILE_FIELDS`, the sample keeps
+        the worker's ``started`` timestamp, ``pid``, ``tid`` & ``thread`` name,
+        and the ``{task,result}_{dumps,loads}_ms`` :term:`marshalling` phases.
+
+        :param submitted:
+            the timestamp when the task was prepared
+        :param outputs:
+            as received from the worker (maybe marshalled), to measure their size
+        """
+        from .profiling import outputs_size
+
+        sample = solution.profiles.setdefault(op, {})
+        sample.update(profile)
+        phases = ("task_dumps_ms", "task_loads_ms", "result_dumps_ms", "result_loads_ms")
+        marshal_ms = sum(sample.get(k, 0) for k in phases)
+        queue_ms = 1000 * (profile.get("started", submitted) - submitted)
+        queue_ms -= sample.get("task_dumps_ms", 0) + sample.get("task_loads_ms", 0)
+        sample.update(
+            elapsed_ms=elapsed,
+            compute_ms=profile.get("compute_ms", 0),
+            marshal_ms=marshal_ms,
+            queue_ms=max(queue_ms, 0),
+            output_size=outputs_size(outputs),
+        )
+        solution.profiler.record(op, sample)
+
+    def _evict(self, solution: Solution, dep):
+        """Delete the value of an :term:`eviction` step from `solution`, if there."""
+        # Cache value may be missing if it is optional.
+        if dep in solution:
+            if log.isEnabledFor(logging.INFO):
+                log.info(
+                    "... (%s) evicting '%s' from solution%s.",
+                    solution.solid,
+                    dep,
+                    list(solution),
+                )
+            del solution[dep]
+            solution._record_event("evict", dep)
+
+    def _evict_leftovers(self, solution: Solution):
+        """Evict data of all eviction steps, e.g. written after their refcount dropped."""
+        for step in self.steps:
+            if isinstance(step, str):
+                self._evict(solution, step)
+
+    def _execute_thread_pool_method(self, solution: Solution):
         """
-        (deprecated)  This method runs the graph using a parallel pool of thread executors.
-        You may achieve lower total latency if your graph is sufficiently
-        sub divided into operations using this method.
+        (deprecated) Run the graph submitting each op in a pool as soon as it becomes ready.
+
+        An op is ready when all its upstream ops (counted on the 1st execution of
+        the plan, see :meth:`_op_dependencies`) have completed (ok, failed or canceled),
+        and completed tasks are handled as they arrive (no "barrier" batches).
+        Ready ops are submitted in :term:`critical path` order (see :meth:`_ready_ops_queue`).
+
+        On :term:`cancellation`, tasks not yet completed are canceled (if still queued
+        in the pool) and abandoned.
 
         :param solution:
             must contain the input values only, gets modified
@@ -816,81 +1732,180 @@ class ExecutionPlan(
         pool = get_execution_pool()  # cache pool
         parallel = solution.is_parallel
         marshal = solution.is_marshal
+        token = solution.cancel_token
 
-        # with each loop iteration, we determine a set of operations that can be
-        # scheduled, then schedule them onto a thread pool, then collect their
-        # results onto a memory solution for use upon the next iteration.
-        while True:
-            ## Note: do not check abort in between task handling (at the bottom),
-            #  or it would ignore solution updates from already executed tasks.
-            self._check_if_aborted(solution)
+        ready, release = self._ready_ops_queue()
+        evict_after = self._eviction_refcounter(solution)
+        pending = {}  # op --> task submitted in pool
+        completed = SimpleQueue()  # ops put by the pool's result-thread (None: wakeup)
 
-            # the upnext list contains a list of operations for scheduling
-            # in the current round of scheduling
-            upnext = []
-            # TODO: optimization: start batches from previous last op).
-            for node in self.steps:
-                ## Determines if a Operation is ready to be scheduled for execution
-                #  based on what has already been executed.
-                if (
-                    isinstance(node, Operation)
-                    and node not in solution.executed
-                    and set(yield_ops(nx.ancestors(self.dag, node))).issubset(
-                        solution.executed
-                    )
-                ):
-                    if node not in solution.canceled:
-                        upnext.append(node)
-                elif isinstance(node, str):
-                    # Only evict if all successors for the data node
-                    # have been executed.
-                    if (
-                        # An optional need may not have a value in the solution.
-                        node in solution
-                        and (
-                            # The 2nd eviction branch for unused provides.
-                            node not in self.dag.nodes
-                            # Scan node's successors in `broken_dag`, not to block
-                            # an op waiting for calced data already given as input.
-                            or set(self.dag.successors(node)).issubset(
-                                solution.executed
-                            )
+        def handle(op, task):
+            self._handle_task(task, op, solution)
+            release(op)
+            evict_after(op)
+
+        def wakeup():
+            completed.put(None)
+
+        if token is not None:
+            token.add_callback(wakeup)
+        try:
+            while True:
+                if is_abort():
+                    ## Don't ignore solution updates from already submitted tasks.
+                    for op, task in pending.items():
+                        self._handle_task(task, op, solution)
+                    self._check_if_aborted(solution)
+                if token is not None and token.is_canceled:
+                    ## Keep tasks done, but don't wait for the rest.
+                    for op, task in pending.items():
+                        if _is_task_done(task):
+                            self._handle_task(task, op, solution)
+                        else:
+                            _cancel_task(task)
+                            solution._record_event("cancel", op.name)
+                    self._check_if_aborted(solution)
+
+                upnext = []
+                while ready:
+                    op = heapq.heappop(ready)[-1]
+                    if op in solution.canceled or op in solution.executed:
+                        release(op)
+                        evict_after(op)
+                    else:
+                        upnext.append(op)
+
+                if upnext:
+                    if _isDebugLogging():
+                        log.debug(
+                            "+++ (%s) Parallel submit%s on solution%s.",
+                            solution.solid,
+                            list(op.name for op in upnext),
+                            list(solution),
                         )
-                    ):
-                        if log.isEnabledFor(logging.INFO):
-                            log.info(
-                                "... (%s) evicting '%s' from solution%s.",
-                                solution.solid,
-                                node,
-                                list(solution),
-                            )
-                        del solution[node]
+                    tasks = self._prepare_tasks(
+                        upnext, solution, pool, parallel, marshal, on_done=completed.put
+                    )
+                    ## Run any non-parallel tasks, after pooled ones have been sent off.
+                    #
+                    inline_tasks = []
+                    for op, task in zip(upnext, tasks):
+                        if isinstance(task, (OpTask, partial)):
+                            inline_tasks.append((op, task))
+                        else:
+                            pending[op] = task
+                    for op, task in inline_tasks:
+                        handle(op, task)
+                elif pending:
+                    ## Block for the 1st completion (or cancellation/deadline),
+                    #  and drain any others arrived.
+                    #
+                    try:
+                        op = completed.get(timeout=token and token.remaining())
+                    except Empty:
+                        continue  # deadline expired
+                    while True:
+                        if op is not None:
+                            handle(op, pending.pop(op))
+                        if completed.empty():
+                            break
+                        op = completed.get()
+                else:
+                    self._evict_leftovers(solution)
+                    break
+        finally:
+            if token is not None:
+                token.remove_callback(wakeup)
 
-            # stop if no nodes left to schedule, exit out of the loop
-            if not upnext:
-                ## Re-check evictions and assume all ops executed.
-                #  Sequenced executor has no such problem bc exhausts steps.
-                #
-                #  TODO: evictions for parallel are wasting loops.
-                #
-                for node in self.steps:
-                    if isinstance(node, str) and node in solution:
-                        del solution[node]
-                break
+    async def _execute_async_method(self, solution: Solution, executor=None):
+        """
+        Await :term:`coroutine operation`\\s in the running loop, and the rest in `executor`.
 
-            if _isDebugLogging():
-                log.debug(
-                    "+++ (%s) Parallel batch%s on solution%s.",
-                    solution.solid,
-                    list(op.name for op in upnext),
-                    list(solution),
-                )
-            tasks = self._prepare_tasks(upnext, solution, pool, parallel, marshal)
+        Like :meth:`_execute_thread_pool_method()`, each op starts as soon
+        as all its upstream ops have completed, in :term:`critical path` order.
 
-            ## Handle results.
-            #
-            for op, task in zip(upnext, tasks):
-                self._handle_task(task, op, solution)
+        :param solution:
+            must contain the input values only, gets modified
+        :param executor:
+            see :meth:`execute_async()`
+        """
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        ready, release = self._ready_ops_queue()
+        evict_after = self._eviction_refcounter(solution)
+        pending = {}  # asyncio-future --> op
+        token = solution.cancel_token
+        waked = loop.create_future()  # set on cancellation, to stop waiting
+
+        def wakeup():
+            loop.call_soon_threadsafe(lambda: waked.done() or waked.set_result(None))
+
+        if token is not None:
+            token.add_callback(wakeup)
+        try:
+            while True:
+                if is_abort():
+                    ## Don't ignore solution updates from already submitted tasks.
+                    if pending:
+                        await asyncio.wait(pending)
+                        for fut, op in list(pending.items()):
+                            del pending[fut]
+                            self._handle_task(fut, op, solution)
+                    self._check_if_aborted(solution)
+                if token is not None and token.is_canceled:
+                    ## Keep tasks done, and cancel the rest (below).
+                    for fut, op in list(pending.items()):
+                        if fut.done():
+                            del pending[fut]
+                            self._handle_task(fut, op, solution)
+                        else:
+                            solution._record_event("cancel", op.name)
+                    self._check_if_aborted(solution)
+
+                ## Slice inputs for each task as it is submitted,
+                #  not to read the solution while updated by other tasks.
+                #
+                task_inputs = self._task_inputs_slicer(solution)
+                while ready:
+                    op = heapq.heappop(ready)[-1]
+                    if op in solution.canceled or op in solution.executed:
+                        release(op)
+                        evict_after(op)
+                        continue
+
+                    solution.elapsed_ms[op] = time.time()
+                    task = OpTask(op, task_inputs(op), solution.solid)
+                    if task.profile is None:
+                        task.profile = {}  # for the compute time of :term:`operation cost`
+                    if getattr(op, "is_async", None):
+                        fut = asyncio.ensure_future(task.acall())
+                    else:
+                        fut = loop.run_in_executor(executor, task)
+                    pending[fut] = op
+
+                if not pending:
+                    self._evict_leftovers(solution)
+                    break
+
+                done, _ = await asyncio.wait(
+                    [*pending, waked],
+                    timeout=token and token.remaining(),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                for fut in done:
+                    if fut is waked:
+                        continue
+                    op = pending.pop(fut)
+                    self._handle_task(fut, op, solution)
+                    release(op)
+                    evict_after(op)
+        finally:
+            if token is not None:
+                token.remove_callback(wakeup)
+            waked.cancel()
+            for fut in pending:
+                fut.cancel()
 
     def _execute_sequential_method(self, solution: Solution):
         """
@@ -903,26 +1918,205 @@ class ExecutionPlan(
             self._check_if_aborted(solution)
 
             if isinstance(step, Operation):
-                if step in solution.canceled:
+                if step in solution.canceled or step in solution.executed:
                     continue
 
                 task = OpTask(step, solution, solution.solid)
                 self._handle_task(task, step, solution)
 
             elif isinstance(step, str):
-                # Cache value may be missing if it is optional.
-                if step in solution:
-                    log.info(
-                        "... (%s) evicting '%s' from solution%s.",
-                        solution.solid,
-                        step,
-                        list(solution),
-                    )
-                    del solution[step]
+                self._evict(solution, step)
 
             else:
                 raise AssertionError(f"Unrecognized instruction.{step}")
 
+    def _prepare_solution(
+        self,
+        named_inputs,
+        outputs,
+        callbacks,
+        solution_class,
+        layered_solution,
+        validate=True,
+        checkpoint=None,
+        resume=False,
+        memory_budget=None,
+        spill_dir=None,
+        cancel=None,
+        deadline=None,
+        timeout=None,
+    ) -> Tuple[Solution, bool]:
+        """
+        Validate inputs/outputs (unless `validate` is false) and create the solution to execute.
+
+        :param checkpoint:
+            see :meth:`_resume_checkpoint()`
+        :param memory_budget:
+            see :meth:`_budget_memory()`
+        :param cancel:
+            a :class:`.CancelToken` to watch, wrapped in a new one if
+            `deadline` or `timeout` given
+        :return:
+            a 2-tuple (solution, evict)
+        """
+        if validate:
+            self.validate(named_inputs, outputs)
+
+        # If certain outputs asked, put relevant-only inputs in solution,
+        # otherwise, keep'em all.
+        #
+        evict = self.asked_outs and not is_skip_evictions()
+        # Note: clone and keep original `inputs` in the 1st chained-map.
+
+        if solution_class is None:
+            solution_class = Solution
+
+        dag = self.dag  # locals opt
+        solution = solution_class(
+            self,
+            {k: v for k, v in named_inputs.items() if k in dag.nodes}
+            if evict
+            else named_inputs,
+            callbacks,
+            is_layered=layered_solution,
+        )
+        if deadline is not None or timeout is not None:
+            cancel = CancelToken(deadline, timeout=timeout, parent=cancel)
+        solution.cancel_token = cancel
+        if memory_budget is not None:
+            self._budget_memory(solution, memory_budget, spill_dir)
+        if checkpoint is not None:
+            self._resume_checkpoint(solution, named_inputs, checkpoint, resume)
+
+        return solution, evict
+
+    def _budget_memory(self, solution: Solution, memory_budget: int, spill_dir):
+        """
+        Make `solution` :term:`spill` values to disk, when exceeding `memory_budget`.
+
+        :param memory_budget:
+            the bytes of live values (as accounted by :class:`.MemoryTracker`)
+            above which to spill; it forces :term:`memory accounting`
+        :param spill_dir:
+            a :class:`.SpillStore` (or a directory for one, or None for a temporary one)
+        """
+        from .memory import SpillStore
+
+        if any(get_accessor(d) for d in self.net.data):
+            log.warning(
+                "Ignoring `memory_budget`, cannot spill values of %s with accessors: %s",
+                self,
+                [d for d in self.net.data if get_accessor(d)],
+            )
+            return
+
+        if not isinstance(spill_dir, SpillStore):
+            spill_dir = SpillStore(spill_dir)
+        if solution.memory is None:
+            solution._start_memory_accounting()
+        solution.memory_budget = memory_budget
+        solution.spill_store = spill_dir
+        solution._mapped_spills = {}
+
+    def _resume_checkpoint(self, solution: Solution, named_inputs, checkpoint, resume):
+        """
+        Attach a :term:`checkpoint` store on `solution`, and :term:`resume` from it.
+
+        :param checkpoint:
+            a :class:`.CheckpointStore` or a directory to create one
+        :param resume:
+            when true, replay the outputs of operations saved in `checkpoint`
+            by a previous run with the same inputs, so they are not executed again;
+            otherwise, clear it
+        """
+        from .checkpoint import CheckpointStore, inputs_fingerprint, net_fingerprint
+
+        if not isinstance(checkpoint, CheckpointStore):
+            checkpoint = CheckpointStore(checkpoint)
+        inputs_key = inputs_fingerprint(named_inputs)
+        net_key = net_fingerprint(self.net)
+
+        if resume:
+            ops = {op.name: op for op in yield_ops(self.steps)}
+            resumed = []
+            for op_name, outputs in checkpoint.load(inputs_key, net_key):
+                op = ops.get(op_name)
+                if op is None or op in solution.executed:
+                    log.debug(
+                        "... (%s) skipped resuming op(%s) not in %s.",
+                        solution.solid,
+                        op_name,
+                        self,
+                    )
+                    continue
+                solution.operation_executed(op, outputs)
+                resumed.append(op_name)
+            log.info(
+                "... (%s) resumed x%i ops from %s: %s",
+                solution.solid,
+                len(resumed),
+                checkpoint,
+                resumed,
+            )
+            if not resumed:
+                checkpoint.start(inputs_key, net_key)
+        else:
+            checkpoint.start(inputs_key, net_key)
+
+        solution.checkpoint = checkpoint
+
+    def _pick_executor(self) -> Tuple[bool, Callable[[Solution], None]]:
+        """Choose a method of execution, :term:`parallel` or :term:`sequential`."""
+        in_parallel = is_parallel_tasks() or any(
+            getattr(op, "parallel", None) for op in yield_ops(self.steps)
+        )
+        executor = (
+            self._execute_thread_pool_method
+            if in_parallel
+            else self._execute_sequential_method
+        )
+        return in_parallel, executor
+
+    def _log_completion(self, solution, name, ok):
+        """Log cumulative operations elapsed time."""
+        if log.isEnabledFor(logging.INFO):
+            elapsed = sum(solution.elapsed_ms.values())
+            log.info(
+                "=== (%s) %s pipeline(%s) in %0.3fms.",
+                solution.solid,
+                "Completed" if ok else "FAILED",
+                name,
+                elapsed,
+            )
+            if solution.memory is not None:
+                log.info(
+                    "=== (%s) memory peak: %s bytes @op(%s), evicted: %s, spilled: %s bytes.",
+                    solution.solid,
+                    solution.memory.peak_bytes,
+                    solution.memory.peak_op,
+                    solution.memory.evicted_bytes,
+                    solution.memory.spilled_bytes,
+                )
+
+    @_plan_cached
+    def _expected_provides(self) -> frozenset:
+        """All (stripped) :attr:`provides` and their :term:`doc chain`\\s."""
+        expected_provides = set()
+        expected_provides.update(
+            yield_chaindocs(self.dag, self.provides, expected_provides)
+        )
+        return frozenset(dep_stripped(n) for n in expected_provides)
+
+    def _check_evictions(self, solution):
+        """Validate eviction was perfect."""
+        expected_provides = self._expected_provides
+        # It is a proper subset when not all outputs calculated.
+        assert expected_provides.issuperset(solution), (
+            f"Evictions left more data{list(iset(solution) - set(self.provides))} than {self}!"
+            '\n  (hint: did you bypass "impossible-outputs" validation?)'
+            "\n  (tip: enable DEBUG-logging and/or set GRAPHTIK_DEBUG envvar to investigate)"
+        )
+
     def execute(
         self,
         named_inputs,
@@ -932,6 +2126,14 @@ class ExecutionPlan(
         callbacks: Tuple[Callable[[OpTask], None], ...] = None,
         solution_class=None,
         layered_solution=None,
+        validate=True,
+        checkpoint=None,
+        resume=False,
+        memory_budget: int = None,
+        spill_dir=None,
+        cancel: CancelToken = None,
+        deadline: float = None,
+        timeout: float = None,
     ) -> Solution:
         """
         :param named_inputs:
@@ -961,6 +2163,30 @@ class ExecutionPlan(
               regardless of any *jsonp* dependencies.
             - If ``None``, layers are used only if there are NO :term:`jsonp` dependencies
               in the network.
+        :param validate:
+            when false, skip :meth:`validate()` for inputs/outputs already checked
+            (e.g. by :meth:`.Pipeline.compute_many()` for records with the same keys)
+        :param checkpoint:
+            a :class:`.CheckpointStore` (or a directory for one) to save
+            the outputs of each operation as soon as it executes ok
+            (see :term:`checkpoint`)
+        :param resume:
+            when true, reload the outputs of operations saved in `checkpoint`
+            by a previous (crashed) run with the same inputs, and skip those operations;
+            otherwise, any previous contents of `checkpoint` are cleared
+        :param memory_budget:
+            if given, the bytes of live solution values (forcing :term:`memory accounting`)
+            above which the largest values not needed by the next few operations
+            are :term:`spill`\\ed into `spill_dir`, and loaded back on access
+        :param spill_dir:
+            a :class:`.SpillStore` (or a directory for one) to spill values into;
+            if None, a temporary directory is used, removed along with the solution
+        :param cancel:
+            a :class:`.CancelToken` to abort just this run (see :term:`cancellation`)
+        :param deadline:
+            a :func:`time.time()` timestamp to abort this run, if not completed by then
+        :param timeout:
+            seconds from now, like `deadline`
 
         :return:
             The :term:`solution` which contains the results of each operation executed
@@ -973,46 +2199,113 @@ class ExecutionPlan(
                 if given `inputs` mismatched plan's :attr:`needs`.
             *Unreachable outputs...*
                 if net cannot produce asked `outputs`.
+        :raises AbortedException:
+            on :term:`abort run` or :term:`cancellation`, with the partial solution
+            (the reason in its :attr:`.Solution.aborted`)
         """
         ok = False
         try:
-            self.validate(named_inputs, outputs)
-            dag = self.dag  # locals opt
-
-            ## Choose a method of execution
-            #
-            in_parallel = is_parallel_tasks() or any(
-                getattr(op, "parallel", None) for op in yield_ops(self.steps)
+            solution, evict = self._prepare_solution(
+                named_inputs,
+                outputs,
+                callbacks,
+                solution_class,
+                layered_solution,
+                validate,
+                checkpoint,
+                resume,
+                memory_budget,
+                spill_dir,
+                cancel,
+                deadline,
+                timeout,
             )
-            executor = (
-                self._execute_thread_pool_barrier_method
-                if in_parallel
-                else self._execute_sequential_method
+
+            in_parallel, executor = self._pick_executor()
+
+            log.info(
+                "=== (%s) Executing pipeline(%s)%s%s, on inputs%s, according to %s...",
+                solution.solid,
+                name,
+                ", in parallel" if in_parallel else "",
+                ", evicting" if evict else "",
+                list(solution),
+                self,
             )
 
-            # If certain outputs asked, put relevant-only inputs in solution,
-            # otherwise, keep'em all.
-            #
-            evict = self.asked_outs and not is_skip_evictions()
-            # Note: clone and keep original `inputs` in the 1st chained-map.
+            ok2 = False
+            try:
+                executor(solution)
+                ok2 = True
+            finally:
+                self._log_completion(solution, name, ok2)
 
-            if solution_class is None:
-                solution_class = Solution
+            if evict:
+                self._check_evictions(solution)
 
-            solution = solution_class(
-                self,
-                {k: v for k, v in named_inputs.items() if k in dag.nodes}
-                if evict
-                else named_inputs,
+            ok = True
+            return solution
+        finally:
+            if not ok:
+                from .jetsam import save_jetsam
+
+                ex = sys.exc_info()[1]
+                save_jetsam(ex, locals(), "solution")
+
+    async def execute_async(
+        self,
+        named_inputs,
+        outputs=None,
+        *,
+        name="",
+        callbacks: Tuple[Callable[[OpTask], None], ...] = None,
+        solution_class=None,
+        layered_solution=None,
+        executor: "Executor" = None,
+        validate=True,
+        checkpoint=None,
+        resume=False,
+        memory_budget: int = None,
+        spill_dir=None,
+        cancel: CancelToken = None,
+        deadline: float = None,
+        timeout: float = None,
+    ) -> Solution:
+        """
+        Like :meth:`execute()` but awaiting concurrently :term:`coroutine operation`\\s.
+
+        Coroutine operations run in the current event-loop, while all others
+        run in the `executor`, and each op starts as soon as all its upstream ops
+        have completed.
+
+        :param executor:
+            a :class:`concurrent.futures.Executor` to run non-coroutine operations;
+            if None, the default executor of the running event-loop is used.
+
+        For the rest arguments & exceptions, see :meth:`execute()`.
+        """
+        ok = False
+        try:
+            solution, evict = self._prepare_solution(
+                named_inputs,
+                outputs,
                 callbacks,
-                is_layered=layered_solution,
+                solution_class,
+                layered_solution,
+                validate,
+                checkpoint=checkpoint,
+                resume=resume,
+                memory_budget=memory_budget,
+                spill_dir=spill_dir,
+                cancel=cancel,
+                deadline=deadline,
+                timeout=timeout,
             )
 
             log.info(
-                "=== (%s) Executing pipeline(%s)%s%s, on inputs%s, according to %s...",
+                "=== (%s) Executing pipeline(%s) asynchronously%s, on inputs%s, according to %s...",
                 solution.solid,
                 name,
-                ", in parallel" if in_parallel else "",
                 ", evicting" if evict else "",
                 list(solution),
                 self,
@@ -1020,35 +2313,13 @@ class ExecutionPlan(
 
             ok2 = False
             try:
-                executor(solution)
+                await self._execute_async_method(solution, executor)
                 ok2 = True
             finally:
-                ## Log cumulative operations elapsed time.
-                #
-                if log.isEnabledFor(logging.INFO):
-                    elapsed = sum(solution.elapsed_ms.values())
-                    log.info(
-                        "=== (%s) %s pipeline(%s) in %0.3fms.",
-                        solution.solid,
-                        "Completed" if ok2 else "FAILED",
-                        name,
-                        elapsed,
-                    )
+                self._log_completion(solution, name, ok2)
 
-            # Validate eviction was perfect
-            #
             if evict:
-                expected_provides = set()
-                expected_provides.update(
-                    yield_chaindocs(dag, self.provides, expected_provides)
-                )
-                expected_provides = set(dep_stripped(n) for n in expected_provides)
-                # It is a proper subset when not all outputs calculated.
-                assert set(solution).issubset(expected_provides), (
-                    f"Evictions left more data{list(iset(solution) - set(self.provides))} than {self}!"
-                    '\n  (hint: did you bypass "impossible-outputs" validation?)'
-                    "\n  (tip: enable DEBUG-logging and/or set GRAPHTIK_DEBUG envvar to investigate)"
-                )
+                self._check_evictions(solution)
 
             ok = True
             return solution
@@ -1058,3 +2329,285 @@ class ExecutionPlan(
 
                 ex = sys.exc_info()[1]
                 save_jetsam(ex, locals(), "solution")
+
+    def to_program(self) -> "SlotProgram":
+        """
+        Lower this plan into a (memoized) :class:`SlotProgram`, for fast re-execution.
+
+        :raises ValueError:
+            if the plan is not "plain" (see :class:`SlotProgram`)
+        """
+        program = self.__dict__.get("_slot_program")
+        if program is None:
+            program = self.__dict__["_slot_program"] = SlotProgram(self)
+        return program
+
+
+#: Marks a slot in :class:`SlotProgram` values without any value.
+_EMPTY = object()
+
+## :class:`SlotProgram` instruction kinds, and need kinds.
+#
+_CALL_POSITIONAL, _CALL_NEEDS, _CALL_COMPUTE = range(3)
+_NEED_POSITIONAL, _NEED_KEYWORD, _NEED_VARARG, _NEED_VARARGS = range(4)
+
+
+class SlotSolution(abc.Mapping):
+    """A read-only, :class:`.Solution`-like mapping over the values of a :class:`SlotProgram` run."""
+
+    __slots__ = ("plan", "_index", "_values", "_extras")
+
+    def __init__(self, plan, index: Mapping[str, int], values: list, extras: dict):
+        #: the plan that produced this solution
+        self.plan = plan
+        self._index = index
+        self._values = values
+        # inputs not in plan, when not evicting
+        self._extras = extras
+
+    def __getitem__(self, key):
+        slot = self._index.get(key)
+        if slot is None:
+            return self._extras[key]
+        val = self._values[slot]
+        if val is _EMPTY:
+            raise KeyError(key)
+        return val
+
+    def __contains__(self, key):
+        slot = self._index.get(key)
+        if slot is None:
+            return key in self._extras
+        return self._values[slot] is not _EMPTY
+
+    def __iter__(self):
+        values = self._values
+        yield from (k for k, i in self._index.items() if values[i] is not _EMPTY)
+        yield from self._extras
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self)})"
+
+
+class SlotProgram:
+    """
+    An :class:`ExecutionPlan` lowered into instructions over integer-indexed value slots.
+
+    Every data node maps to a slot in a flat list of values, and each operation
+    step becomes a precomputed record of its input & output slots, followed by
+    the slots to :term:`evict <eviction>`, sparing most of the per-step interpretation
+    of :meth:`ExecutionPlan.execute()` for small, latency-critical pipelines.
+
+    Only "plain" plans can be lowered, without any :term:`jsonp`, :term:`sideffects`,
+    :term:`implicit` or :term:`accessor` dependencies, nor :term:`rescheduled <reschedule>`,
+    :term:`endured`, :term:`memoized <memoization>` or :term:`chunked` operations
+    (and :class:`.Chunks` inputs are not concatenated).
+    Operations run :term:`sequential`\\ly, any failure propagates,
+    and there are no :term:`callbacks`, nor :data:`task_context`.
+
+    Create it with :meth:`ExecutionPlan.to_program()`, and call it with the inputs
+    to get a :class:`SlotSolution`.
+    """
+
+    __slots__ = (
+        "plan",
+        "_index",
+        "_needs",
+        "_evict",
+        "_leading_evictions",
+        "_instructions",
+        "_no_evictions",
+    )
+
+    def __init__(self, plan: ExecutionPlan):
+        plan.validate()
+
+        index = {}
+
+        def slot(dep) -> int:
+            for check in (get_jsonp, is_sfx, is_implicit, get_accessor):
+                if check(dep):
+                    raise ValueError(
+                        f"Cannot lower non-plain dependency {dep!r} into slots!\n  {plan}"
+                    )
+            # Plain `str` keys, for the solution-view.
+            return index.setdefault(str.__str__(dep_stripped(dep)), len(index))
+
+        ## Slots ordered like data in dag.
+        for n in plan.dag.nodes:
+            if not isinstance(n, Operation):
+                slot(n)
+
+        instructions = []
+        evictions = leading_evictions = []
+        for step in plan.steps:
+            if isinstance(step, str):
+                evictions.append(slot(step))
+                continue
+
+            op = step
+            for attr in ("rescheduled", "endured", "memoize", "chunked"):
+                # NOTE: empty memo-stores are falsy.
+                if getattr(op, attr, None) not in (None, False):
+                    raise ValueError(
+                        f"Cannot lower {attr} operation into slots!\n  {op}"
+                    )
+            if instructions:
+                instructions[-1][-1].extend(evictions)
+            else:
+                leading_evictions = evictions
+            evictions = []
+
+            fn_needs = getattr(op, "_fn_needs", None)
+            all_deps = [*op.needs, *op.provides]
+            slots = [slot(d) for d in all_deps]
+            if fn_needs is None or getattr(op, "is_async", None):
+                kind = _CALL_COMPUTE
+                ins = None
+                outs = {
+                    dep_stripped(p): i
+                    for p, i in zip(op.provides, slots[len(op.needs) :])
+                }
+            else:
+                needs = [
+                    (
+                        slot(n),
+                        (
+                            _NEED_KEYWORD
+                            if get_keyword(n)
+                            else _NEED_VARARG
+                            if is_vararg(n)
+                            else _NEED_VARARGS
+                            if is_varargs(n)
+                            else _NEED_POSITIONAL
+                        ),
+                        get_keyword(n),
+                        bool(is_optional(n)),
+                    )
+                    for n in fn_needs
+                ]
+                if all(k == _NEED_POSITIONAL and not opt for _, k, _, opt in needs):
+                    kind = _CALL_POSITIONAL
+                    ins = tuple(i for i, *_ in needs)
+                else:
+                    kind = _CALL_NEEDS
+                    ins = tuple(needs)
+
+                fn_provides = op._fn_provides
+                if (
+                    len(fn_provides) == 1
+                    and list(op.provides) == list(fn_provides)
+                    and not op.aliases
+                    and not op.returns_dict
+                ):
+                    outs = slot(fn_provides[0])
+                else:
+                    outs = {dep_stripped(p): slot(p) for p in op.provides}
+            instructions.append((op, kind, ins, outs, []))
+
+        self.plan = plan
+        self._index = index
+        self._needs = frozenset(plan.needs)
+        self._evict = bool(plan.asked_outs)
+        if instructions:
+            instructions[-1][-1].extend(evictions)
+        self._leading_evictions = tuple(leading_evictions)
+        self._instructions = [(*i[:-1], tuple(i[-1])) for i in instructions]
+        self._no_evictions = [(*i[:-1], ()) for i in instructions]
+
+    def __repr__(self):
+        return (
+            f"{type(self).__name__}(x{len(self._index)} slots,"
+            f" x{len(self._instructions)} ops)"
+        )
+
+    def __call__(self, named_inputs: Mapping) -> SlotSolution:
+        """
+        Execute the program on `named_inputs` (not modified).
+
+        :raises ValueError:
+            if given `inputs` mismatched plan's :attr:`needs`, or if operations
+            are configured to be :term:`endured` or :term:`rescheduled <reschedule>`.
+        :raises AbortedException:
+            if :term:`abort run` is signaled
+        """
+        plan = self.plan
+        if not self._needs.issubset(named_inputs.keys()):
+            plan.validate(named_inputs)
+        if (
+            is_endure_operations()
+            or is_reschedule_operations()
+            or is_memoize_operations()
+        ):
+            raise ValueError(
+                f"Cannot run {self} with endured/rescheduled/memoized operations configured!"
+            )
+
+        evict = self._evict and not is_skip_evictions()
+        index = self._index
+        values = [_EMPTY] * len(index)
+        extras = {}
+        for k, v in named_inputs.items():
+            slot = index.get(k)
+            if slot is not None:
+                values[slot] = v
+            elif not evict:
+                extras[k] = v
+        if evict:
+            for i in self._leading_evictions:
+                values[i] = _EMPTY
+        solution = SlotSolution(plan, index, values, extras)
+
+        for op, kind, ins, outs, evictions in (
+            self._instructions if evict else self._no_evictions
+        ):
+            if is_abort():
+                raise AbortedException(solution)
+
+            if kind == _CALL_POSITIONAL:
+                results = op.fn(*[values[i] for i in ins])
+            elif kind == _CALL_NEEDS:
+                positional, vararg_vals, kwargs = [], [], {}
+                for i, need_kind, keyword, opt in ins:
+                    val = values[i]
+                    if val is _EMPTY:
+                        if opt:
+                            continue
+                        need = next(k for k, j in index.items() if j == i)
+                        raise ValueError(f"Missing compulsory need({need}) for {op}!")
+                    if need_kind == _NEED_POSITIONAL:
+                        positional.append(val)
+                    elif need_kind == _NEED_KEYWORD:
+                        kwargs[keyword] = val
+                    elif need_kind == _NEED_VARARG:
+                        vararg_vals.append(val)
+                    else:
+                        if isinstance(val, str) or not isinstance(val, abc.Iterable):
+                            raise ValueError(
+                                f"Expected varargs inputs to be non-str iterables: {val}"
+                                f"\n  {op}"
+                            )
+                        vararg_vals.extend(val)
+                results = op.fn(*positional, *vararg_vals, **kwargs)
+            else:
+                results = op.compute(solution)
+
+            if (
+                type(outs) is int
+                and results is not NO_RESULT
+                and results is not NO_RESULT_BUT_SFX
+            ):
+                values[outs] = results
+            else:
+                if kind != _CALL_COMPUTE:
+                    results = op._zip_results_with_provides(results)
+                for k, v in results.items():
+                    values[outs[k]] = v
+
+            for i in evictions:
+                values[i] = _EMPTY
+
+        return solution
@@ -14,6 +14,7 @@ import sys
 import textwrap
 from collections import abc as cabc
 from functools import update_wrapper, wraps
+from inspect import iscoroutinefunction
 from typing import Callable, Collection, List, Mapping, Sequence, Tuple
 
 from boltons.setutils import IndexedSet as iset
@@ -31,6 +32,7 @@ from .base import (
     first_solid,
     func_name,
 )
+from .chunks import Chunks, _pick_chunks
 from .modifier import (
     dep_renamed,
     dep_singularized,
@@ -334,6 +336,8 @@ class FnOp(Operation):
         marshalled=None,
         returns_dict=None,
         node_props: Mapping = None,
+        memoize=None,
+        chunked=None,
     ):
         """
         Build a new operation out of some function and its requirements.
@@ -348,6 +352,8 @@ class FnOp(Operation):
 
         if fn and not callable(fn):
             raise TypeError(f"Operation was provided with a non-callable: {fn}")
+        if chunked and iscoroutinefunction(fn):
+            raise TypeError(f"Coroutine operation cannot be `chunked`: {fn}")
         if node_props is not None and not isinstance(node_props, cabc.Mapping):
             raise TypeError(
                 f"Operation `node_props` must be a dict, was {type(node_props).__name__!r}: {node_props}"
@@ -455,6 +461,14 @@ class FnOp(Operation):
         #: if they start with :data:`.USER_STYLE_PREFFIX`,
         #: unless they start with underscore(``_``).
         self.node_props = node_props
+        #: If true, or a :class:`.memoize.MemoStore`, outputs are :term:`memoized <memoization>`
+        #: keyed by the values of its needs;
+        #: ignored if :term:`memoization` enabled/disabled globally.
+        self.memoize = memoize
+        #: If true (or a callable to concatenate chunks), the function
+        #: returns an iterator of :term:`chunked` outputs, and receives any
+        #: chunked inputs unconcatenated, as :class:`.Chunks`.
+        self.chunked = chunked
 
     def __repr__(self):
         """
@@ -523,6 +537,8 @@ class FnOp(Operation):
         marshalled=...,
         returns_dict=...,
         node_props: Mapping = ...,
+        memoize=...,
+        chunked=...,
         renamer=None,
     ) -> "FnOp":
         """
@@ -664,6 +680,8 @@ class FnOp(Operation):
                     continue
                 else:
                     inp_value = named_inputs[n]
+                    if type(inp_value) is Chunks and not self.chunked:
+                        inp_value = inp_value.value()
 
                 keyword = get_keyword(n)
                 if keyword:
@@ -859,6 +877,75 @@ class FnOp(Operation):
 
         return results
 
+    @property
+    def is_async(self) -> bool:
+        """True if the underlying function is a :term:`coroutine operation`."""
+        return iscoroutinefunction(self.fn)
+
+    def _call_chunked(self, positional, varargs, kwargs):
+        """
+        Call a :term:`chunked` `fn` once, wrapping its iterator into :class:`.Chunks` per provide.
+
+        Ops without (non-sideffect) provides are sinks: any iterator returned
+        is consumed right away (pulling all chunked inputs).
+        """
+        results = self.fn(*positional, *varargs, **kwargs)
+        concat = self.chunked if callable(self.chunked) else None
+        fn_provides = self._fn_provides
+        name = self.name
+
+        if not fn_provides:
+            if isinstance(results, cabc.Iterator):
+                for _ in results:
+                    pass
+                results = None
+            return results
+        if len(fn_provides) == 1 and not self.returns_dict:
+            return Chunks(results, concat, name)
+
+        keys = (
+            [get_keyword(p) or p for p in fn_provides]
+            if self.returns_dict
+            else range(len(fn_provides))
+        )
+        # Each output reads the chunks of the (single-pass) iterator.
+        source = Chunks(results, None, name)
+        source.expect(len(keys))
+        columns = [Chunks(_pick_chunks(source, k), concat, name) for k in keys]
+
+        return dict(zip(keys, columns)) if self.returns_dict else tuple(columns)
+
+    def _keep_asked_outputs(self, results_op, outputs) -> dict:
+        outputs = astuple(outputs, "outputs", allowed_types=cabc.Collection)
+
+        ## Keep only outputs asked.
+        #  Note that plan's executors do not ask outputs
+        #  (see `OpTask.__call__`).
+        #
+        if outputs:
+            outputs = set(n for n in outputs)
+            results_op = {key: val for key, val in results_op.items() if key in outputs}
+
+        return results_op
+
+    def _save_compute_jetsam(self, ex, locs):
+        from .jetsam import save_jetsam
+
+        save_jetsam(
+            ex,
+            locs,
+            "outputs",
+            "aliases",
+            "results_fn",
+            "results_op",
+            operation="self",
+            args=lambda locs: {
+                "positional": locs.get("positional"),
+                "varargs": locs.get("varargs"),
+                "kwargs": locs.get("kwargs"),
+            },
+        )
+
     def compute(
         self,
         named_inputs=None,
@@ -874,6 +961,12 @@ class FnOp(Operation):
             ignored -- to comply with superclass contract
         :param kw:
             ignored -- to comply with superclass contract
+
+        :raises RuntimeError:
+            if a :term:`coroutine operation` is computed from within a running event-loop,
+            with msg:
+
+                *Cannot compute coroutine op ...*
         """
         ok = False
         try:
@@ -883,42 +976,54 @@ class FnOp(Operation):
                 named_inputs = {}
 
             positional, varargs, kwargs = self._match_inputs_with_fn_needs(named_inputs)
-            results_fn = self.fn(*positional, *varargs, **kwargs)
+            if self.chunked:
+                results_fn = self._call_chunked(positional, varargs, kwargs)
+            else:
+                results_fn = self.fn(*positional, *varargs, **kwargs)
+                if self.is_async:
+                    results_fn = _run_coroutine(results_fn, self)
             results_op = self._zip_results_with_provides(results_fn)
+            results_op = self._keep_asked_outputs(results_op, outputs)
 
-            outputs = astuple(outputs, "outputs", allowed_types=cabc.Collection)
+            ok = True
+            return results_op
+        finally:
+            if not ok:
+                self._save_compute_jetsam(sys.exc_info()[1], locals())
 
-            ## Keep only outputs asked.
-            #  Note that plan's executors do not ask outputs
-            #  (see `OpTask.__call__`).
-            #
-            if outputs:
-                outputs = set(n for n in outputs)
-                results_op = {
-                    key: val for key, val in results_op.items() if key in outputs
-                }
+    async def compute_async(
+        self,
+        named_inputs=None,
+        # /,  PY3.8+ positional-only
+        outputs: Items = None,
+    ) -> dict:
+        """
+        Like :meth:`compute()` but awaiting the results of :term:`coroutine operation`\\s.
+
+        Non-coroutine functions are called as is, blocking the event-loop.
+        """
+        ok = False
+        try:
+            self.validate_fn_name()
+            assert self.name is not None, self
+            if named_inputs is None:
+                named_inputs = {}
+
+            positional, varargs, kwargs = self._match_inputs_with_fn_needs(named_inputs)
+            if self.chunked:
+                results_fn = self._call_chunked(positional, varargs, kwargs)
+            else:
+                results_fn = self.fn(*positional, *varargs, **kwargs)
+                if self.is_async:
+                    results_fn = await results_fn
+            results_op = self._zip_results_with_provides(results_fn)
+            results_op = self._keep_asked_outputs(results_op, outputs)
 
             ok = True
             return results_op
         finally:
             if not ok:
-                from .jetsam import save_jetsam
-
-                ex = sys.exc_info()[1]
-                save_jetsam(
-                    ex,
-                    locals(),
-                    "outputs",
-                    "aliases",
-                    "results_fn",
-                    "results_op",
-                    operation="self",
-                    args=lambda locs: {
-                        "positional": locs.get("positional"),
-                        "varargs": locs.get("varargs"),
-                        "kwargs": locs.get("kwargs"),
-                    },
-                )
+                self._save_compute_jetsam(sys.exc_info()[1], locals())
 
     def __call__(self, *args, **kwargs):
         """Like dict args, delegates to :meth:`.compute()`."""
@@ -944,6 +1049,22 @@ class FnOp(Operation):
         return plot_args
 
 
+def _run_coroutine(coro, op):
+    """Drive the `coro` of a :term:`coroutine operation` `op` in a new event-loop."""
+    import asyncio
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    coro.close()  # Avoid "never awaited" warnings.
+    raise RuntimeError(
+        f"Cannot compute coroutine op from within a running event-loop: {op}"
+        "\n  (tip: use `compute_async()` instead)"
+    )
+
+
 def operation(
     fn: Callable = UNSET,
     name=UNSET,
@@ -958,12 +1079,15 @@ def operation(
     marshalled=UNSET,
     returns_dict=UNSET,
     node_props: Mapping = UNSET,
+    memoize=UNSET,
+    chunked=UNSET,
 ) -> FnOp:
     r"""
     An :term:`operation` factory that works like a "fancy decorator".
 
     :param fn:
-        The callable underlying this operation:
+        The callable underlying this operation, which may also be a :term:`coroutine operation`
+        (an ``async def`` function):
 
           - if not given, it returns the the :meth:`withset()` method as the decorator,
             so it still supports all arguments, apart from `fn`.
@@ -1060,6 +1184,17 @@ def operation(
         :meth:`.Pipeline.withset()`.
         Also plot-rendering affected if they match `Graphviz` properties.,
         unless they start with underscore(``_``)
+    :param memoize:
+        If true, :term:`memoize <memoization>` outputs keyed by the values of the `needs`,
+        in the store plugged with :func:`.memo_store_plugged()` (or the default one);
+        if a :class:`.memoize.MemoStore` instance, use that store instead.
+        Ignored if memoization enabled/disabled globally.
+    :param chunked:
+        If true, `fn` returns an iterator of :term:`chunked` outputs (e.g. a generator
+        of dataframe row-batches), called once and pulled lazily as :class:`.Chunks`,
+        and receives any chunked inputs as such, to consume them incrementally;
+        if a callable, it concatenates the list of chunks for non-chunked consumers
+        (default :func:`.chunks.concat_chunks()`).
 
     :return:
         when called with `fn`, it returns a :class:`.FnOp`,
@@ -0,0 +1,384 @@
+# Copyright 2023-2023, Kostis Anagnostopoulos;
+# Licensed under the terms of the Apache License, Version 2.0. See the LICENSE file associated with the project for terms.
+"""
+:term:`memoization` stores, caching operation outputs keyed by the values of their needs.
+
+.. seealso:: :func:`.set_memoize_operations()`, :func:`.memo_store_plugged()`
+    and the `memoize` argument of :func:`.operation`.
+"""
+import hashlib
+import logging
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from functools import partial
+from types import BuiltinFunctionType, CodeType, FunctionType, ModuleType
+from typing import Any, Mapping, Optional
+
+from .base import UNSET, Operation
+
+log = logging.getLogger(__name__)
+
+
+class MemoStore:
+    """
+    Base class for :term:`memoization` stores, counting hits & misses.
+
+    Subclasses must implement :meth:`_load()`, :meth:`_save()` & :meth:`_drop()`,
+    and may override :meth:`clear()` & :meth:`__len__()`.
+    """
+
+    def __init__(self, ttl: float = None):
+        """
+        :param ttl:
+            if given, the number of seconds after which stored outputs expire
+        """
+        self.ttl = ttl
+        #: number of outputs found in the store
+        self.hits = 0
+        #: number of outputs not found (or expired) in the store
+        self.misses = 0
+        #: number of outputs dropped, to respect size (or expired)
+        self.evictions = 0
+
+    def _load(self, key: str):
+        """Return a ``(timestamp, outputs)`` tuple, or :data:`.UNSET`."""
+        raise NotImplementedError()
+
+    def _save(self, key: str, stamped_outputs: tuple) -> None:
+        raise NotImplementedError()
+
+    def _drop(self, key: str) -> None:
+        raise NotImplementedError()
+
+    def get(self, key: str) -> Any:
+        """Return the outputs stored for `key` (if not expired), or :data:`.UNSET`."""
+        stamped = self._load(key)
+        if stamped is not UNSET:
+            stamp, outputs = stamped
+            if self.ttl is None or time.time() - stamp < self.ttl:
+                self.hits += 1
+                return outputs
+            self._drop(key)
+            self.evictions += 1
+        self.misses += 1
+
+        return UNSET
+
+    def set(self, key: str, outputs: Mapping) -> None:
+        """Store the `outputs` of an operation under `key`."""
+        self._save(key, (time.time(), outputs))
+
+    def clear(self) -> None:
+        """Drop all outputs and zero counters."""
+        self.hits = self.misses = self.evictions = 0
+
+    @property
+    def stats(self) -> dict:
+        """A dict with the hit/miss/eviction counters and the number of stored items."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self),
+        }
+
+    def __len__(self):
+        return 0
+
+    def __repr__(self):
+        stats = ", ".join(f"{k}={v}" for k, v in self.stats.items())
+        return f"{type(self).__name__}({stats})"
+
+
+class LRUMemoStore(MemoStore):
+    """
+    An in-process :term:`memoization` store, dropping the least-recently-used outputs.
+
+    It is thread-safe, but useless for :term:`process pool` workers,
+    which receive an empty copy of it.
+    """
+
+    def __init__(self, maxsize: Optional[int] = 1024, ttl: float = None):
+        """
+        :param maxsize:
+            the maximum number of outputs to keep (unbounded if None)
+        :param ttl:
+            if given, the number of seconds after which stored outputs expire
+        """
+        super().__init__(ttl)
+        self.maxsize = maxsize
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = dict(vars(self))
+        state["_cache"] = OrderedDict()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        vars(self).update(state)
+        self._lock = threading.Lock()
+
+    def _load(self, key):
+        with self._lock:
+            stamped = self._cache.get(key, UNSET)
+            if stamped is not UNSET:
+                self._cache.move_to_end(key)
+            return stamped
+
+    def _save(self, key, stamped_outputs):
+        with self._lock:
+            cache = self._cache
+            cache[key] = stamped_outputs
+            cache.move_to_end(key)
+            if self.maxsize is not None:
+                while len(cache) > self.maxsize:
+                    cache.popitem(last=False)
+                    self.evictions += 1
+
+    def _drop(self, key):
+        with self._lock:
+            self._cache.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+        super().clear()
+
+    def __len__(self):
+        return len(self._cache)
+
+
+class DirMemoStore(MemoStore):
+    """
+    A :term:`memoization` store pickling outputs as files in a directory.
+
+    Can be shared among processes (e.g. :term:`process pool` workers)
+    or across runs; files are written atomically.
+    """
+
+    suffix = ".memo.pkl"
+
+    def __init__(self, directory: str, maxsize: Optional[int] = None, ttl: float = None):
+        """
+        :param directory:
+            where to store the files (created if missing)
+        :param maxsize:
+            if given, the maximum number of files to keep, dropping the oldest ones
+        :param ttl:
+            if given, the number of seconds after which stored outputs expire
+        """
+        super().__init__(ttl)
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.maxsize = maxsize
+
+    def _fpath(self, key):
+        return os.path.join(self.directory, f"{key}{self.suffix}")
+
+    def _fpaths(self):
+        return [
+            os.path.join(self.directory, f)
+            for f in os.listdir(self.directory)
+            if f.endswith(self.suffix)
+        ]
+
+    def _load(self, key):
+        try:
+            with open(self._fpath(key), "rb") as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            return UNSET
+        except Exception as ex:
+            log.warning("Ignoring corrupted memo-file(%s) due to: %s", key, ex)
+            return UNSET
+
+    def _save(self, key, stamped_outputs):
+        fpath = self._fpath(key)
+        tmp_fpath = f"{fpath}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_fpath, "wb") as f:
+            pickle.dump(stamped_outputs, f, pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_fpath, fpath)
+
+        if self.maxsize is not None:
+            fpaths = self._fpaths()
+            if len(fpaths) > self.maxsize:
+                fpaths.sort(key=os.path.getmtime)
+                for fp in fpaths[: len(fpaths) - self.maxsize]:
+                    try:
+                        os.remove(fp)
+                        self.evictions += 1
+                    except FileNotFoundError:
+                        pass
+
+    def _drop(self, key):
+        try:
+            os.remove(self._fpath(key))
+        except FileNotFoundError:
+            pass
+
+    def clear(self):
+        for fp in self._fpaths():
+            os.remove(fp)
+        super().clear()
+
+    def __len__(self):
+        return len(self._fpaths())
+
+
+_default_store: Optional[LRUMemoStore] = None
+
+
+def default_memo_store() -> LRUMemoStore:
+    """The process-wide :class:`LRUMemoStore` used when none plugged in configs."""
+    global _default_store
+
+    if _default_store is None:
+        _default_store = LRUMemoStore()
+    return _default_store
+
+
+_value_types = (str, bytes, int, float, complex, bool, type(None))
+_ref_types = (type, ModuleType, BuiltinFunctionType)
+
+
+def _code_ident(code: CodeType) -> tuple:
+    consts = tuple(
+        _code_ident(c) if isinstance(c, CodeType) else c for c in code.co_consts
+    )
+    return (code.co_code, code.co_names, consts)
+
+
+class UnidentifiableFunction(TypeError):
+    """A function binding values that may change, or not identified by value."""
+
+
+def _bound_ident(value, seen: set) -> Any:
+    """
+    The identity of a value bound to a function (closure, defaults, partial args).
+
+    Immutable values & importable objects count by value, functions by :func:`fn_ident()`.
+
+    :raises UnidentifiableFunction:
+        for anything else (e.g. mutable containers), whose value may change
+        after being memoized
+    """
+    if isinstance(value, (FunctionType, partial)):
+        return fn_ident(value, seen)
+    if isinstance(value, _value_types) or isinstance(value, _ref_types):
+        return value
+    if isinstance(value, (tuple, frozenset)):
+        return (type(value).__name__, tuple(_bound_ident(v, seen) for v in value))
+    raise UnidentifiableFunction(
+        f"bound value of type {type(value).__name__!r} not identified by value"
+    )
+
+
+def fn_ident(fn, seen: set = None) -> Any:
+    """
+    A picklable identity of `fn`, from its code & bound values, not just its name.
+
+    Closures of the same function built with different values (or partials
+    of it with different args) get different identities.
+    Global variables read by the function are not part of its identity.
+
+    :param seen:
+        the ids of functions visited so far (for recursive closures)
+    :raises UnidentifiableFunction:
+        when binding values not identified by value (see :func:`_bound_ident()`)
+    """
+    if seen is None:
+        seen = set()
+    if id(fn) in seen:
+        return ("recursive", getattr(fn, "__qualname__", None))
+    seen.add(id(fn))
+
+    if isinstance(fn, partial):
+        kw = sorted(fn.keywords.items())
+        return (
+            "partial",
+            fn_ident(fn.func, seen),
+            tuple(_bound_ident(a, seen) for a in fn.args),
+            tuple((k, _bound_ident(v, seen)) for k, v in kw),
+        )
+    code = getattr(fn, "__code__", None)
+    if not isinstance(fn, FunctionType) or code is None:
+        return _bound_ident(fn, seen)
+
+    cells = []
+    for cell in fn.__closure__ or ():
+        try:
+            cells.append(_bound_ident(cell.cell_contents, seen))
+        except ValueError:  # empty cell
+            cells.append(None)
+    kwdefaults = sorted((fn.__kwdefaults__ or {}).items())
+    return (
+        fn.__module__,
+        fn.__qualname__,
+        _code_ident(code),
+        tuple(_bound_ident(d, seen) for d in fn.__defaults__ or ()),
+        tuple((k, _bound_ident(v, seen)) for k, v in kwdefaults),
+        tuple(cells),
+    )
+
+
+def memo_key(op: Operation, inputs: Mapping) -> Optional[str]:
+    """
+    A stable hash of the `op` identity and the values of its needs in `inputs`.
+
+    The op is identified by its name, provides and the :func:`fn_ident()` of its `fn`.
+
+    :return:
+        the hex-digest, or None if some value could not be pickled,
+        or the `fn` binds values not identified by value (with a warning),
+        or the op has no ``_fn_needs``
+    """
+    fn_needs = getattr(op, "_fn_needs", None)
+    if fn_needs is None:
+        return None
+    try:
+        ident = (
+            op.name,
+            fn_ident(getattr(op, "fn", None)),
+            tuple(str(p) for p in op.provides),
+        )
+        values = tuple((str(n), inputs[n]) for n in fn_needs if n in inputs)
+        blob = pickle.dumps((ident, values), pickle.HIGHEST_PROTOCOL)
+    except UnidentifiableFunction as ex:
+        log.warning("Not memoizing op(%s), its function has %s.", op.name, ex)
+        return None
+    except Exception as ex:
+        log.debug("Cannot memoize op(%s) due to: %s", op.name, ex)
+        return None
+
+    return hashlib.sha1(blob).hexdigest()
+
+
+def op_memo_store(op: Operation) -> Optional[MemoStore]:
+    """
+    Decide the store to :term:`memoize <memoization>` `op`, from its `memoize` & configs.
+
+    :return:
+        the store given in op's `memoize`, or the one plugged in configurations,
+        or the :func:`default_memo_store()`, or None if not memoized
+        (always for :term:`chunked` ops, whose lazy outputs are read once).
+    """
+    from .config import get_memo_store, is_memoize_operations
+
+    if getattr(op, "chunked", None):
+        return None
+
+    memoize = getattr(op, "memoize", None)
+    # NOTE: empty stores are falsy.
+    is_store = isinstance(memoize, MemoStore)
+    enabled = is_memoize_operations()
+    if enabled is False or (enabled is None and not is_store and not memoize):
+        return None
+    if is_store:
+        return memoize
+    store = get_memo_store()
+    return default_memo_store() if store is None else store
@@ -0,0 +1,271 @@
+# Copyright 2023-2023, Kostis Anagnostopoulos;
+# Licensed under the terms of the Apache License, Version 2.0. See the LICENSE file associated with the project for terms.
+"""
+:term:`memory accounting` of solution values, tracking the peak of live bytes,
+and :term:`spill`\\ing them to disk, to respect some `memory_budget`.
+
+.. seealso:: :func:`.set_account_memory()`, :attr:`.Solution.memory`
+    and the `memory_budget` argument of :meth:`.ExecutionPlan.execute()`.
+"""
+import logging
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import time
+import weakref
+from collections import deque
+from types import FunctionType, ModuleType
+from typing import Any, Callable, Iterable, List, Mapping, Optional, Tuple
+
+log = logging.getLogger(__name__)
+
+_atomic_types = (str, bytes, bytearray, int, float, complex, bool, type(None))
+_opaque_types = (type, ModuleType, FunctionType)
+
+
+def _buffer_nbytes(value) -> Optional[int]:
+    """The bytes of :mod:`pandas` objects (deep) or any object with `nbytes` (numpy), or None."""
+    if type(value).__module__.startswith("pandas"):
+        memory_usage = getattr(value, "memory_usage", None)
+        if memory_usage is not None:
+            nbytes = memory_usage(deep=True)
+            return int(nbytes.sum() if hasattr(nbytes, "sum") else nbytes)
+    nbytes = getattr(value, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes
+    return None
+
+
+def value_nbytes(value: Any) -> int:
+    """
+    The approximate size in bytes of `value`, including any objects it contains.
+
+    - For :mod:`numpy` arrays (and anything with an `nbytes` int attribute),
+      that is returned;
+    - :mod:`pandas` objects are measured with ``memory_usage(deep=True)``;
+    - otherwise, :func:`sys.getsizeof()` is summed recursively for the items
+      of containers and the ``__dict__`` of objects, counting each object once.
+    """
+    nbytes = _buffer_nbytes(value)
+    if nbytes is not None:
+        return nbytes
+
+    seen = set()
+    total = 0
+    stack = [value]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+
+        nbytes = _buffer_nbytes(obj)
+        if nbytes is not None:
+            total += nbytes
+            continue
+        total += sys.getsizeof(obj, 0)
+        if isinstance(obj, _atomic_types) or isinstance(obj, _opaque_types):
+            continue
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+            stack.extend(obj)
+        attrs = getattr(obj, "__dict__", None)
+        if isinstance(attrs, dict):
+            stack.append(attrs)
+
+    return total
+
+
+class MemoryTracker:
+    """
+    Account the bytes of the values alive in a solution, and its peak.
+
+    Values are measured once, when entering the solution (inputs or op outputs),
+    and subtracted when :term:`evict`\\ed.  A key may count more than once,
+    when overwritten in :term:`solution layer`\\s (old values are still alive).
+    """
+
+    def __init__(self, sizer: Callable[[Any], int] = value_nbytes):
+        """
+        :param sizer:
+            a callable measuring the bytes of each value (default :func:`value_nbytes()`)
+        """
+        self.sizer = sizer
+        #: ``{key: [nbytes, ...]}`` for the values alive
+        self.sizes = {}
+        #: the bytes of all values alive
+        self.live_bytes = 0
+        #: the maximum of :attr:`live_bytes` so far
+        self.peak_bytes = 0
+        #: the name of the op whose outputs reached the peak (``<inputs>`` if none)
+        self.peak_op = None
+        #: ``{key: nbytes}`` of the values alive at the peak
+        self.peak_values = {}
+        #: the total bytes of values evicted
+        self.evicted_bytes = 0
+        #: the total bytes of values spilled to disk (each key counted once)
+        self.spilled_bytes = 0
+        self._spilled_keys = set()
+        #: a list of ``(timestamp, live_bytes)`` on each change
+        self.timeline: List[Tuple[float, int]] = []
+
+    def __repr__(self):
+        return (
+            f"{type(self).__name__}(live={self.live_bytes}, peak={self.peak_bytes}"
+            f" @{self.peak_op})"
+        )
+
+    def _changed(self, op_name: Optional[str]):
+        live = self.live_bytes
+        self.timeline.append((time.time(), live))
+        if live > self.peak_bytes:
+            self.peak_bytes = live
+            self.peak_op = op_name
+            self.peak_values = {k: sum(v) for k, v in self.sizes.items()}
+
+    def add(self, items: Iterable[Tuple[Any, Any]], op_name: str, *, replace: bool):
+        """
+        Account values entering the solution.
+
+        :param items:
+            ``(key, value)`` pairs
+        :param op_name:
+            who produced them, to blame for any new peak
+        :param replace:
+            when true, any previous value of a key is dropped (non-layered solutions)
+        """
+        sizes, sizer = self.sizes, self.sizer
+        for key, value in items:
+            nbytes = sizer(value)
+            if replace and key in sizes:
+                self.live_bytes -= sum(sizes[key])
+                sizes[key] = [nbytes]
+            else:
+                sizes.setdefault(key, []).append(nbytes)
+            self.live_bytes += nbytes
+        self._changed(op_name)
+
+    def evict(self, key) -> int:
+        """Subtract all values of `key` (if accounted), and return their bytes."""
+        nbytes = sum(self.sizes.pop(key, ()))
+        if nbytes:
+            self.live_bytes -= nbytes
+            self.evicted_bytes += nbytes
+            self._changed(None)
+        return nbytes
+
+    def spill(self, key) -> int:
+        """Like :meth:`evict()`, but counting into :attr:`spilled_bytes` (unless re-spilled)."""
+        nbytes = sum(self.sizes.pop(key, ()))
+        if nbytes:
+            self.live_bytes -= nbytes
+            if key not in self._spilled_keys:
+                self._spilled_keys.add(key)
+                self.spilled_bytes += nbytes
+            self._changed(None)
+        return nbytes
+
+    def reset(self, items: Iterable[Tuple[Any, Any]]):
+        """Re-measure from scratch the (key, value) pairs alive, keeping the peak."""
+        self.sizes = {}
+        self.live_bytes = 0
+        self.add(items, None, replace=False)
+
+    @property
+    def stats(self) -> Mapping[str, Any]:
+        """A dict with peak & live bytes, the peak op & values, and the bytes evicted."""
+        return {
+            "peak_bytes": self.peak_bytes,
+            "peak_op": self.peak_op,
+            "peak_values": dict(self.peak_values),
+            "live_bytes": self.live_bytes,
+            "evicted_bytes": self.evicted_bytes,
+            "spilled_bytes": self.spilled_bytes,
+        }
+
+
+class Spilled:
+    """The placeholder of a value :term:`spill`\\ed to a file, loaded back on access."""
+
+    __slots__ = ("fpath", "nbytes")
+
+    def __init__(self, fpath: str, nbytes: int):
+        self.fpath = fpath
+        self.nbytes = nbytes
+
+    @property
+    def is_mapped(self) -> bool:
+        """Whether :meth:`load()` memory-maps the file (so its pages are not live memory)."""
+        return self.fpath.endswith(".npy")
+
+    def load(self) -> Any:
+        """Memory-map back a :mod:`numpy` array, or unpickle any other value."""
+        if self.is_mapped:
+            import numpy as np
+
+            return np.load(self.fpath, mmap_mode="r")
+        with open(self.fpath, "rb") as f:
+            return pickle.load(f)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.fpath!r}, {self.nbytes} bytes)"
+
+
+class SpillStore:
+    """
+    A directory to :term:`spill` large solution values into, while executing within a `memory_budget`.
+
+    Plain :mod:`numpy` arrays are saved with :func:`numpy.save()` (to be memory-mapped
+    back), any other value is pickled with the highest protocol (5 in PY3.8+,
+    with out-of-band buffers).
+    """
+
+    def __init__(self, directory: str = None, lookahead: int = 3):
+        """
+        :param directory:
+            where to write spilled values (created if missing); if not given,
+            a temporary one is created, removed when this store is garbage-collected
+        :param lookahead:
+            values needed by that many upcoming operations are not spilled
+        """
+        if directory is None:
+            directory = tempfile.mkdtemp(prefix="graphtik-spill-")
+            weakref.finalize(self, shutil.rmtree, directory, ignore_errors=True)
+        else:
+            os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.lookahead = lookahead
+        self._count = 0
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.directory!r}, x{self._count} spilled)"
+
+    def spill(self, value: Any, nbytes: int) -> Spilled:
+        """Write `value` into a new file of the store, and return its placeholder."""
+        self._count += 1
+        np = sys.modules.get("numpy")
+        is_array = (
+            np is not None and type(value) is np.ndarray and not value.dtype.hasobject
+        )
+        # Unique names, for directories shared by many solutions.
+        fd, fpath = tempfile.mkstemp(
+            ".npy" if is_array else ".pkl", "spill-", dir=self.directory
+        )
+        with open(fd, "wb") as f:
+            if is_array:
+                np.save(f, value, allow_pickle=False)
+            else:
+                pickle.dump(value, f, pickle.HIGHEST_PROTOCOL)
+
+        return Spilled(fpath, nbytes)
+
+    def discard(self, spilled: Spilled):
+        """Delete the file of an :term:`evict`\\ed placeholder."""
+        try:
+            os.remove(spilled.fpath)
+        except OSError as ex:
+            log.warning("Failed deleting spilled file %s due to: %s", spilled.fpath, ex)
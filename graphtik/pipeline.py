@@ -14,7 +14,7 @@ import logging
 import re
 import sys
 from collections import abc as cabc
-from typing import Callable, List, Mapping, Union
+from typing import Callable, Iterable, Iterator, List, Mapping, Tuple, Union
 
 from boltons.setutils import IndexedSet as iset
 
@@ -372,6 +372,13 @@ class Pipeline(Operation):
         callbacks=None,
         solution_class: "Type[Solution]" = None,
         layered_solution=None,
+        checkpoint=None,
+        resume=False,
+        memory_budget: int = None,
+        spill_dir=None,
+        cancel: "CancelToken" = None,
+        deadline: float = None,
+        timeout: float = None,
     ) -> "Solution":
         """
         Compile & :term:`execute` the plan, log :term:`jetsam` & plot :term:`plottable` on errors.
@@ -420,7 +427,27 @@ class Pipeline(Operation):
               layer for each operation, regardless of any *jsonp* dependencies.
             - If ``None``, layers are used only if there are NO :term:`jsonp` dependencies
               in the network.
-
+        :param checkpoint:
+            a :class:`.CheckpointStore` (or a directory for one) to save
+            the outputs of each operation as soon as it executes ok
+            (see :term:`checkpoint`)
+        :param resume:
+            when true, reload the outputs of operations saved in `checkpoint`
+            by a previous (crashed) run with the same inputs, and skip those operations
+        :param memory_budget:
+            if given, the bytes of live solution values above which to :term:`spill`
+            the largest ones, not needed by the next few operations, into `spill_dir`
+            (see :meth:`.ExecutionPlan.execute()`)
+        :param spill_dir:
+            a :class:`.SpillStore` (or a directory for one) to spill values into;
+            if None, a temporary directory is used
+        :param cancel:
+            a :class:`.CancelToken` to abort just this computation, unlike
+            the global :func:`.abort_run()` (see :term:`cancellation`)
+        :param deadline:
+            a :func:`time.time()` timestamp to abort the computation, if not completed by then
+        :param timeout:
+            seconds from now, like `deadline`
 
         :return:
             The :term:`solution` which contains the results of each operation executed
@@ -443,6 +470,11 @@ class Pipeline(Operation):
 
                 *Unreachable outputs...*
 
+        :raises AbortedException:
+            on :term:`abort run` or :term:`cancellation` (e.g. `deadline` expired),
+            with the partial solution, flagged in :attr:`.Solution.aborted`,
+            and the ops completed in :attr:`.Solution.executed`
+
         See also :meth:`.Operation.compute()`.
         """
         from .config import reset_abort
@@ -477,37 +509,430 @@ class Pipeline(Operation):
                 callbacks=callbacks,
                 solution_class=solution_class,
                 layered_solution=layered_solution,
+                checkpoint=checkpoint,
+                resume=resume,
+                memory_budget=memory_budget,
+                spill_dir=spill_dir,
+                cancel=cancel,
+                deadline=deadline,
+                timeout=timeout,
             )
 
             ok = True
             return solution
         finally:
             if not ok:
-                from .jetsam import save_jetsam
-
-                ex = sys.exc_info()[1]
-                jetsam = save_jetsam(
-                    ex,
-                    locals(),
-                    "plan",
-                    "solution",
-                    "outputs",
-                    pipeline="self",
-                    network="net",
+                self._log_n_plot_jetsam(sys.exc_info()[1], locals())
+
+    async def compute_async(
+        self,
+        named_inputs: Mapping = None,
+        # /,  PY3.8+ positional-only
+        outputs: Items = UNSET,
+        recompute_from: Items = None,
+        *,
+        predicate: "NodePredicate" = UNSET,
+        callbacks=None,
+        solution_class: "Type[Solution]" = None,
+        layered_solution=None,
+        executor: "Executor" = None,
+        checkpoint=None,
+        resume=False,
+        memory_budget: int = None,
+        spill_dir=None,
+        cancel: "CancelToken" = None,
+        deadline: float = None,
+        timeout: float = None,
+    ) -> "Solution":
+        """
+        Like :meth:`compute()` but awaiting concurrently any :term:`coroutine operation`\\s.
+
+        :param executor:
+            a :class:`concurrent.futures.Executor` to run the non-coroutine operations;
+            if None, the default executor of the running event-loop is used.
+
+        For the rest arguments & exceptions, see :meth:`compute()`
+        and :meth:`.ExecutionPlan.execute_async()`.
+        """
+        from .config import reset_abort
+
+        ok = False
+        try:
+            if named_inputs is None:
+                named_inputs = {}
+
+            net = self.net  # jetsam
+            if outputs == UNSET:
+                outputs = self.outputs
+            if predicate == UNSET:
+                predicate = self.predicate
+
+            log.info("=== Compiling pipeline(%s) ...", self.name)
+            plan = net.compile(
+                named_inputs.keys(),
+                outputs,
+                recompute_from,
+                predicate=predicate,
+            )
+
+            # Restore `abort` flag for next run.
+            reset_abort()
+
+            solution = await plan.execute_async(
+                named_inputs,
+                outputs,
+                name=self.name,
+                callbacks=callbacks,
+                solution_class=solution_class,
+                layered_solution=layered_solution,
+                executor=executor,
+                checkpoint=checkpoint,
+                resume=resume,
+                memory_budget=memory_budget,
+                spill_dir=spill_dir,
+                cancel=cancel,
+                deadline=deadline,
+                timeout=timeout,
+            )
+
+            ok = True
+            return solution
+        finally:
+            if not ok:
+                self._log_n_plot_jetsam(sys.exc_info()[1], locals())
+
+    def _records_planner(self, outputs, predicate) -> Tuple[Callable, Callable]:
+        """
+        Prepare the functions to compile plans for many records, and pick their outputs.
+
+        :return:
+            a 2-tuple ``(plan_for(named_inputs), pick_outputs(solution))``,
+            where the 1st one compiles & validates a plan just once for records
+            with the same input-keys, and the 2nd gives a dict with the asked
+            `outputs` (or all values, if no `outputs` asked)
+        """
+        net = self.net  # jetsam
+        asked_outs = outputs and set(
+            aslist(outputs, "outputs", allowed_types=cabc.Collection)
+        )
+        plans = {}  # input-keys --> plan
+
+        def plan_for(named_inputs):
+            ok = False
+            try:
+                keys = frozenset(named_inputs)
+                plan = plans.get(keys)
+                if plan is None:
+                    log.info("=== Compiling pipeline(%s) for %s...", self.name, keys)
+                    plan = net.compile(named_inputs.keys(), outputs, predicate=predicate)
+                    plan.validate(named_inputs, outputs)
+                    plans[keys] = plan
+
+                ok = True
+                return plan
+            finally:
+                if not ok:
+                    self._log_n_plot_jetsam(sys.exc_info()[1], locals())
+
+        def pick_outputs(solution) -> dict:
+            if asked_outs:
+                return {k: v for k, v in solution.items() if k in asked_outs}
+            return dict(solution)
+
+        return plan_for, pick_outputs
+
+    def compute_many(
+        self,
+        inputs: Iterable[Mapping],
+        outputs: Items = UNSET,
+        *,
+        predicate: "NodePredicate" = UNSET,
+        callbacks=None,
+        solution_class: "Type[Solution]" = None,
+        layered_solution=None,
+        executor: "Executor" = None,
+        max_in_flight: int = None,
+        outputs_only=False,
+    ) -> Iterator[Union["Solution", dict]]:
+        """
+        Compute many `inputs` records, reusing a single plan for records with the same keys.
+
+        Records are grouped by their (unordered) input-keys, and each group is
+        :term:`compiled <compile>` & validated just once, amortizing the per-call setup
+        of :meth:`compute()`.
+
+        :param inputs:
+            an iterable of mappings, each one like the `named_inputs` of :meth:`compute()`
+        :param executor:
+            if given, a :class:`concurrent.futures.Executor` (typically a
+            :class:`~concurrent.futures.ThreadPoolExecutor`) to spread records across
+            (:term:`configurations` are copied into each task).
+        :param max_in_flight:
+            how many records may be submitted to the `executor` (or waiting to be yielded)
+            at any moment, pulling the next one from `inputs` only as results are yielded;
+            by default, twice the `max_workers` of the executor (if known) or 8
+        :param outputs_only:
+            when true, yield plain dicts with just the asked `outputs`
+            (or all solution values, if no `outputs` asked), instead of solutions.
+        :return:
+            a generator of :class:`.Solution` (or dicts), in the order of `inputs`;
+            nothing is computed until iterated.
+
+        For the rest arguments & exceptions, see :meth:`compute()`.
+        """
+        from .config import reset_abort
+
+        if outputs == UNSET:
+            outputs = self.outputs
+        if predicate == UNSET:
+            predicate = self.predicate
+        plan_for, pick_outputs = self._records_planner(outputs, predicate)
+
+        def execute(plan, named_inputs):
+            ok = False
+            try:
+                solution = plan.execute(
+                    named_inputs,
+                    outputs,
+                    name=self.name,
+                    callbacks=callbacks,
+                    solution_class=solution_class,
+                    layered_solution=layered_solution,
+                    validate=False,
                 )
+                if outputs_only:
+                    solution = pick_outputs(solution)
+
+                ok = True
+                return solution
+            finally:
+                if not ok:
+                    self._log_n_plot_jetsam(sys.exc_info()[1], locals())
+
+        # Restore `abort` flag for next run.
+        reset_abort()
 
-                try:
-                    jetsam.log_n_plot()
-                except Exception as ex2:
-                    log.warning(
-                        "Suppressed error while logging/plotting jetsam of %s: %s(%s)"
-                        "\n  +--annotations:%s",
-                        self,
-                        type(ex2).__name__,
-                        ex2,
-                        jetsam,
-                        exc_info=True,
+        if executor is None:
+            for named_inputs in inputs:
+                yield execute(plan_for(named_inputs), named_inputs)
+        else:
+            from collections import deque
+            from contextvars import copy_context
+
+            if max_in_flight is None:
+                max_in_flight = 2 * (getattr(executor, "_max_workers", None) or 4)
+            if max_in_flight < 1:
+                raise ValueError(f"`max_in_flight` must be positive: {max_in_flight}")
+
+            futures = deque()
+            try:
+                for named_inputs in inputs:
+                    plan = plan_for(named_inputs)
+                    futures.append(
+                        executor.submit(
+                            copy_context().run, execute, plan, named_inputs
+                        )
                     )
+                    if len(futures) >= max_in_flight:
+                        yield futures.popleft().result()
+                while futures:
+                    yield futures.popleft().result()
+            finally:
+                for fut in futures:
+                    fut.cancel()
+
+    def stream(
+        self,
+        records: Iterable[Mapping],
+        outputs: Items = UNSET,
+        *,
+        max_in_flight: int = 4,
+        ordered=True,
+        predicate: "NodePredicate" = UNSET,
+        callbacks=None,
+        solution_class: "Type[Solution]" = None,
+        layered_solution=None,
+        executor: "Executor" = None,
+        outputs_only=False,
+    ) -> Iterator[Union["Solution", dict]]:
+        """
+        Compute input `records` pipelined, overlapping the ops of up to `max_in_flight` of them.
+
+        Each record executes like :meth:`compute_async()`, every op starting
+        as soon as its upstream ops (for the same record) have completed,
+        so that the ops of different records in flight run concurrently in the `executor`
+        (e.g. the 1st op of record `i+1` overlaps with the 2nd op of record `i`).
+        Plans are compiled once for records with the same keys, like :meth:`compute_many()`.
+
+        :param records:
+            an iterable of mappings, each one like the `named_inputs` of :meth:`compute()`;
+            it is consumed lazily (may be endless), a record pulled only when
+            another one in flight has been yielded (backpressure)
+        :param max_in_flight:
+            how many records may be computing (or waiting to be yielded, if `ordered`)
+            at any moment
+        :param ordered:
+            when true (default), yield in the order of `records`, otherwise,
+            as soon as each one completes
+        :param executor:
+            a :class:`concurrent.futures.Executor` to run the non-coroutine operations;
+            if None, the default executor of the (private) event-loop is used
+        :param outputs_only:
+            when true, yield plain dicts with just the asked `outputs`
+            (or all solution values, if no `outputs` asked), instead of solutions.
+        :return:
+            a generator of :class:`.Solution` (or dicts);
+            records progress only while it is being iterated, and any ones
+            still in flight are canceled when it closes (or fails)
+        :raises RuntimeError:
+            if iterated inside a running :mod:`asyncio` event-loop (use
+            :meth:`compute_async()` there)
+
+        For the rest arguments & exceptions, see :meth:`compute()`.
+        """
+        import asyncio
+
+        from .config import reset_abort
+
+        if max_in_flight < 1:
+            raise ValueError(f"Expected a positive `max_in_flight`, got: {max_in_flight}")
+        if outputs == UNSET:
+            outputs = self.outputs
+        if predicate == UNSET:
+            predicate = self.predicate
+        plan_for, pick_outputs = self._records_planner(outputs, predicate)
+
+        async def execute(plan, named_inputs):
+            ok = False
+            try:
+                solution = await plan.execute_async(
+                    named_inputs,
+                    outputs,
+                    name=self.name,
+                    callbacks=callbacks,
+                    solution_class=solution_class,
+                    layered_solution=layered_solution,
+                    executor=executor,
+                    validate=False,
+                )
+                if outputs_only:
+                    solution = pick_outputs(solution)
+
+                ok = True
+                return solution
+            finally:
+                if not ok:
+                    self._log_n_plot_jetsam(sys.exc_info()[1], locals())
+
+        # Restore `abort` flag for next run.
+        reset_abort()
+
+        records = iter(records)
+        loop = asyncio.new_event_loop()
+        pending = {}  # task --> record index
+        completed = {}  # record index --> task done, not yet yielded
+        n_records = n_yielded = 0
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and len(pending) + len(completed) < max_in_flight:
+                    named_inputs = next(records, UNSET)
+                    if named_inputs is UNSET:
+                        exhausted = True
+                        break
+                    task = loop.create_task(execute(plan_for(named_inputs), named_inputs))
+                    pending[task] = n_records
+                    n_records += 1
+
+                if pending:
+                    done, _ = loop.run_until_complete(
+                        asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    )
+                    for task in done:
+                        completed[pending.pop(task)] = task
+                elif not completed:
+                    break
+
+                if ordered:
+                    while n_yielded in completed:
+                        task = completed.pop(n_yielded)
+                        n_yielded += 1
+                        yield task.result()
+                else:
+                    for i in sorted(completed):
+                        yield completed.pop(i).result()
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                loop.run_until_complete(asyncio.wait(pending))
+            shutdown = getattr(loop, "shutdown_default_executor", None)  # PY3.9+
+            if shutdown:
+                loop.run_until_complete(shutdown())
+            loop.close()
+
+    def profile(
+        self,
+        named_inputs: Mapping = None,
+        outputs: Items = UNSET,
+        *,
+        runs: int = 1,
+        profiler: "Profiler" = None,
+        **compute_kw,
+    ) -> "ProfileReport":
+        """
+        :meth:`compute()` `runs` times while :term:`profiling`, and report the ops measured.
+
+        :param runs:
+            how many times to compute the same `named_inputs`
+        :param profiler:
+            a :class:`.Profiler` to aggregate measurements into
+            (e.g. to include previous runs), or a new one if not given
+        :param compute_kw:
+            the rest keyword-arguments of :meth:`compute()`
+        :return:
+            a :class:`.ProfileReport` ranking the ops by self time,
+            and by contribution to the :term:`critical path` of the last plan executed
+
+        For the rest arguments & exceptions, see :meth:`compute()`.
+        """
+        from .config import profiler_plugged
+        from .profiling import Profiler
+
+        if profiler is None:
+            profiler = Profiler()
+        solution = None
+        with profiler_plugged(profiler):
+            for _ in range(runs):
+                solution = self.compute(named_inputs, outputs, **compute_kw)
+
+        return profiler.report(solution and solution.plan)
+
+    def _log_n_plot_jetsam(self, ex, locs):
+        from .jetsam import save_jetsam
+
+        jetsam = save_jetsam(
+            ex,
+            locs,
+            "plan",
+            "solution",
+            "outputs",
+            pipeline="self",
+            network="net",
+        )
+
+        try:
+            jetsam.log_n_plot()
+        except Exception as ex2:
+            log.warning(
+                "Suppressed error while logging/plotting jetsam of %s: %s(%s)"
+                "\n  +--annotations:%s",
+                self,
+                type(ex2).__name__,
+                ex2,
+                jetsam,
+                exc_info=True,
+            )
 
     def __call__(self, **input_kwargs) -> "Solution":
         """
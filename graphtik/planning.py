@@ -3,9 +3,15 @@
 """
 :term:`compose` :term:`network` of operations & dependencies, :term:`compile` the :term:`plan`.
 """
+import hashlib
 import logging
+import os
+import pickle
 import sys
-from collections import abc, defaultdict
+import threading
+import time
+import weakref
+from collections import OrderedDict, abc, defaultdict
 from functools import partial
 from itertools import count
 from typing import (
@@ -26,8 +32,14 @@ import networkx as nx
 from boltons.iterutils import pairwise
 from boltons.setutils import IndexedSet as iset
 
-from .base import Items, Operation, PlotArgs, Plottable, astuple
-from .config import is_debug, is_skip_evictions
+from .base import UNSET, Items, Operation, PlotArgs, Plottable, astuple
+from .config import (
+    get_plan_cache_size,
+    is_compact_planning,
+    is_debug,
+    is_share_plan_caches,
+    is_skip_evictions,
+)
 from .modifier import (
     dep_renamed,
     dep_stripped,
@@ -266,7 +278,7 @@ def inputs_for_recompute(
     Clears the inputs between `recompute_from >--<= recompute_till` to clear.
 
     :param graph:
-        MODIFIED, at most 2 helper nodes inserted
+        traversed, not modified
     :param inputs:
         a sequence
     :param recompute_from:
@@ -278,14 +290,24 @@ def inputs_for_recompute(
         a 2-tuple with the reduced `inputs` by the dependencies that must
         be removed from the graph to recompute (along with those dependencies).
 
-    It works by temporarily adding x2 nodes to find and remove the intersection of::
+    It works by traversing the `graph` to find and remove the intersection of::
 
         strict-descendants(recompute_from) & ancestors(recompute_till)
 
     FIXME: merge recompute() with travesing unsatisfied (see ``test_recompute_NEEDS_FIX``)
     bc it clears inputs of unsatisfied ops (cannot be replaced later)
     """
-    START, STOP = "_TMP.RECOMPUTE_FROM", "_TMP.RECOMPUTE_TILL"
+
+    def reachable(neighbors, sources) -> set:
+        """All nodes reachable from any `sources` (themselves only if in a cycle)."""
+        seen = set()
+        stack = list(sources)
+        while stack:
+            for n in neighbors(stack.pop()):
+                if n not in seen:
+                    seen.add(n)
+                    stack.append(n)
+        return seen
 
     deps = set(yield_datanodes(graph.nodes))
     recompute_from = iset(recompute_from)  # traversed in logs
@@ -296,17 +318,16 @@ def inputs_for_recompute(
         recompute_from = recompute_from & deps  # avoid sideffect in `recompute_from`
     assert recompute_from, f"Given unknown-only `recompute_from` {locals()}"
 
-    graph.add_edges_from((START, i) for i in recompute_from)
-
-    # strictly-downstreams from START
-    between_deps = iset(nx.descendants(graph, START)) & deps - recompute_from
+    # strictly-downstreams from `recompute_from`
+    between_deps = (
+        iset(reachable(graph.successors, recompute_from)) & deps - recompute_from
+    )
 
     if recompute_till:
-        graph.add_edges_from((i, STOP) for i in recompute_till)  # edge reversed!
-
-        # upstreams from STOP
-        upstreams = set(nx.ancestors(graph, STOP)) & deps
-        between_deps &= upstreams
+        # upstreams of (& including) `recompute_till`
+        upstreams = reachable(graph.predecessors, recompute_till)
+        upstreams.update(recompute_till)
+        between_deps &= upstreams & deps
 
     recomputes = between_deps & inputs
     new_inputs = iset(inputs) - recomputes
@@ -393,6 +414,123 @@ def unsatisfied_operations(dag, inputs: Iterable) -> Tuple[OpMap, iset]:
     return pruned_ops, sorted_nodes
 
 
+class PlanCache:
+    """
+    A thread-safe :term:`plan cache`, dropping the least-recently-used plans.
+
+    Counts hits, misses, evictions and the time spent compiling plans on misses.
+    """
+
+    def __init__(self, maxsize: Optional[int] = UNSET):
+        """
+        :param maxsize:
+            the maximum number of plans to keep (unbounded if None);
+            if not given, :func:`.get_plan_cache_size()` decides
+        """
+        #: the maximum number of plans kept (unbounded if None)
+        self.maxsize = get_plan_cache_size() if maxsize is UNSET else maxsize
+        #: number of compilations served from the cache
+        self.hits = 0
+        #: number of compilations missing the cache
+        self.misses = 0
+        #: number of plans dropped, to respect :attr:`maxsize`
+        self.evictions = 0
+        #: cumulative seconds spent compiling plans (on misses)
+        self.compile_sec = 0.0
+        self._plans = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __getstate__(self):
+        state = dict(vars(self))
+        state["_plans"] = OrderedDict()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        vars(self).update(state)
+        self._lock = threading.RLock()
+
+    def get(self, key) -> Optional["ExecutionPlan"]:
+        """Return the plan cached for `key` (marking it recently-used), or None."""
+        with self._lock:
+            plan = self._plans.get(key)
+            if plan is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._plans.move_to_end(key)
+            return plan
+
+    def put(self, key, plan: "ExecutionPlan", compile_sec: float = 0) -> None:
+        """Cache the `plan` compiled (in `compile_sec`) under `key`, dropping old ones."""
+        with self._lock:
+            plans = self._plans
+            plans[key] = plan
+            plans.move_to_end(key)
+            self.compile_sec += compile_sec
+            if self.maxsize is not None:
+                while len(plans) > self.maxsize:
+                    plans.popitem(last=False)
+                    self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all plans and zero counters."""
+        with self._lock:
+            self._plans.clear()
+            self.hits = self.misses = self.evictions = 0
+            self.compile_sec = 0.0
+
+    @property
+    def stats(self) -> dict:
+        """A dict with the counters, the number of cached plans and the :attr:`maxsize`."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "compile_sec": self.compile_sec,
+                "size": len(self._plans),
+                "maxsize": self.maxsize,
+            }
+
+    def items(self) -> List[Tuple[Any, "ExecutionPlan"]]:
+        """A snapshot of the ``(key, plan)`` pairs cached, least-recently-used first."""
+        with self._lock:
+            return list(self._plans.items())
+
+    def __contains__(self, key):
+        return key in self._plans
+
+    def __len__(self):
+        return len(self._plans)
+
+    def __repr__(self):
+        stats = ", ".join(f"{k}={v}" for k, v in self.stats.items())
+        return f"{type(self).__name__}({stats})"
+
+
+#: {op-ids: cache} shared by networks of the same operation instances
+#: (see :func:`shared_plan_cache()`).
+_shared_plan_caches: Mapping[Tuple[int, ...], PlanCache] = weakref.WeakValueDictionary()
+_shared_lock = threading.Lock()
+
+
+def shared_plan_cache(operations: Sequence[Operation]) -> PlanCache:
+    """
+    Get the :term:`plan cache` for networks of the identical `operations` (and order).
+
+    The cache lives as long as some network using it, and pins the `operations`,
+    so their ids cannot be reused by other objects.
+    """
+    key = tuple(id(op) for op in operations)
+    with _shared_lock:
+        cache = _shared_plan_caches.get(key)
+        if cache is None:
+            cache = _shared_plan_caches[key] = PlanCache()
+            cache._pinned_ops = tuple(operations)
+        return cache
+
+
 class Network(Plottable):
     """
     A graph of operations that can :term:`compile` an execution plan.
@@ -407,13 +545,18 @@ class Network(Plottable):
         decided on construction.
     """
 
-    def __init__(self, *operations, graph=None):
+    def __init__(self, *operations, graph=None, plan_cache: PlanCache = None):
         """
 
         :param operations:
             to be added in the graph
         :param graph:
             if None, create a new.
+        :param plan_cache:
+            the :term:`plan cache` to keep compiled plans into,
+            e.g. a :func:`shared_plan_cache()` of the same `operations`;
+            if None, a private one, unless :func:`.set_share_plan_caches()` is true
+            (and `graph` not given)
 
         :raises ValueError:
             if dupe operation, with msg:
@@ -432,6 +575,16 @@ class Network(Plottable):
                 f"\n  out of: {list(operations)}"
             )
 
+        if plan_cache is None:
+            plan_cache = (
+                shared_plan_cache(operations)
+                if graph is None and is_share_plan_caches()
+                else PlanCache()
+            )
+        #: The :term:`plan cache` of :meth:`compile()`, to speed it up and avoid
+        #: a multithreading issue(?) that is occurring when accessing the dag in networkx.
+        self.plan_cache = plan_cache
+
         if graph is None:
             # directed graph of operation and data nodes defining the net.
             graph = nx.DiGraph()
@@ -447,10 +600,6 @@ class Network(Plottable):
             self._append_operation(graph, op)
         self.needs, self.provides = collect_requirements(self.graph)
 
-        #: Speed up :meth:`compile()` call and avoid a multithreading issue(?)
-        #: that is occurring when accessing the dag in networkx.
-        self._cached_plans = {}
-
     def __repr__(self):
         nodes = self.graph.nodes
         ops = list(yield_ops(nodes))
@@ -584,7 +733,7 @@ class Network(Plottable):
             graph.add_node(n, **nkw)
             graph.add_edge(operation, n, **ekw)
 
-    def _apply_graph_predicate(self, graph, predicate):
+    def _predicate_filtered_ops(self, graph, predicate) -> List[Operation]:
         to_del = []
         for node, data in graph.nodes.items():
             try:
@@ -595,7 +744,20 @@ class Network(Plottable):
                     f"Node-predicate({predicate}) failed due to: {ex}\n  node: {node}, {self}"
                 ) from ex
         log.info("... predicate filtered out %s.", list(yield_node_names(to_del)))
-        graph.remove_nodes_from(to_del)
+        return to_del
+
+    def _apply_graph_predicate(self, graph, predicate):
+        graph.remove_nodes_from(self._predicate_filtered_ops(graph, predicate))
+
+    @property
+    def _compact_graph(self) -> "CsrGraph":
+        """The (lazily built) integer-indexed :attr:`graph` for :term:`compact planning`."""
+        csr = getattr(self, "_csr", None)
+        if csr is None:
+            from .csr import CsrGraph
+
+            csr = self._csr = CsrGraph(self.graph)
+        return csr
 
     def _prune_graph(
         self, inputs: Items, outputs: Items, predicate: NodePredicate = None
@@ -670,6 +832,45 @@ class Network(Plottable):
         assert inputs is None or isinstance(inputs, abc.Collection)
         assert outputs is None or isinstance(outputs, abc.Collection)
 
+        pruned = None
+        if is_compact_planning():
+            csr = self._compact_graph
+            filtered = self._predicate_filtered_ops(dag, predicate) if predicate else ()
+            pruned = csr.prune(inputs, outputs, satisfied_inputs, filtered)
+            if pruned is None:
+                log.info("... cycles in %s, re-planning with networkx.", csr)
+        if pruned is None:
+            pruned = self._prune_broken_dag(inputs, outputs, satisfied_inputs, predicate)
+        pruned_dag, sorted_nodes, comments = pruned
+
+        inputs = iset(
+            _optionalized(pruned_dag, n) for n in satisfied_inputs if n in pruned_dag
+        )
+        if outputs is None:
+            outputs = iset(
+                n
+                for n in self.provides
+                if n not in inputs and n in pruned_dag and not is_sfx(n)
+            )
+        else:
+            # filter-out from new `provides` if pruned.
+            outputs = iset(n for n in outputs if n in pruned_dag)
+
+        assert inputs is not None or isinstance(inputs, abc.Collection)
+        assert outputs is not None or isinstance(outputs, abc.Collection)
+
+        return pruned_dag, sorted_nodes, tuple(inputs), tuple(outputs), comments
+
+    def _prune_broken_dag(
+        self, inputs, outputs, satisfied_inputs, predicate
+    ) -> Tuple[nx.DiGraph, iset, OpMap]:
+        """
+        The :mod:`networkx` middle part of :meth:`_prune_graph()`, on a "broken" graph copy.
+
+        :return:
+            a 3-tuple (pruned-dag, topo-sorted-nodes, {op: prune-comments})
+        """
+        dag = self.graph
         broken_dag = dag.copy()  # preserve net's graph
 
         if predicate:
@@ -733,23 +934,7 @@ class Network(Plottable):
             unlinked_data -= set(satisfied_inputs & outputs)
         pruned_dag.remove_nodes_from(unlinked_data)
 
-        inputs = iset(
-            _optionalized(pruned_dag, n) for n in satisfied_inputs if n in pruned_dag
-        )
-        if outputs is None:
-            outputs = iset(
-                n
-                for n in self.provides
-                if n not in inputs and n in pruned_dag and not is_sfx(n)
-            )
-        else:
-            # filter-out from new `provides` if pruned.
-            outputs = iset(n for n in outputs if n in pruned_dag)
-
-        assert inputs is not None or isinstance(inputs, abc.Collection)
-        assert outputs is not None or isinstance(outputs, abc.Collection)
-
-        return pruned_dag, sorted_nodes, tuple(inputs), tuple(outputs), comments
+        return pruned_dag, sorted_nodes, comments
 
     def _build_execution_steps(
         self, pruned_dag, sorted_nodes, inputs: Collection, outputs: Collection
@@ -794,6 +979,11 @@ class Network(Plottable):
           to their stripped :term:`sideffected` ones, so these are also inserted
           in the graph (after sorting, to evade cycles).
 
+        - Rule-1 is decided in a single pass, from the position of the last
+          operation using each need (or any doc in its chain), in `sorted_nodes`,
+          and whether its chain contains some output, both collected once per node
+          while digging its subdocs & superdocs.
+
         """
         ## Sort by execution order, then by operation-insertion, to break ties,
         #  and inform user in case of cycles (must have been caught earlier) .
@@ -810,6 +1000,44 @@ class Network(Plottable):
         outputs = set(oo for o in outputs for oo in (o, dep_stripped(o)))
         outputs = set(yield_chaindocs(pruned_dag, outputs))
 
+        ## Collect (lazily) per chain of docs, the last position used
+        #  by operations, and whether they contain any asked outputs.
+        #
+        node_pos = {n: i for i, n in enumerate(sorted_nodes)}
+        succ, pred = pruned_dag.succ, pruned_dag.pred
+
+        def own_usage(node) -> Tuple[int, bool]:
+            last_use = max(
+                (
+                    node_pos.get(dst, -1)
+                    for dst, subdoc in succ[node].items()
+                    if not subdoc.get("subdoc")
+                ),
+                default=-1,
+            )
+            return last_use, node in outputs
+
+        def chained_usage(node, adjacency, memo) -> Tuple[int, bool]:
+            """Merge the usages of `node` & all docs linked with subdoc `adjacency`."""
+            usage = memo.get(node)
+            if usage is None:
+                last_use, is_out = own_usage(node)
+                for doc, edge in adjacency[node].items():
+                    if edge.get("subdoc"):
+                        doc_last, doc_out = chained_usage(doc, adjacency, memo)
+                        last_use = max(last_use, doc_last)
+                        is_out = is_out or doc_out
+                usage = memo[node] = last_use, is_out
+            return usage
+
+        sub_memo, super_memo = {}, {}
+
+        def chain_usage(need) -> Tuple[int, bool]:
+            """Like scanning :func:`yield_also_chaindocs()` of `need`."""
+            sub_last, sub_out = chained_usage(need, succ, sub_memo)
+            super_last, super_out = chained_usage(need, pred, super_memo)
+            return max(sub_last, super_last), sub_out or super_out
+
         ## Add Operation and Eviction steps.
         #
         def add_eviction(dep):
@@ -836,35 +1064,21 @@ class Network(Plottable):
 
             steps.append(op)
 
-            future_nodes = sorted_nodes[i + 1 :]
-
             ## EVICT(1) operation's needs not to be used in the future.
             #
             #  Broken links are irrelevant bc they are predecessors of data (provides),
             #  but here we scan for predecessors of the operation (needs).
             #
             for need in pruned_dag.predecessors(op):
-                need_chain = set(yield_also_chaindocs(pruned_dag, need))
+                last_use, is_out = chain_usage(need)
 
                 ## Don't evict if any `need` in doc-chain has been asked
-                #  as output.
-                #
-                if need_chain & outputs:
-                    continue
-
-                ## Don't evict if any `need` in doc-chain will be used
-                #  in the future.
+                #  as output, or will be used in the future.
                 #
-                need_users = set(
-                    dst
-                    for n in need_chain
-                    for _, dst, subdoc in pruned_dag.out_edges(n, data="subdoc")
-                    if not subdoc
-                )
-                if not need_users & future_nodes:
+                if not is_out and last_use <= i:
                     log.debug(
-                        "... adding evict-1 for not-to-be-used NEED-chain%s of topo-sorted #%i %s .",
-                        need_chain,
+                        "... adding evict-1 for not-to-be-used NEED(%r) of topo-sorted #%i %s .",
+                        need,
                         i,
                         op,
                     )
@@ -962,13 +1176,16 @@ class Network(Plottable):
             ## Build (or retrieve from cache) execution plan
             #  for the given dep-lists (excluding any unknown node-names).
             #
-            if cache_key in self._cached_plans:
+            plan = self.plan_cache.get(cache_key)
+            if plan is not None:
                 log.debug("... compile cache-hit key: %s", cache_key)
-                plan = self._cached_plans[cache_key]
+                if plan.net is not self:  # compiled by a network sharing the cache
+                    plan = plan._replace(net=self)
             else:
+                t0 = time.perf_counter()
                 if recompute_from:
                     inputs, recomputes = inputs_for_recompute(
-                        self.graph.copy(), inputs, recompute_from, k2
+                        self.graph, inputs, recompute_from, k2
                     )
 
                 _prune_results = self._prune_graph(inputs, outputs, predicate)
@@ -987,7 +1204,7 @@ class Network(Plottable):
                     comments=op_comments,
                 )
 
-                self._cached_plans[cache_key] = plan
+                self.plan_cache.put(cache_key, plan, time.perf_counter() - t0)
                 log.debug("... compile cache-updated key: %s", cache_key)
 
             ok = True
@@ -1007,3 +1224,104 @@ class Network(Plottable):
                     "op_comments",
                     "plan",
                 )
+
+    @property
+    def fingerprint(self) -> str:
+        """
+        A structural hash of the :attr:`graph` (nodes, edges & their attributes).
+
+        Operations are identified by their names, so networks with the same
+        structure have equal fingerprints, regardless of their functions.
+        """
+        fingerprint = getattr(self, "_fingerprint", None)
+        if fingerprint is None:
+
+            def node_id(n):
+                return ("op", n.name) if isinstance(n, Operation) else repr(n)
+
+            def attrs(d):
+                return sorted((k, repr(v)) for k, v in d.items())
+
+            graph = self.graph
+            structure = (
+                [(node_id(n), attrs(d)) for n, d in graph.nodes.items()],
+                [(node_id(u), node_id(v), attrs(d)) for (u, v), d in graph.edges.items()],
+            )
+            fingerprint = hashlib.sha1(repr(structure).encode()).hexdigest()
+            self._fingerprint = fingerprint
+
+        return fingerprint
+
+    def export_plans(self, fpath: Union[str, "os.PathLike"]) -> int:
+        """
+        Pickle all (predicate-less) plans in :attr:`plan_cache` into `fpath`, for :meth:`load_plans()`.
+
+        Operations are stored by name, so their functions need not be picklable.
+        The file is written atomically.
+
+        :return:
+            the number of plans exported
+        """
+        plans = [
+            (key, tuple(plan[1:]))
+            for key, plan in self.plan_cache.items()
+            # Predicates (and their closures) cannot be stored reliably.
+            if key[3] is None
+        ]
+
+        net = self
+
+        class Pickler(pickle.Pickler):
+            def persistent_id(self, obj):
+                if obj is net:
+                    return ("net",)
+                if isinstance(obj, Operation):
+                    return ("op", obj.name)
+
+        tmp_fpath = f"{fpath}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_fpath, "wb") as f:
+            pickle.dump(self.fingerprint, f, pickle.HIGHEST_PROTOCOL)
+            Pickler(f, pickle.HIGHEST_PROTOCOL).dump(plans)
+        os.replace(tmp_fpath, fpath)
+        log.info("Exported x%i plans of %s into: %s", len(plans), self, fpath)
+
+        return len(plans)
+
+    def load_plans(self, fpath: Union[str, "os.PathLike"]) -> int:
+        """
+        Load plans stored by :meth:`export_plans()` into :attr:`plan_cache`, if still valid.
+
+        Plans are loaded only if the :attr:`fingerprint` of the network exporting them
+        matches this one, otherwise they are ignored (and logged),
+        to be compiled afresh, when asked.
+
+        :return:
+            the number of plans loaded
+        """
+        from .execution import ExecutionPlan
+
+        ops = {op.name: op for op in yield_ops(self.graph)}
+        net = self
+
+        class Unpickler(pickle.Unpickler):
+            def persistent_load(self, pid):
+                return net if pid[0] == "net" else ops[pid[1]]
+
+        with open(fpath, "rb") as f:
+            fingerprint = pickle.load(f)
+            if fingerprint != self.fingerprint:
+                log.warning(
+                    "Ignoring plans in '%s' exported from a different network"
+                    " (fingerprint %s != %s)",
+                    fpath,
+                    fingerprint,
+                    self.fingerprint,
+                )
+                return 0
+            plans = Unpickler(f).load()
+
+        for key, fields in plans:
+            self.plan_cache.put(key, ExecutionPlan(self, *fields))
+        log.info("Loaded x%i plans of %s from: %s", len(plans), self, fpath)
+
+        return len(plans)
@@ -0,0 +1,250 @@
+# Copyright 2023-2023, Kostis Anagnostopoulos;
+# Licensed under the terms of the Apache License, Version 2.0. See the LICENSE file associated with the project for terms.
+"""
+:term:`profiling` of operations across runs, and reports ranking them.
+
+.. seealso:: :func:`.profiler_plugged()` and :meth:`.Pipeline.profile()`.
+"""
+import json
+import logging
+import math
+import sys
+import threading
+from collections import deque
+from typing import Any, Collection, List, Mapping, NamedTuple, Optional
+
+from .base import Operation
+
+log = logging.getLogger(__name__)
+
+#: The per-op measurements collected on each run (see :attr:`.Solution.profiles`).
+PROFILE_FIELDS = ("elapsed_ms", "compute_ms", "marshal_ms", "queue_ms", "output_size")
+
+
+class ProfiledResult(NamedTuple):
+    """The outputs of a task, along with the measurements taken in its worker."""
+
+    outputs: Any
+    profile: dict
+
+
+def outputs_size(outputs: Any) -> int:
+    """
+    The (shallow) size in bytes of the `outputs` of an operation.
+
+    :param outputs:
+        the bytes length is returned for :term:`marshalling` outputs,
+        the sum of :func:`sys.getsizeof()` of the values for dicts,
+        or the size of the object itself
+    """
+    if isinstance(outputs, (bytes, bytearray)):
+        return len(outputs)
+    if isinstance(outputs, Mapping):
+        return sum(sys.getsizeof(v) for v in outputs.values())
+    return sys.getsizeof(outputs)
+
+
+def percentile(sorted_samples: List[float], pct: float) -> Optional[float]:
+    """The nearest-rank `pct` percentile of `sorted_samples` (or None if empty)."""
+    if not sorted_samples:
+        return None
+    rank = max(math.ceil(pct / 100 * len(sorted_samples)) - 1, 0)
+    return sorted_samples[rank]
+
+
+class OpStats:
+    """The measurements of an operation aggregated across runs."""
+
+    __slots__ = ("count", "samples", "totals")
+
+    def __init__(self, max_samples: int):
+        #: number of executions recorded
+        self.count = 0
+        #: the latest `elapsed_ms` measured, for percentiles
+        self.samples = deque(maxlen=max_samples)
+        #: ``{field: sum}`` of all :data:`PROFILE_FIELDS` recorded
+        self.totals = dict.fromkeys(PROFILE_FIELDS, 0)
+
+    def add(self, profile: Mapping[str, float]) -> None:
+        self.count += 1
+        self.samples.append(profile.get("elapsed_ms", 0))
+        totals = self.totals
+        for field in PROFILE_FIELDS:
+            totals[field] += profile.get(field) or 0
+
+    def mean(self, field: str) -> float:
+        return self.totals[field] / self.count if self.count else 0
+
+    def as_dict(self) -> dict:
+        """The count, latency percentiles & mean of other fields."""
+        samples = sorted(self.samples)
+        return {
+            "count": self.count,
+            "p50_ms": percentile(samples, 50),
+            "p95_ms": percentile(samples, 95),
+            "p99_ms": percentile(samples, 99),
+            "self_ms": self.mean("compute_ms"),
+            "marshal_ms": self.mean("marshal_ms"),
+            "queue_ms": self.mean("queue_ms"),
+            "output_size": self.mean("output_size"),
+        }
+
+
+class Profiler:
+    """
+    Aggregate the :attr:`.Solution.profiles` of operations across runs, keyed by op name.
+
+    Plug it with :func:`.profiler_plugged()` to start collecting.
+    """
+
+    def __init__(self, max_samples: int = 1000):
+        """
+        :param max_samples:
+            how many of the latest latencies to keep for percentiles, per op
+        """
+        self.max_samples = max_samples
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"{type(self).__name__}(x{len(self._stats)} ops)"
+
+    def record(self, op: Operation, profile: Mapping[str, float]) -> None:
+        """Merge the `profile` measured for a single execution of `op`."""
+        with self._lock:
+            stats = self._stats.get(op.name)
+            if stats is None:
+                stats = self._stats[op.name] = OpStats(self.max_samples)
+            stats.add(profile)
+
+    def stats(self) -> Mapping[str, dict]:
+        """A ``{op-name: stats-dict}`` of all ops recorded (see :meth:`OpStats.as_dict()`)."""
+        with self._lock:
+            return {name: st.as_dict() for name, st in self._stats.items()}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+    def __contains__(self, op):
+        return getattr(op, "name", op) in self._stats
+
+    def __len__(self):
+        return len(self._stats)
+
+    def report(self, plan=None) -> "ProfileReport":
+        """
+        Rank ops recorded by their self time, and by contribution to the :term:`critical path`.
+
+        :param plan:
+            an :class:`.ExecutionPlan` to find its critical path, weighted by
+            the mean self time of each op; if not given, no op is on the critical path
+        """
+        from .costs import critical_path_ranks
+
+        stats = self.stats()
+        path = []
+        if plan is not None:
+            _, downstreams = plan._op_dependencies
+            ranks = critical_path_ranks(
+                downstreams,
+                lambda op: (stats.get(op.name) or {}).get("self_ms", 0),
+            )
+            nexts = [op for op in downstreams if op in ranks]
+            while nexts:
+                op = max(nexts, key=ranks.get)
+                path.append(op.name)
+                nexts = downstreams[op]
+
+        path_ms = sum(stats[name]["self_ms"] for name in path if name in stats)
+        on_path = set(path)
+        rows = [
+            {
+                "op": name,
+                **st,
+                "critical_share": (
+                    st["self_ms"] / path_ms if name in on_path and path_ms else 0
+                ),
+            }
+            for name, st in stats.items()
+        ]
+        return ProfileReport(rows, path)
+
+
+class ProfileReport:
+    """
+    The :meth:`Profiler.report()` of ops, printing as a table.
+
+    :ivar rows:
+        a list of dicts per op, with the :meth:`OpStats.as_dict()` fields
+        plus ``op`` (the name) and ``critical_share`` (the fraction of
+        the critical path's self time spent in that op)
+    :ivar critical_path:
+        the names of the ops in the critical path of the plan reported
+    """
+
+    columns = (
+        "op",
+        "count",
+        "p50_ms",
+        "p95_ms",
+        "p99_ms",
+        "self_ms",
+        "marshal_ms",
+        "queue_ms",
+        "output_size",
+        "critical_share",
+    )
+
+    def __init__(self, rows: List[dict], critical_path: Collection[str] = ()):
+        self.rows = rows
+        self.critical_path = list(critical_path)
+
+    def by_self_time(self) -> List[dict]:
+        """The rows ranked by (mean) self time, slowest first."""
+        return sorted(self.rows, key=lambda r: r["self_ms"], reverse=True)
+
+    def by_critical_path(self) -> List[dict]:
+        """The rows ranked by their share in the critical path, then by self time."""
+        return sorted(
+            self.rows,
+            key=lambda r: (r["critical_share"], r["self_ms"]),
+            reverse=True,
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "by_self_time": self.by_self_time(),
+            "by_critical_path": self.by_critical_path(),
+            "critical_path": self.critical_path,
+        }
+
+    def to_json(self, **json_kw) -> str:
+        return json.dumps(self.to_dict(), **json_kw)
+
+    def table(self, rows: List[dict] = None) -> str:
+        """Format `rows` (default: :meth:`by_self_time()`) as a plain-text table."""
+        if rows is None:
+            rows = self.by_self_time()
+
+        def fmt(val):
+            if val is None:
+                return "-"
+            if isinstance(val, float):
+                return f"{val:.3f}"
+            return str(val)
+
+        cells = [self.columns] + [[fmt(r[c]) for c in self.columns] for r in rows]
+        widths = [max(len(row[i]) for row in cells) for i in range(len(self.columns))]
+        lines = [
+            "  ".join(cell.ljust(w) for cell, w in zip(row, widths)).rstrip()
+            for row in cells
+        ]
+        lines.insert(1, "  ".join("-" * w for w in widths))
+        return "\n".join(lines)
+
+    def __str__(self):
+        return self.table()
+
+    def __repr__(self):
+        return f"{type(self).__name__}(x{len(self.rows)} ops, critical_path={self.critical_path})"
@@ -0,0 +1,174 @@
+# Copyright 2023-2023, Kostis Anagnostopoulos;
+# Licensed under the terms of the Apache License, Version 2.0. See the LICENSE file associated with the project for terms.
+"""
+Export the :term:`execution timeline` of a solution as *Chrome Trace Event* json.
+
+The files load in ``chrome://tracing`` or https://ui.perfetto.dev without any service.
+
+.. seealso:: :meth:`.Solution.to_chrome_trace()`
+"""
+import json
+import logging
+import os
+from typing import List, Optional
+
+log = logging.getLogger(__name__)
+
+
+def _us(seconds: float) -> float:
+    return round(seconds * 1e6, 3)
+
+
+def chrome_trace_events(solution) -> List[dict]:
+    """
+    Convert the :attr:`.Solution.op_spans`, :attr:`.Solution.profiles` & :attr:`.Solution.events`
+    into a list of Chrome trace events.
+
+    - Each task becomes an *async* span (on its own row, so concurrent tasks
+      don't overlap), from when it was prepared until handled,
+      nesting any ``marshal``, ``queue`` & ``unmarshal`` phases measured;
+    - while :term:`profiling`, each task also spans in the track of the worker
+      thread/process that ran it, nesting its ``unmarshal``, ``compute`` &
+      ``marshal`` phases there, to reveal idle gaps in workers;
+    - evictions, failures & reschedules become instant events
+      in the ``solution`` track;
+    - while :term:`memory accounting`, the live bytes become a ``memory`` counter.
+
+    Timestamps are relative to the earliest one.
+    """
+    spans, profiles = solution.op_spans, solution.profiles
+    stamps = [t for span in spans.values() for t in span]
+    stamps.extend(ev[0] for ev in solution.events)
+    memory_timeline = solution.memory.timeline if solution.memory is not None else ()
+    stamps.extend(t for t, _ in memory_timeline)
+    if not stamps:
+        return []
+    origin = min(stamps)
+
+    main_pid, main_tid = os.getpid(), 0
+    tracks = {(main_pid, main_tid): "solution"}
+    events = []
+
+    def span(name, cat, pid, tid, start, end, **args):
+        if end > start:
+            events.append(
+                {
+                    "name": name,
+                    "cat": cat,
+                    "ph": "X",
+                    "ts": _us(start - origin),
+                    "dur": _us(end - start),
+                    "pid": pid,
+                    "tid": tid,
+                    "args": args,
+                }
+            )
+
+    def async_span(name, task_id, start, end, **args):
+        if end > start:
+            common = {"name": name, "cat": "task", "id": task_id, "pid": main_pid}
+            events.append(
+                {**common, "ph": "b", "ts": _us(start - origin), "args": args}
+            )
+            events.append({**common, "ph": "e", "ts": _us(end - origin)})
+
+    for task_id, (op, (start, end)) in enumerate(spans.items()):
+        prof = profiles.get(op) or {}
+        status = "failed" if isinstance(solution.executed.get(op), Exception) else "ok"
+        async_span(op.name, task_id, start, end, status=status)
+
+        started = prof.get("started")
+        if started is None:
+            continue
+
+        def ms(key):
+            return prof.get(key, 0) / 1000
+
+        ## Main-thread phases, in the task's async row.
+        #
+        marshaled = start + ms("task_dumps_ms")
+        async_span("marshal", task_id, start, marshaled)
+        worker_start = max(started - ms("task_loads_ms"), marshaled)
+        async_span("queue", task_id, marshaled, worker_start)
+        async_span("unmarshal", task_id, end - ms("result_loads_ms"), end)
+
+        ## Worker phases, in the worker's track.
+        #
+        pid, tid = prof.get("pid", main_pid), prof.get("tid", main_tid)
+        if (pid, tid) not in tracks:
+            tracks[pid, tid] = prof.get("thread") or str(tid)
+        computed = started + ms("compute_ms")
+        worker_end = computed + ms("result_dumps_ms")
+        span(op.name, "op", pid, tid, worker_start, worker_end, status=status)
+        span("unmarshal", "phase", pid, tid, worker_start, started)
+        span("compute", "phase", pid, tid, started, computed)
+        span("marshal", "phase", pid, tid, computed, worker_end)
+
+    for stamp, kind, name, args in solution.events:
+        events.append(
+            {
+                "name": f"{kind} {name}",
+                "cat": kind,
+                "ph": "i",
+                "s": "t",
+                "ts": _us(stamp - origin),
+                "pid": main_pid,
+                "tid": main_tid,
+                "args": args,
+            }
+        )
+
+    for stamp, live_bytes in memory_timeline:
+        events.append(
+            {
+                "name": "memory",
+                "ph": "C",
+                "ts": _us(stamp - origin),
+                "pid": main_pid,
+                "args": {"live_bytes": live_bytes},
+            }
+        )
+
+    ## Name processes & threads.
+    #
+    for pid in {pid for pid, _ in tracks}:
+        events.append(
+            {
+                "name": "process_name",
+                "ph": "M",
+                "pid": pid,
+                "args": {"name": "graphtik" if pid == main_pid else f"worker {pid}"},
+            }
+        )
+    for (pid, tid), name in tracks.items():
+        events.append(
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": pid,
+                "tid": tid,
+                "args": {"name": name},
+            }
+        )
+
+    return events
+
+
+def write_chrome_trace(solution, fpath: Optional[str] = None) -> dict:
+    """
+    Build the Chrome trace json-object of `solution` (and write it into `fpath`, if given).
+
+    :return:
+        the dict with ``traceEvents``, as written
+    """
+    trace = {
+        "traceEvents": chrome_trace_events(solution),
+        "displayTimeUnit": "ms",
+        "otherData": {"solution": solution.solid, "plan": str(solution.plan)},
+    }
+    if fpath is not None:
+        with open(fpath, "wt") as f:
+            json.dump(trace, f, default=str)
+        log.info("Wrote chrome-trace of solution(%s) into: %s", solution.solid, fpath)
+
+    return trace
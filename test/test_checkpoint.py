@@ -0,0 +1,144 @@
+# Copyright 2023-2023, Kostis Anagnostopoulos;
+# Licensed under the terms of the Apache License, Version 2.0. See the LICENSE file associated with the project for terms.
+"""Test :term:`checkpoint` & :term:`resume` of crashed runs."""
+import json
+from concurrent.futures import ThreadPoolExecutor
+from operator import add
+
+import pytest
+
+from graphtik import compose, operation
+from graphtik.checkpoint import CheckpointStore, net_fingerprint
+from graphtik.config import execution_pool_plugged
+
+
+calls = []
+
+
+def fadd(a, b):
+    calls.append("add")
+    return a + b
+
+
+def fmul(ab, c):
+    calls.append("mul")
+    return ab * c
+
+
+def fsub(abc, a):
+    calls.append("sub")
+    if calls.count("sub") == 1:
+        raise SystemError("Crashed!")
+    return abc - a
+
+
+@pytest.mark.parametrize("parallel", [False, True])
+def test_resume_crashed(tmp_path, parallel):
+    pipe = compose(
+        "t",
+        operation(fadd, "add", needs=["a", "b"], provides="ab"),
+        operation(fmul, "mul", needs=["ab", "c"], provides="abc"),
+        operation(fsub, "sub", needs=["abc", "a"], provides="out"),
+        parallel=parallel,
+    )
+    calls.clear()
+    inp = {"a": 1, "b": 2, "c": 3}
+    with ThreadPoolExecutor(2) as pool, execution_pool_plugged(
+        pool if parallel else None
+    ):
+        with pytest.raises(SystemError, match="Crashed!"):
+            pipe.compute(inp, checkpoint=str(tmp_path))
+        assert calls == ["add", "mul", "sub"]
+        store = CheckpointStore(tmp_path)
+        assert len(store) == 2
+        header, *steps = (tmp_path / store.manifest_fname).read_text().splitlines()
+        assert json.loads(header)["net"] == net_fingerprint(pipe.net)
+        assert [json.loads(s)[0] for s in steps] == ["add", "mul"]
+
+        sol = pipe.compute(inp, checkpoint=store, resume=True)
+        assert sol == {"a": 1, "b": 2, "c": 3, "ab": 3, "abc": 9, "out": 8}
+        assert calls == ["add", "mul", "sub", "sub"]
+        assert list(sol.executed) == list(pipe.ops)
+        assert len(store) == 3
+
+        ## Resuming a completed run executes nothing.
+        #
+        assert pipe.compute(inp, "out", checkpoint=store, resume=True) == {"out": 8}
+        assert calls == ["add", "mul", "sub", "sub"]
+
+        ## Without `resume`, store is cleared.
+        #
+        pipe.compute(inp, checkpoint=store)
+        assert calls == ["add", "mul", "sub", "sub"] + ["add", "mul", "sub"]
+        assert len(store) == 3
+
+
+def test_resume_different_inputs(tmp_path):
+    pipe = compose(
+        "t",
+        operation(fadd, "add", needs=["a", "b"], provides="ab"),
+        operation(fmul, "mul", needs=["ab", "c"], provides="abc"),
+        operation(fsub, "sub", needs=["abc", "a"], provides="out"),
+    )
+    calls.clear()
+    store = CheckpointStore(tmp_path)
+
+    with pytest.raises(SystemError):
+        pipe.compute({"a": 1, "b": 2, "c": 3}, checkpoint=store)
+    assert len(store) == 2
+
+    sol = pipe.compute({"a": 1, "b": 2, "c": 4}, checkpoint=store, resume=True)
+    assert sol["out"] == 11
+    assert calls == ["add", "mul", "sub", "add", "mul", "sub"]
+    assert len(store) == 3
+
+    ## Another pipeline with the same op-names.
+    #
+    other = compose(
+        "t",
+        operation(add, "add", needs=["a", "b"], provides="ab"),
+        operation(add, "mul", needs=["ab", "c"], provides="abc"),
+    )
+    sol = other.compute({"a": 1, "b": 2, "c": 4}, checkpoint=store, resume=True)
+    assert sol["abc"] == 7
+
+
+def test_resume_unhashable_inputs(tmp_path):
+    pipe = compose(
+        "t",
+        operation(fadd, "add", needs=["a", "b"], provides="ab"),
+        operation(fmul, "mul", needs=["ab", "c"], provides="abc"),
+        operation(fsub, "sub", needs=["abc", "a"], provides="out"),
+    )
+    calls.clear()
+    inp = {"a": 1, "b": 2, "c": 3, "x": lambda: 0}
+    with pytest.raises(SystemError):
+        pipe.compute(inp, checkpoint=tmp_path)
+
+    pipe.compute(inp, checkpoint=tmp_path, resume=True)
+    assert calls == ["add", "mul", "sub"] * 2
+
+
+def test_checkpoint_store(tmp_path):
+    store = CheckpointStore(tmp_path / "sub")
+    assert len(store) == 0
+    assert list(store.load("abc")) == []
+
+    store.start("abc", "net")
+    store.save("op1", {"a": 1})
+    store.save("op2", {"b": 2})
+    assert list(store.load("abc", "net")) == [("op1", {"a": 1}), ("op2", {"b": 2})]
+    assert list(store.load(None, "net")) == [], "unhashable inputs resumed!"
+    assert list(store.load("other", "net")) == []
+    assert list(store.load("abc", "other")) == [], "other pipeline resumed!"
+
+    ## Appends continue after a truncated line.
+    #
+    with open(tmp_path / "sub" / store.manifest_fname, "at") as f:
+        f.write('["op3", "000')
+    store = CheckpointStore(tmp_path / "sub")
+    store.save("op3", {"c": 3})
+    assert [op for op, _ in store.load("abc", "net")] == ["op1", "op2", "op3"]
+
+    store.clear()
+    assert list((tmp_path / "sub").iterdir()) == []
@@ -0,0 +1,211 @@
+# Copyright 2023-2023, Kostis Anagnostopoulos;
+# Licensed under the terms of the Apache License, Version 2.0. See the LICENSE file associated with the project for terms.
+"""Test :term:`chunked` dataflow between operations."""
+import pickle
+
+import pytest
+
+from graphtik import compose, operation, token
+from graphtik.chunks import Chunks, concat_chunks
+
+from .helpers import exe_params
+
+reads = []
+
+
+def read(n):
+    for i in range(0, n, 3):
+        reads.append(i)
+        yield list(range(i, min(i + 3, n)))
+
+
+def double(rows):
+    for chunk in rows:
+        yield [x * 2 for x in chunk]
+
+
+def test_concat_chunks():
+    assert concat_chunks([]) == []
+    assert concat_chunks(["ab", "c"]) == "abc"
+    assert concat_chunks([b"ab", b"c"]) == b"abc"
+    assert concat_chunks([[1], (2, 3)]) == [1, 2, 3]
+    assert concat_chunks([1, 2]) == [1, 2]
+
+    np = pytest.importorskip("numpy")
+    assert concat_chunks([np.ones(2), np.zeros(1)]).tolist() == [1, 1, 0]
+    assert concat_chunks([np.int64(1), np.int64(2)]) == [1, 2]
+
+
+def test_chunked_pipeline(exemethod):
+    pipe = compose(
+        "t",
+        operation(read, "read", "n", "rows", chunked=True),
+        operation(double, "double", "rows", "doubled", chunked=True),
+        operation(sum, "sum", "doubled", "total"),
+        operation(len, "len", "rows", "count"),
+        parallel=exemethod,
+    )
+    if exe_params.marshal or exe_params.proc:
+        pytest.skip("lazy chunks flow only in-process")
+    reads.clear()
+    sol = pipe.compute({"n": 10})
+    assert sol["total"] == 90
+    assert sol["count"] == 10
+    assert isinstance(sol["doubled"], Chunks)
+    assert list(sol["doubled"]) == [[0, 2, 4], [6, 8, 10], [12, 14, 16], [18]]
+    assert sol["doubled"].value() == [x * 2 for x in range(10)]
+
+    sol = pipe.compute({"n": 10}, "total")
+    assert sol == {"total": 90}
+
+
+def test_chunks_produced_once():
+    def fail(rows):
+        yield from rows
+        raise ValueError("Boom!")
+
+    pipe = compose(
+        "t",
+        operation(read, "read", "n", "rows", chunked=True),
+        operation(double, "double", "rows", "doubled", chunked=True),
+        operation(len, "len", "rows", "count"),
+        operation(sum, "sum", "doubled", "total"),
+    )
+    reads.clear()
+    sol = pipe.compute({"n": 7})
+    assert reads == [0, 3, 6], "producer not run once!"
+    assert list(sol["doubled"]) == list(sol["doubled"]), "kept outputs not replayable"
+    with pytest.raises(TypeError, match="Cannot pickle lazy"):
+        pickle.dumps(sol["doubled"])
+
+    reads.clear()
+    assert pipe.compute({"n": 7}, ["count", "total"]) == {"count": 7, "total": 42}
+    assert reads == [0, 3, 6], "producer not run once!"
+
+    pipe = compose(
+        "t",
+        operation(read, "read", "n", "rows", chunked=True),
+        operation(fail, "fail", "rows", "failed", chunked=True),
+        operation(sum, "sum", "failed", "total"),
+    )
+    ## Lazy chunks fail when pulled, by their consumers.
+    with pytest.raises(ValueError, match="Boom!") as exinfo:
+        pipe.compute({"n": 7})
+    assert exinfo.value.jetsam["operation"].name == "sum"
+
+
+def test_chunks_bounded_alive():
+    class Chunk(list):
+        alive = peak = 0
+
+        def __init__(self, *args):
+            super().__init__(*args)
+            Chunk.alive += 1
+            Chunk.peak = max(Chunk.peak, Chunk.alive)
+
+        def __del__(self):
+            Chunk.alive -= 1
+
+    def big_read(n):
+        for i in range(n):
+            yield Chunk([i])
+
+    def inc(rows):
+        for chunk in rows:
+            yield Chunk(x + 1 for x in chunk)
+
+    total = []
+
+    def sink(rows):
+        for chunk in rows:
+            total.extend(chunk)
+            yield
+
+    pipe = compose(
+        "t",
+        operation(big_read, "read", "n", "rows", chunked=True),
+        operation(inc, "inc1", "rows", "rows1", chunked=True),
+        operation(inc, "inc2", "rows1", "rows2", chunked=True),
+        operation(sink, "sink", "rows2", token("written"), chunked=True),
+        operation(sink, "sink2", "rows", token("written2"), chunked=True),
+    )
+    pipe.compute({"n": 1000}, token("written"))
+    assert sum(total) == sum(range(2, 1002))
+    assert Chunk.peak <= 4, "chunks materialized!"
+    assert Chunk.alive == 0
+
+    ## Consumers lagging behind buffer the chunks in between.
+    #
+    total.clear()
+    Chunk.peak = 0
+    pipe.compute({"n": 100}, [token("written"), token("written2")])
+    assert len(total) == 200
+    assert Chunk.peak > 4
+
+    rows = Chunks(iter([[1], [2]]))
+    rows.expect(1)
+    assert rows.value() == [1, 2]
+    with pytest.raises(RuntimeError, match="already read"):
+        list(rows)
+
+
+def test_chunked_multi_outputs_n_sinks():
+    def split(rows):
+        for chunk in rows:
+            yield [x for x in chunk if x % 2], [x for x in chunk if not x % 2]
+
+    def split_dict(rows):
+        for chunk in rows:
+            yield {"lo": min(chunk), "hi": max(chunk)}
+
+    written = []
+
+    def sink(odds):
+        for chunk in odds:
+            written.extend(chunk)
+            yield
+
+    pipe = compose(
+        "t",
+        operation(
+            split, "split", "rows", ["odds", "evens"], chunked=lambda cc: sum(cc, [])
+        ),
+        operation(split_dict, "ranges", "rows", ["lo", "hi"], returns_dict=True)
+        .withset(chunked=True),
+        operation(sink, "sink", "odds", token("written"), chunked=True),
+    )
+    rows = Chunks([[1, 2, 3], [4, 5]])
+    sol = pipe.compute({"rows": rows})
+    assert written == [1, 3, 5], "sink not consumed eagerly"
+    assert sol["evens"].value() == [2, 4]
+    assert sol["lo"].value() == [1, 4]
+    assert list(sol["hi"]) == [3, 5]
+
+
+def test_chunked_coroutine_screams():
+    async def fn(a):
+        return a
+
+    with pytest.raises(TypeError, match="cannot be `chunked`"):
+        operation(fn, "c", "a", "b", chunked=True)
+
+
+def test_chunked_dataframes():
+    pd = pytest.importorskip("pandas")
+
+    def read_frames(nrows):
+        for i in range(0, nrows, 4):
+            yield pd.DataFrame({"x": range(i, min(i + 4, nrows))})
+
+    def add_y(frames):
+        for df in frames:
+            yield df.assign(y=df.x * 10)
+
+    pipe = compose(
+        "t",
+        operation(read_frames, "read", "nrows", "frames", chunked=True),
+        operation(add_y, "add_y", "frames", "enriched", chunked=True),
+        operation(lambda df: df.y.sum(), "total", "enriched", "y_total"),
+    )
+    sol = pipe.compute({"nrows": 10}, "y_total")
+    assert sol["y_total"] == 450
@@ -0,0 +1,107 @@
+# Copyright 2023-2023, Kostis Anagnostopoulos;
+# Licensed under the terms of the Apache License, Version 2.0. See the LICENSE file associated with the project for terms.
+"""Test :term:`critical path` scheduling by :term:`operation cost`\\s."""
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from graphtik import compose, operation
+from graphtik.config import execution_pool_plugged, op_costs_plugged
+from graphtik.costs import OpCosts, critical_path_ranks
+
+
+def test_op_costs_ema():
+    op = operation(str, "op", "a", "b")
+    costs = OpCosts(smoothing=0.5, default_cost=2)
+    assert costs.get(op) is None
+    assert costs.cost(op) == 2
+
+    costs.record(op, 10)
+    costs.record(op, 20)
+    assert costs.get(op) == 15
+    assert op in costs and len(costs) == 1
+    assert op.withset(name="op") not in costs, "keyed by op-name!"
+    assert costs.cost(op.withset(node_props={"cost": 100})) == 100
+
+    assert costs.as_dict() == {"op": 15}
+    del op
+    assert len(costs) == 0, "dead op not forgotten"
+
+    costs.record(operation(str, "op", "a", "b"), 1)
+    costs.clear()
+    assert costs.as_dict() == {}
+
+    with pytest.raises(ValueError, match="smoothing"):
+        OpCosts(smoothing=0)
+
+
+def test_critical_path_ranks():
+    pipe = compose(
+        "t",
+        operation(str, "cheap", "a", "c"),
+        operation(str, "heavy1", "a", "h1", node_props={"cost": 10}),
+        operation(str, "heavy2", "h1", "h2", node_props={"cost": 5}),
+        operation(str, "cheap2", "a", "h2"),  # overwrites `h2`
+    )
+    _, downstreams = pipe.compile("a")._op_dependencies
+    ranks = critical_path_ranks(downstreams, OpCosts().cost)
+    assert {op.name: r for op, r in ranks.items()} == {
+        "cheap": 1,
+        "heavy1": 15,
+        "heavy2": 5,
+        "cheap2": 1,
+    }
+
+
+def test_heavy_chain_submitted_first():
+    calls = []
+
+    def op(name, needs, provides, **kw):
+        def fn(*args):
+            calls.append(name)
+            return name
+
+        return operation(fn, name, needs, provides, **kw)
+
+    pipe = compose(
+        "t",
+        *(op(f"cheap{i}", "a", f"c{i}") for i in range(3)),
+        op("score1", "a", "s1"),
+        op("score2", "s1", "s2"),
+        parallel=True,
+    )
+
+    costs = OpCosts()
+    with ThreadPoolExecutor(1) as pool, execution_pool_plugged(
+        pool
+    ), op_costs_plugged(costs):
+        ## Unknown costs, longest chain first.
+        #
+        pipe.compute({"a": 0})
+        assert calls == ["score1", "cheap0", "cheap1", "cheap2", "score2"]
+        assert set(costs.as_dict()) == {op.name for op in pipe.ops}
+
+        ## Pretend last cheap op got heavy.
+        #
+        costs.record(pipe.ops[2], 1000)
+        calls.clear()
+        pipe.compute({"a": 0})
+        assert calls[0] == "cheap2"
+
+
+def test_costs_recorded_only_parallel_or_plugged():
+    from graphtik.costs import default_op_costs
+
+    pipe = compose("t", operation(str, "op", "a", "b"))
+    pipe.compute({"a": 0})
+    assert pipe.ops[0] not in default_op_costs(), "sequential run recorded"
+
+    costs = OpCosts()
+    with op_costs_plugged(costs):
+        pipe.compute({"a": 0})
+    assert pipe.ops[0] in costs
+
+    pipe = compose("t", operation(str, "op", "a", "b"), parallel=True)
+    with ThreadPoolExecutor(1) as pool, execution_pool_plugged(pool):
+        pipe.compute({"a": 0})
+    assert pipe.ops[0] in default_op_costs()
@@ -1,8 +1,11 @@
 # Copyright 2020-2020, Kostis Anagnostopoulos;
 # Licensed under the terms of the Apache License, Version 2.0. See the LICENSE file associated with the project for terms.
 """Test :term:`parallel`, :term:`marshalling` and other :term:`execution` related stuff. """
+import asyncio
 import io
 import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from functools import partial
 from multiprocessing import cpu_count
 from multiprocessing import dummy as mp_dummy
@@ -14,8 +17,21 @@ import pandas as pd
 import pytest
 from pandas.testing import assert_frame_equal
 
-from graphtik import AbortedException, compose, hcat, modify, operation, optional, vcat
-from graphtik.config import abort_run, execution_pool_plugged
+from graphtik import (
+    AbortedException,
+    CancelToken,
+    compose,
+    hcat,
+    keyword,
+    modify,
+    operation,
+    optional,
+    token,
+    vararg,
+    varargs,
+    vcat,
+)
+from graphtik.config import abort_run, execution_pool_plugged, reset_abort
 from graphtik.execution import OpTask, task_context
 
 from .helpers import abspow, dummy_sol, exe_params
@@ -177,6 +193,162 @@ def test_multi_threading_computes():
             pool.map(infer, range(N))
 
 
+def test_parallel_no_barrier():
+    """A fast chain must not wait for a slow sibling to finish each "round"."""
+    finished = []
+
+    def slow(x):
+        sleep(0.3)
+        finished.append("slow")
+        return x
+
+    def fast(x):
+        sleep(0.01)
+        return x
+
+    def last(x):
+        finished.append("last")
+        return x
+
+    pipe = compose(
+        "t",
+        operation(slow, "slow", needs="x", provides="s"),
+        operation(fast, "F1", needs="x", provides="f1"),
+        operation(fast, "F2", needs="f1", provides="f2"),
+        operation(last, "F3", needs="f2", provides="f3"),
+        parallel=True,
+    )
+    with mp_dummy.Pool(2) as pool, execution_pool_plugged(pool):
+        sol = pipe.compute({"x": 1})
+
+    assert sol == {"x": 1, "s": 1, "f1": 1, "f2": 1, "f3": 1}
+    assert finished == ["last", "slow"]
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_parallel_evicts_asap(use_async):
+    """Data are evicted when their last user completes (or is canceled)."""
+
+    def slow(x):
+        sleep(0.3)
+        return x
+
+    def fail(x):
+        raise ValueError("Boom!")
+
+    pipe = compose(
+        "t",
+        operation(slow, "slow", needs="x", provides="s"),
+        operation(str, "F1", needs="x", provides="f1"),
+        operation(str, "F2", needs="f1", provides="f2"),
+        operation(str, "F3", needs="f2", provides="f3"),
+        operation(fail, "bad", needs="x", provides="w", endured=True),
+        operation(str, "canceled", needs=["f1", "w"], provides="v"),
+        parallel=True,
+    )
+    with ThreadPoolExecutor(2) as pool:
+        if use_async:
+            sol = asyncio.run(
+                pipe.compute_async({"x": 1}, ["s", "f3", "v"], executor=pool)
+            )
+        else:
+            with execution_pool_plugged(pool):
+                sol = pipe.compute({"x": 1}, ["s", "f3", "v"])
+
+    assert sol == {"s": 1, "f3": "1"}
+    assert [op.name for op in sol.canceled] == ["canceled"]
+    evicted = {name: stamp for stamp, kind, name, _ in sol.events if kind == "evict"}
+    assert set(evicted) == {"x", "f1", "f2"}
+    slow_end = sol.op_spans[pipe.ops[0]][1]
+    assert evicted["f1"] < slow_end
+    assert evicted["f2"] < slow_end
+
+
+@pytest.mark.parametrize(
+    "executor_cls, marshal",
+    [
+        (ThreadPoolExecutor, False),
+        (ThreadPoolExecutor, True),
+        pytest.param(ProcessPoolExecutor, True, marks=pytest.mark.slow),
+    ],
+)
+def test_parallel_with_executor(executor_cls, marshal):
+    pipe = compose(
+        "t",
+        operation(name="mul1", needs=["a", "b"], provides=["ab"])(mul),
+        operation(name="sub1", needs=["a", "ab"], provides=["a-ab"])(sub),
+        operation(name="abspow1", needs=["a-ab"], provides=["|a-ab|³"])(
+            partial(abspow, p=3)
+        ),
+        operation(name="mul2", needs=["a", "a"], provides=["aa"])(mul),
+        parallel=True,
+        marshalled=marshal,
+    )
+    with executor_cls(2) as executor, execution_pool_plugged(executor):
+        sol = pipe.compute({"a": 2, "b": 5})
+    assert sol == {"a": 2, "b": 5, "ab": 10, "a-ab": -8, "|a-ab|³": 512, "aa": 4}
+    assert len(sol.executed) == 4
+
+    ## Failures surface through `Future.result()`.
+    #
+    pipe = compose(
+        "t",
+        operation(name="div", needs=["a", "b"], provides=["ab"])(lambda a, b: a / b),
+        parallel=True,
+    )
+    with ThreadPoolExecutor(2) as executor, execution_pool_plugged(executor):
+        with pytest.raises(ZeroDivisionError):
+            pipe.compute({"a": 2, "b": 0})
+
+
+def test_op_dependencies(samplenet):
+    plan = samplenet.compile(["a", "b", "c", "d"])
+    indegrees, downstreams = plan._op_dependencies
+
+    assert [(op.name, n) for op, n in indegrees.items()] == [
+        ("sum_op1", 0),
+        ("sum_op2", 0),
+        ("sum_op3", 1),
+    ]
+    assert {op.name: [o.name for o in dops] for op, dops in downstreams.items()} == {
+        "sum_op1": [],
+        "sum_op2": ["sum_op3"],
+        "sum_op3": [],
+    }
+    assert plan._op_dependencies is plan._op_dependencies
+
+
+def test_task_inputs_sliced(exemethod):
+    seen = []
+
+    def add(a, b=0):
+        return a + b
+
+    def check(ab, **kw):
+        seen.append(sorted(task_context.get().sol))
+        return ab
+
+    pipe = compose(
+        "t",
+        operation(add, "ADD", needs=["a", optional("b")], provides="ab"),
+        operation(check, "CHECK", needs="ab", provides="abc"),
+        operation(lambda doc: doc, "SUB", needs="doc/sub", provides="s"),
+        parallel=exemethod,
+    )
+    sol = pipe.compute({"a": 1, "b": 2, "big": [0] * 1000, "doc": {"sub": 3}})
+    assert sol["abc"] == 3
+    assert sol["s"] == 3
+
+    plan = sol.plan
+    task_inputs = plan._task_inputs_slicer(sol)
+    assert task_inputs(pipe.ops[0]) == {"a": 1, "b": 2}
+    assert task_inputs(pipe.ops[2]) == {"doc/sub": 3}
+    assert plan._op_input_keys[pipe.ops[1]] == ("ab",)
+
+    if exe_params.parallel and not (exe_params.proc or exe_params.marshal):
+        assert seen == [["ab"]]
+
+
 def test_abort(exemethod):
     pipeline = compose(
         "pipeline",
@@ -202,6 +374,298 @@ def test_abort(exemethod):
     assert pipeline.compute({"a": 1}) == {"a": 1, "b": 1}
 
 
+def test_cancel_token_unit():
+    parent = CancelToken()
+    tok = CancelToken(time() + 100, timeout=10, parent=parent)
+    assert 9 < tok.remaining() <= 10
+    assert CancelToken().remaining() is None
+    assert not tok.is_canceled
+    assert repr(tok) == "CancelToken(active)"
+
+    called = []
+    tok.add_callback(lambda: called.append(1))
+    parent.cancel("shutdown")
+    assert tok.reason == "shutdown"
+    assert called == [1]
+    assert repr(tok) == "CancelToken(canceled: shutdown)"
+
+    assert CancelToken(timeout=0).reason == "deadline exceeded"
+
+
+def test_cancel_token(exemethod):
+    cancel = CancelToken()
+    pipeline = compose(
+        "pipeline",
+        operation(fn=None, name="A", needs=["a"], provides=["b"]),
+        operation(name="B", needs=["b"], provides=["c"])(lambda x: cancel.cancel()),
+        operation(fn=None, name="C", needs=["c"], provides=["d"]),
+        parallel=exemethod,
+    )
+    if exe_params.marshal or exe_params.proc:
+        pytest.skip("tokens cancel only in-process")
+    with pytest.raises(AbortedException) as exinfo:
+        pipeline.compute({"a": 1}, cancel=cancel)
+
+    solution = exinfo.value.args[0]
+    assert solution.aborted == "canceled"
+    ## Parallel runs may be canceled before handling the task of `B`.
+    assert [op.name for op in solution.executed][:1] == ["A"]
+    assert "d" not in solution
+    assert pipeline.compute({"a": 1}) == {"a": 1, "b": 1, "c": None, "d": None}
+
+
+def _slow(a):
+    sleep(0.6)
+    return a
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_deadline_cancels_pending(use_async):
+    pipe = compose(
+        "t",
+        operation(str, "fast", "a", "b"),
+        operation(_slow, "slow1", "a", "c"),
+        operation(_slow, "slow2", "a", "d"),
+        operation(_slow, "slow3", "a", "e"),
+        parallel=True,
+    )
+    with ThreadPoolExecutor(4) as pool, execution_pool_plugged(pool):
+        t0 = time()
+        with pytest.raises(AbortedException) as exinfo:
+            if use_async:
+                asyncio.run(pipe.compute_async({"a": 1}, timeout=0.2, executor=pool))
+            else:
+                pipe.compute({"a": 1}, deadline=time() + 0.2)
+        assert time() - t0 < 0.5, "Waited slow tasks!"
+
+    solution = exinfo.value.args[0]
+    assert solution.aborted == "deadline exceeded"
+    assert "b" in solution
+    canceled = {name for _, kind, name, _ in solution.events if kind == "cancel"}
+    assert {"slow1", "slow2", "slow3"} & canceled
+
+
+def test_cancel_wakes_pool():
+    pipe = compose(
+        "t",
+        operation(str, "fast", "a", "b"),
+        operation(_slow, "slow1", "a", "c"),
+        operation(_slow, "slow2", "a", "d"),
+        operation(_slow, "slow3", "a", "e"),
+        parallel=True,
+    )
+    cancel = CancelToken()
+    with ThreadPoolExecutor(2) as pool, execution_pool_plugged(pool):
+        threading.Timer(0.1, cancel.cancel, ["client gone"]).start()
+        t0 = time()
+        with pytest.raises(AbortedException) as exinfo:
+            pipe.compute({"a": 1}, cancel=cancel)
+        assert time() - t0 < 0.5, "Waited slow tasks!"
+    assert exinfo.value.args[0].aborted == "client gone"
+    assert not cancel._callbacks, "Callbacks leaked!"
+
+
+def test_solution_dag_copy_on_write(samplenet):
+    sol = samplenet(a=1, b=2)
+    assert sol.dag is sol.plan.dag
+
+    def fail(c, d):
+        raise ValueError("Boom!")
+
+    pipe = compose(
+        "t",
+        operation(fail, "sum_op2", needs=["c", "d"], provides="sum2"),
+        samplenet,
+        endured=True,
+    )
+    plan_edges = set(pipe.compile(["a", "b", "c", "d"]).dag.edges)
+    sol = pipe(a=1, b=2, c=3, d=4)
+    assert list(sol.canceled) == [pipe.ops[2]]
+    assert set(sol.plan.dag.edges) == plan_edges
+    assert set(sol.dag.edges) == plan_edges - {(pipe.ops[0], "sum2")}
+
+    clone = sol.copy()
+    assert set(clone.dag.edges) == set(sol.dag.edges)
+    clone._break_edges([(pipe.ops[1], "sum1")])
+    assert (pipe.ops[1], "sum1") in sol.dag.edges
+
+
+def test_solution_key_index():
+    pipe = compose(
+        "t",
+        operation(lambda a: a + 1, "A", needs="a", provides="b"),
+        operation(lambda a: (a + 10, 3), "B", needs="a", provides=["b", "c"]),
+        operation(lambda b, c: b + c, "D", needs=["b", "c"], provides="d"),
+    )
+    sol = pipe.compute({"a": 1}, layered_solution=True)
+    assert sol.is_layered
+    assert sol._key_index is not None, "Index not used?"
+    assert sol == {"a": 1, "b": 11, "c": 3, "d": 14}
+    assert sol.overwrites == {"b": [11, 2]}
+    assert [dict(l) for l in sol.layers] == [{"b": 2}, {"b": 11, "c": 3}, {"d": 14}]
+
+    del sol["b"]
+    assert "b" not in sol
+    with pytest.raises(KeyError):
+        sol["b"]
+    sol["b"] = 10
+    assert sol["b"] == 10
+    assert sol.maps[0]["b"] == 10
+    sol.pop("b")
+    assert "b" not in sol
+
+    clone = sol.copy()
+    assert clone._key_index is None
+    assert clone == sol
+
+
+@pytest.mark.parametrize("outputs", [None, "hh", ["d", "i"]])
+def test_slot_program(outputs):
+    async def amul(a, b):
+        await asyncio.sleep(0)
+        return a * b
+
+    pipe = compose(
+        "t",
+        operation(lambda a, b: a + b, "A", needs=["a", "b"], provides="ab"),
+        operation(amul, "B", needs=["ab", "c"], provides="abc"),
+        operation(lambda x, y=1: x + y, "C", needs=["abc", optional("y")], provides="d"),
+        operation(
+            lambda x, *a: x + sum(a),
+            "D",
+            needs=["d", vararg("e"), varargs("f")],
+            provides="g",
+        ),
+        operation(
+            lambda q: (q, -q),
+            "E",
+            needs=keyword("g", "q"),
+            provides=["h", "i"],
+            aliases=[("h", "hh")],
+        ),
+    )
+    inputs = {"a": 1, "b": 2, "c": 3, "f": [1, 2], "extra": 0}
+    plan = pipe.compile(inputs.keys(), outputs)
+    program = plan.to_program()
+    assert program is plan.to_program()
+
+    sol = program(inputs)
+    assert dict(sol) == plan.execute(inputs, outputs)
+    assert sol.plan is plan
+    assert ("extra" in sol) == (outputs is None)
+
+    with pytest.raises(ValueError, match="Plan needs more inputs"):
+        program({"a": 1})
+
+
+def test_slot_program_abort_n_fail():
+    pipe = compose(
+        "t",
+        operation(lambda a: abort_run(), "A", needs="a", provides="b"),
+        operation(lambda b: b, "B", needs="b", provides="c"),
+    )
+    with pytest.raises(AbortedException) as exinfo:
+        pipe.compile("a").to_program()({"a": 1})
+    assert exinfo.value.args[0] == {"a": 1, "b": None}
+    reset_abort()
+
+    pipe = compose("t", operation(lambda a: 1 / a, "A", needs="a", provides="b"))
+    with pytest.raises(ZeroDivisionError):
+        pipe.compile("a").to_program()({"a": 0})
+
+
+@pytest.mark.parametrize(
+    "op, err",
+    [
+        (operation(str, "A", needs="a/b", provides="b"), "non-plain"),
+        (operation(str, "A", needs="a", provides=token("b")), "non-plain"),
+        (operation(str, "A", needs="a", provides="b", endured=True), "endured"),
+        (operation(str, "A", needs="a", provides="b", rescheduled=True), "rescheduled"),
+        (operation(str, "A", needs="a", provides="b", memoize=True), "memoize"),
+        (operation(str, "A", needs="a", provides="b", chunked=True), "chunked"),
+    ],
+)
+def test_slot_program_non_plain(op, err):
+    with pytest.raises(ValueError, match=err):
+        compose("t", op).compile("a").to_program()
+
+
+def test_reschedule_walks_downstream():
+    def fail(a):
+        raise ValueError("Boom!")
+
+    pipe = compose(
+        "t",
+        operation(fail, "A", needs="a", provides="b", endured=True),
+        operation(lambda a: a, "A2", needs="a", provides="b2"),
+        operation(lambda b: b, "B", needs="b", provides="c"),
+        operation(lambda c, b2: c, "C", needs=["c", "b2"], provides="d"),
+        operation(lambda a, b=0: a, "D", needs=["a", optional("b")], provides="e"),
+        operation(lambda b2: b2, "E", needs="b2", provides="f"),
+    )
+    sol = pipe(a=1)
+    assert sol == {"a": 1, "b2": 1, "e": 1, "f": 1}
+    assert sol.canceled == {
+        pipe.ops[2]: "unsatisfied-needs['b']",
+        pipe.ops[3]: "unsatisfied-needs['c']",
+    }
+
+
+@pytest.mark.parametrize("layered", [False, True])
+def test_solution_recompute(layered):
+    calls = []
+
+    def counted(name, fn):
+        def wrapper(*args):
+            calls.append(name)
+            return fn(*args)
+
+        return wrapper
+
+    def fail(b):
+        if b > 5:
+            raise ValueError("Boom!")
+        return b
+
+    pipe = compose(
+        "t",
+        operation(counted("A", mul), "A", needs=["a", "b"], provides="ab"),
+        operation(counted("B", sub), "B", needs=["c", "d"], provides="cd"),
+        operation(counted("C", mul), "C", needs=["ab", "cd"], provides="abcd"),
+        operation(counted("F", fail), "F", needs="b", provides="f", endured=True),
+        operation(counted("G", abs), "G", needs="f", provides="g"),
+    )
+    inputs = {"a": 1, "b": 2, "c": 3, "d": 4}
+    sol = pipe.compute(dict(inputs), layered_solution=layered)
+    ab_layer = sol.executed[pipe.ops[0]]
+    calls.clear()
+
+    assert sol.recompute({"d": 5}) is sol
+    assert calls == ["B", "C"]
+    assert sol == pipe.compute({**inputs, "d": 5}, layered_solution=layered)
+    assert sol.executed[pipe.ops[0]] is ab_layer
+    assert list(sol.executed) == [pipe.ops[i] for i in (0, 3, 4, 1, 2)]
+    calls.clear()
+
+    ## Failures canceling downstream ops.
+    #
+    sol.recompute({"b": 6})
+    assert calls == ["A", "C", "F"]
+    assert sol == {"a": 1, "b": 6, "c": 3, "d": 5, "ab": 6, "cd": -2, "abcd": -12}
+    assert sol.canceled == {pipe.ops[4]: "unsatisfied-needs['f']"}
+    calls.clear()
+
+    sol.recompute({"b": 1})
+    assert calls == ["A", "C", "F", "G"]
+    assert sol["g"] == 1
+    assert not sol.canceled and not sol.check_if_incomplete()
+
+    with pytest.raises(ValueError, match="changed values for outputs\\['ab'\\]"):
+        sol.recompute({"ab": 1})
+    with pytest.raises(ValueError, match="with evictions"):
+        pipe.compute(inputs, "abcd").recompute({"d": 1})
+
+
 def test_solution_copy(samplenet):
     sol = samplenet(a=1, b=2)
     assert sol == sol.copy()
@@ -268,3 +732,66 @@ def test_solution_df_concat_delay_groups(monkeypatch):
     print(df.to_csv())
     assert [len(i) for i in concat_args] == [5, 5]
     assert_frame_equal(df, exp)
+
+
+def test_compute_async_concurrently():
+    delay = 0.2
+
+    async def fetch(x):
+        await asyncio.sleep(delay)
+        return x + 1
+
+    def add(a, b, c):
+        return a + b + c
+
+    pipe = compose(
+        "t",
+        operation(fetch, "A", needs="x", provides="a"),
+        operation(fetch, "B", needs="x", provides="b"),
+        operation(fetch, "C", needs="x", provides="c"),
+        operation(add, "ADD", needs=["a", "b", "c"], provides="abc"),
+    )
+    assert pipe.ops[0].is_async
+    assert not pipe.ops[-1].is_async
+
+    t0 = time()
+    sol = asyncio.run(pipe.compute_async({"x": 1}))
+    assert time() - t0 < 2 * delay
+    assert sol == {"x": 1, "a": 2, "b": 2, "c": 2, "abc": 6}
+    assert list(sol.executed)[-1] == "ADD"
+
+    ## Sequential execution awaits them one after the other.
+    assert pipe.compute({"x": 1}, "abc") == {"abc": 6}
+
+
+def test_compute_async_endured_failure():
+    async def fail(x):
+        raise ValueError("Boom!")
+
+    pipe = compose(
+        "t",
+        operation(fail, "A", needs="x", provides="a", endured=True),
+        operation(lambda x: x, "B", needs="x", provides="b"),
+        operation(lambda a: a, "C", needs="a", provides="c"),
+    )
+    sol = asyncio.run(pipe.compute_async({"x": 1}))
+    assert sol == {"x": 1, "b": 1}
+    assert isinstance(sol.executed["A"], ValueError)
+    assert list(sol.canceled) == ["C"]
+
+    with pytest.raises(ValueError, match="Boom!"):
+        asyncio.run(pipe.withset(endured=False).compute_async({"x": 1}))
+
+
+def test_compute_coroutine_op_in_running_loop():
+    async def fetch(x):
+        return x
+
+    op = operation(fetch, "A", needs="x", provides="a")
+    assert op.compute({"x": 1}) == {"a": 1}
+
+    async def nested():
+        return op.compute({"x": 1})
+
+    with pytest.raises(RuntimeError, match="compute_async"):
+        asyncio.run(nested())
@@ -1,6 +1,7 @@
 # Copyright 2016-2020, Yahoo Inc, Kostis Anagnostopoulos.
 # Licensed under the terms of the Apache License, Version 2.0. See the LICENSE file associated with the project for terms.
 """General :term:`network` & :term:`execution` tests. """
+import itertools
 import math
 import re
 import sys
@@ -980,6 +981,123 @@ def test_pre_callback(quarantine_pipeline, exemethod):
     }
 
 
+def test_compute_many(samplenet, monkeypatch):
+    compiled = []
+    orig_compile = samplenet.net.compile
+
+    def compile(*args, **kw):
+        compiled.append(args[0])
+        return orig_compile(*args, **kw)
+
+    monkeypatch.setattr(samplenet.net, "compile", compile)
+
+    records = [
+        {"a": 1, "b": 2},
+        {"c": 3, "d": 4},
+        {"b": 20, "a": 10},
+        {"a": 1, "b": 2, "c": 3, "d": 4},
+    ]
+    sols = samplenet.compute_many(iter(records))
+    assert not compiled, "Lazy generator computed!"
+
+    sols = list(sols)
+    assert len(compiled) == 3
+    assert sols[0].plan is sols[2].plan
+    assert sols[2] == {"a": 10, "b": 20, "sum1": 30}
+    assert [s == samplenet.compute(r) for s, r in zip(sols, records)] == [True] * 4
+
+    outs = list(samplenet.compute_many(records[2:], "sum1", outputs_only=True))
+    assert outs == [{"sum1": 30}, {"sum1": 3}]
+    assert all(type(o) is dict for o in outs)
+
+    with pytest.raises(ValueError, match="Unsolvable graph"):
+        list(samplenet.compute_many([{"a": 1}]))
+
+
+def test_compute_many_executor(samplenet):
+    from concurrent.futures import ThreadPoolExecutor
+
+    records = [{"a": i, "b": i, "c": i, "d": i} for i in range(20)]
+    with ThreadPoolExecutor(4) as executor, evictions_skipped(True):
+        outs = list(samplenet.compute_many(records, executor=executor))
+    assert [o["sum3"] for o in outs] == [3 * i for i in range(20)]
+    assert all(o["c"] == i for i, o in enumerate(outs)), "Evictions not skipped!"
+
+    pulled = []
+
+    def endless():
+        for i in itertools.count():
+            pulled.append(i)
+            yield {"a": i, "b": i, "c": i, "d": i}
+
+    with ThreadPoolExecutor(4) as executor:
+        sols = samplenet.compute_many(endless(), executor=executor, max_in_flight=3)
+        assert next(sols)["sum3"] == 0
+        assert len(pulled) == 3, "Not lazy!"
+        assert next(sols)["sum3"] == 3
+        sols.close()
+
+
+def test_stream_pipelined():
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    def stage(x):
+        time.sleep(0.1)
+        return x + 1
+
+    pipe = compose(
+        "t",
+        operation(stage, "s1", "a", "b"),
+        operation(stage, "s2", "b", "c"),
+        operation(stage, "s3", "c", "d"),
+    )
+    pulled = []
+
+    def records(n):
+        for i in range(n):
+            pulled.append(i)
+            yield {"a": i}
+
+    with ThreadPoolExecutor(8) as executor:
+        outs = pipe.stream(records(8), "d", max_in_flight=4, executor=executor)
+        assert not pulled, "Lazy generator computed!"
+
+        t0 = time.perf_counter()
+        assert next(outs)["d"] == 3
+        assert len(pulled) == 4, "Not backpressured!"
+        assert [s["d"] for s in outs] == [i + 3 for i in range(1, 8)]
+        # Serially, that would be 8 records x 3 stages x 0.1sec.
+        assert time.perf_counter() - t0 < 1.2
+
+    outs = list(
+        pipe.stream(
+            [{"a": 0}, {"a": 10}], "d", max_in_flight=1, ordered=False, outputs_only=True
+        )
+    )
+    assert outs == [{"d": 3}, {"d": 13}]
+
+
+def test_stream_unordered_n_errors(samplenet):
+    import time
+
+    def slow_sum(a, b):
+        time.sleep(0.2 if a else 0)
+        return a + b
+
+    pipe = compose("t", operation(slow_sum, "sum", ["a", "b"], "ab"))
+    records = [{"a": 1, "b": 1}, {"a": 0, "b": 2}]
+    sols = list(pipe.stream(records, ordered=False))
+    assert [s["a"] for s in sols] == [0, 1]
+
+    with pytest.raises(ValueError, match="max_in_flight"):
+        next(pipe.stream(records, max_in_flight=0))
+    with pytest.raises(ValueError, match="Unsolvable graph"):
+        list(samplenet.stream([{"a": 1}]))
+    with pytest.raises(TypeError):
+        list(pipe.stream([{"a": 1, "b": None}]))
+
+
 ##########
 ## Rerun, Replan, Recompute
 ##
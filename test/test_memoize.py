@@ -0,0 +1,175 @@
+# Copyright 2023-2023, Kostis Anagnostopoulos;
+# Licensed under the terms of the Apache License, Version 2.0. See the LICENSE file associated with the project for terms.
+"""Test :term:`memoization` of operation outputs."""
+from functools import partial
+from operator import add, mul
+
+import pytest
+
+from graphtik import compose, operation
+from graphtik.config import memo_store_plugged, operations_memoized
+from graphtik.memoize import DirMemoStore, LRUMemoStore, memo_key
+
+
+calls = []
+
+
+def counted_add(a, b):
+    calls.append("add")
+    return a + b
+
+
+def counted_mul(ab, c):
+    calls.append("mul")
+    return ab * c
+
+
+def test_memoize_op():
+    store = LRUMemoStore()
+    pipe = compose(
+        "t",
+        operation(counted_add, "add", ["a", "b"], "ab", memoize=store),
+        operation(counted_mul, "mul", ["ab", "c"], "abc", memoize=store),
+    )
+    calls.clear()
+    assert pipe(a=1, b=2, c=3) == {"a": 1, "b": 2, "c": 3, "ab": 3, "abc": 9}
+    assert calls == ["add", "mul"]
+    assert store.stats == {"hits": 0, "misses": 2, "evictions": 0, "size": 2}
+
+    assert pipe(a=1, b=2, c=3) == {"a": 1, "b": 2, "c": 3, "ab": 3, "abc": 9}
+    assert calls == ["add", "mul"]
+    assert store.hits == 2
+
+    ## Evictions must not corrupt memoized outputs.
+    assert pipe.compute({"a": 1, "b": 2, "c": 3}, "abc") == {"abc": 9}
+    assert pipe(a=1, b=2, c=3)["ab"] == 3
+
+    assert pipe(a=2, b=1, c=4)["abc"] == 12
+    assert calls == ["add", "mul", "add", "mul"]
+
+    assert pipe(a=2, b=1, c=3)["abc"] == 9
+    assert calls == ["add", "mul", "add", "mul"], "`ab` same as 1st run"
+
+
+def test_memoize_configs():
+    pipe = compose(
+        "t",
+        operation(counted_add, "add", ["a", "b"], "ab"),
+        operation(counted_mul, "mul", ["ab", "c"], "abc"),
+    )
+    calls.clear()
+    pipe(a=1, b=2, c=3)
+    pipe(a=1, b=2, c=3)
+    assert len(calls) == 4
+
+    store = LRUMemoStore()
+    with memo_store_plugged(store), operations_memoized():
+        pipe(a=1, b=2, c=3)
+        pipe(a=1, b=2, c=3)
+    assert len(calls) == 6
+    assert store.stats["hits"] == 2
+
+    pipe = compose(
+        "t",
+        operation(counted_add, "add", ["a", "b"], "ab", memoize=True),
+        operation(counted_mul, "mul", ["ab", "c"], "abc", memoize=True),
+    )
+    calls.clear()
+    with memo_store_plugged(store), operations_memoized(False):
+        pipe(a=1, b=2, c=3)
+    assert len(calls) == 2
+
+
+def test_lru_store_bounds(monkeypatch):
+    import time
+
+    now = [0]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+
+    store = LRUMemoStore(maxsize=2, ttl=10)
+    for k in "abc":
+        store.set(k, {k: 1})
+    assert len(store) == 2
+    assert store.evictions == 1
+    assert store.get("a") is store.get("a")  # UNSET
+
+    assert store.get("b") == {"b": 1}
+    now[0] = 11
+    assert store.get("c") is store.get("missing")
+    assert store.stats == {"hits": 1, "misses": 4, "evictions": 2, "size": 1}
+
+    store.clear()
+    assert store.stats == {"hits": 0, "misses": 0, "evictions": 0, "size": 0}
+
+
+def test_dir_store(tmp_path, exemethod):
+    pipe = compose(
+        "t",
+        operation(add, "add", needs=["a", "b"], provides="ab", memoize=True),
+        operation(mul, "mul", needs=["ab", "c"], provides="abc", memoize=True),
+        parallel=exemethod,
+    )
+    store = DirMemoStore(tmp_path, maxsize=3)
+    with memo_store_plugged(store):
+        assert pipe(a=1, b=2, c=3)["abc"] == 9
+        assert len(store) == 2
+
+        store = DirMemoStore(tmp_path, maxsize=3)
+        with memo_store_plugged(store):
+            assert pipe(a=1, b=2, c=3)["abc"] == 9
+            assert pipe(a=1, b=2, c=4)["abc"] == 12
+        assert len(store) == 3
+
+
+def test_memo_key():
+    op = operation(add, "add", needs=["a", "b"], provides="ab")
+    key = memo_key(op, {"a": 1, "b": 2, "c": 3})
+    assert key == memo_key(op, {"b": 2, "a": 1})
+    assert key != memo_key(op, {"a": 2, "b": 1})
+    assert key != memo_key(op.withset(name="ADD"), {"a": 1, "b": 2})
+    assert memo_key(op, {"a": lambda: 0, "b": 2}) is None
+
+
+def test_memo_key_fn_identity():
+    def make(k):
+        def scale(x):
+            return x * k
+
+        return scale
+
+    pipes = [
+        compose(str(k), operation(make(k), "scale", "x", "y", memoize=True))
+        for k in (2, 3)
+    ]
+    assert [p(x=10)["y"] for p in pipes] == [20, 30]
+
+    op = operation(partial(mul, 2), "scale", "x", "y")
+    assert memo_key(op, {"x": 1}) != memo_key(op.withset(fn=partial(mul, 3)), {"x": 1})
+    assert memo_key(op, {"x": 1}) == memo_key(
+        op.withset(fn=partial(mul, 2)), {"x": 1}
+    ), "same partial args"
+
+
+def test_memoize_mutable_bound_values(tmp_path, caplog):
+    cfg = {"k": 1}
+    op = operation(lambda a: a * cfg["k"], "scale", "a", "b", memoize=True)
+    assert memo_key(op, {"a": 2}) is None
+    assert "Not memoizing op(scale)" in caplog.text
+
+    pipe = compose("t", op)
+    store = LRUMemoStore()
+    with memo_store_plugged(store):
+        assert pipe(a=2)["b"] == 2
+        cfg["k"] = 10
+        assert pipe(a=2)["b"] == 20
+    assert len(store) == 0
+
+    ## Distinct functions binding objects never share persistent entries.
+    #
+    store = DirMemoStore(tmp_path)
+    ops = [
+        operation(partial(lambda o, a: a + len(o), o), "op", "a", "b", memoize=store)
+        for o in ([1], [1, 2])
+    ]
+    assert [compose("t", op)(a=0)["b"] for op in ops] == [1, 2]
+    assert len(store) == 0
@@ -0,0 +1,174 @@
+# Copyright 2023-2023, Kostis Anagnostopoulos;
+# Licensed under the terms of the Apache License, Version 2.0. See the LICENSE file associated with the project for terms.
+"""Test :term:`memory accounting` of solution values, and :term:`spill`\\ing them."""
+import os
+import sys
+
+import pytest
+
+from graphtik import compose, operation
+from graphtik.config import memory_accounted
+from graphtik.memory import MemoryTracker, Spilled, SpillStore, value_nbytes
+
+
+def test_value_nbytes():
+    assert value_nbytes(1) == sys.getsizeof(1)
+    s = "abc" * 100
+    assert value_nbytes([s, s]) == sys.getsizeof([s, s]) + sys.getsizeof(s)
+    assert value_nbytes({"k": s}) > sys.getsizeof(s)
+
+    class Obj:
+        def __init__(self):
+            self.payload = s
+
+    assert value_nbytes(Obj()) > sys.getsizeof(s)
+
+
+def test_value_nbytes_numpy_pandas():
+    np = pytest.importorskip("numpy")
+    arr = np.zeros(1000)
+    assert value_nbytes(arr) == 8000
+    assert value_nbytes([arr, arr]) == sys.getsizeof([arr, arr]) + 8000
+
+    pd = pytest.importorskip("pandas")
+    df = pd.DataFrame({"a": arr})
+    assert value_nbytes(df) == df.memory_usage(deep=True).sum()
+
+
+def test_tracker_overwrites():
+    mem = MemoryTracker(sizer=len)
+    mem.add([("a", "12"), ("b", "1234")], "op1", replace=False)
+    mem.add([("a", "123")], "op2", replace=False)
+    assert mem.live_bytes == 9
+    assert mem.evict("a") == 5
+    mem.add([("b", "1")], "op3", replace=True)
+    assert mem.stats == {
+        "peak_bytes": 9,
+        "peak_op": "op2",
+        "peak_values": {"a": 5, "b": 4},
+        "live_bytes": 1,
+        "evicted_bytes": 5,
+        "spilled_bytes": 0,
+    }
+
+
+@pytest.mark.parametrize("layered", [False, True])
+def test_solution_peak(layered):
+    pipe = compose(
+        "t",
+        operation(lambda a: "x" * 1000, "big", "a", "b"),
+        operation(len, "size", "b", "c"),
+        operation(lambda c: c + 1, "inc", "c", "d"),
+    )
+    assert pipe.compute({"a": 1}).memory is None, "disabled by default"
+
+    with memory_accounted():
+        sol = pipe.compute({"a": 1}, "d", layered_solution=layered)
+    mem = sol.memory
+    assert mem.peak_op == "big"
+    assert set(mem.peak_values) == {"a", "b"}
+    assert mem.peak_bytes > 1000
+    assert mem.live_bytes == value_nbytes(sol["d"])
+    assert mem.evicted_bytes >= mem.peak_bytes
+    assert mem.timeline[-1][1] == mem.live_bytes
+
+    with memory_accounted():
+        sol = pipe.compute({"a": 1}, layered_solution=layered)
+    assert sol.memory.evicted_bytes == 0
+    assert set(sol.memory.peak_values) == {"a", "b", "c", "d"}
+
+    sol.recompute({"a": 2})
+    assert sol.memory.live_bytes == sum(value_nbytes(v) for v in sol.values())
+
+
+@pytest.mark.parametrize("layered", [False, True])
+def test_spill_pickled(layered, tmp_path):
+    pipe = compose(
+        "t",
+        operation(lambda a: [a] * 1000, "mk1", "a", "b1"),
+        operation(lambda a: [a] * 1000, "mk2", "a", "b2"),
+        operation(lambda b2: len(b2), "len2", "b2", "c2"),
+        operation(lambda b1, c2: len(b1) + c2, "len1", ["b1", "c2"], "d"),
+    )
+    spill_dir = str(tmp_path / "spill")
+    kw = {"memory_budget": 10000, "layered_solution": layered}
+
+    ## Lookahead 3 keeps `b1` until the last op.
+    #
+    sol = pipe.compute({"a": 1}, spill_dir=spill_dir, **kw)
+    assert [ev[1:3] for ev in sol.events] == [("spill", "b2")]
+    assert sol["d"] == 2000
+    assert sol.memory.peak_bytes > 10000 > sol.memory.live_bytes
+    assert sol.memory.spilled_bytes == value_nbytes([1] * 1000)
+    holder = sol.maps[0] if not layered else sol.executed[pipe.ops[1]]
+    assert isinstance(dict.get(holder, "b2"), Spilled)
+    assert sol["b2"] == [1] * 1000, "transparently loaded back"
+    assert "b2" in sol.memory.sizes
+    assert not isinstance(dict.get(holder, "b2"), Spilled)
+    assert not os.listdir(spill_dir), "loaded spill not deleted"
+
+    sol = pipe.compute({"a": 1}, spill_dir=SpillStore(spill_dir, lookahead=1), **kw)
+    # `b1` reloaded for the last op exceeds the budget again, spilling `b2`.
+    assert [ev[1:3] for ev in sol.events] == [("spill", "b1"), ("spill", "b2")]
+    assert sol["d"] == 2000
+
+    assert sol.memory.spilled_bytes == 2 * value_nbytes([1] * 1000), "re-spill counted"
+    assert len(os.listdir(spill_dir)) == 1
+
+    sol = pipe.compute({"a": 1}, "d", spill_dir=spill_dir, **kw)
+    assert dict(sol) == {"d": 2000}
+    assert len(os.listdir(spill_dir)) == 1, "evicted spill not deleted"
+
+
+def test_spill_skips_evicted_next(tmp_path):
+    pipe = compose(
+        "t",
+        operation(lambda a: [a] * 1000, "mk", "a", "b"),
+        operation(len, "len", "b", "c"),
+        operation(lambda c: [c] * 1000, "mk2", "c", "d"),
+    )
+    spill_dir = str(tmp_path)
+    sol = pipe.compute({"a": 1}, "d", memory_budget=1000, spill_dir=spill_dir)
+    assert len(sol["d"]) == 1000
+    assert "b" not in {ev[2] for ev in sol.events if ev[1] == "spill"}
+    assert not os.listdir(spill_dir)
+
+
+def test_spill_numpy_mmap():
+    np = pytest.importorskip("numpy")
+    pipe = compose(
+        "t",
+        operation(lambda a: np.full(1000, a), "mk1", "a", "b1"),
+        operation(lambda a: np.full(1000, a), "mk2", "a", "b2"),
+        operation(lambda b2: len(b2), "len2", "b2", "c2"),
+        operation(lambda b1, c2: len(b1) + c2, "len1", ["b1", "c2"], "d"),
+    )
+
+    store = SpillStore(lookahead=1)
+    sol = pipe.compute({"a": 1}, memory_budget=10000, spill_dir=store)
+    assert sol["d"] == 2000
+    b1 = sol["b1"]
+    assert isinstance(b1, np.memmap)
+    assert (b1 == 1).all()
+    assert "b1" not in sol.memory.sizes, "mapped values not live"
+    n_files = len(os.listdir(store.directory))
+    del sol["b1"]
+    assert len(os.listdir(store.directory)) == n_files - 1, "mapped spill not deleted"
+    directory = store.directory
+    assert os.path.isdir(directory)
+    del sol, store, b1
+    assert not os.path.isdir(directory), "temp spill-dir not removed"
+
+
+def test_spill_keeps_inputs():
+    pipe = compose(
+        "t",
+        operation(lambda a: a[:10], "mk1", "a", "b1"),
+        operation(lambda a: a[:10], "mk2", "a", "b2"),
+        operation(lambda b2: len(b2), "len2", "b2", "c2"),
+        operation(lambda b1, c2: len(b1) + c2, "len1", ["b1", "c2"], "d"),
+    )
+    sol = pipe.compute({"a": "x" * 10000}, memory_budget=100)
+    assert "a" not in {ev[2] for ev in sol.events}
+    assert type(sol["a"]) is str
+    assert sol["d"] == 20
@@ -2,13 +2,18 @@
 # Licensed under the terms of the Apache License, Version 2.0. See the LICENSE file associated with the project for terms.
 """mostly :mod:`networkx` routines tests"""
 
+from itertools import combinations
+
 import networkx as nx
 import pytest
 from networkx.readwrite.edgelist import parse_edgelist
 
-from graphtik import operation
+from graphtik import compose, modify, operation, optional, sfxed
+from graphtik.config import plan_cache_sized, plan_caches_shared, planning_compacted
 from graphtik.planning import (
     Network,
+    PlanCache,
+    shared_plan_cache,
     yield_also_chaindocs,
     yield_also_subdocs,
     yield_also_superdocs,
@@ -186,3 +191,164 @@ def test_yield_chained_docs_root(g):
 def test_node_clashes(ops, err):
     with pytest.raises(ValueError, match=err):
         Network(*ops())
+
+
+def test_plan_cache():
+    ops = [
+        operation(str, "op1", needs="a", provides="b"),
+        operation(str, "op2", needs="b", provides="c"),
+    ]
+    with plan_cache_sized(2):
+        net = Network(*ops)
+    cache = net.plan_cache
+    assert cache.maxsize == 2
+
+    plan = net.compile("a")
+    assert net.compile("a") is plan
+    assert net.compile("a", "b") is not plan
+    assert cache.stats["hits"] == 1 and cache.stats["misses"] == 2
+    assert cache.compile_sec > 0
+
+    net.compile("a", "c")
+    assert len(cache) == 2 and cache.evictions == 1
+    net.compile("a", "b")  # recently used, `None` outputs evicted
+    assert cache.hits == 2
+    assert net.compile("a") is not plan
+    assert cache.stats == {
+        "hits": 2,
+        "misses": 4,
+        "evictions": 2,
+        "compile_sec": cache.compile_sec,
+        "size": 2,
+        "maxsize": 2,
+    }
+
+    assert Network(*ops).plan_cache is not cache, "shared only if asked"
+
+    cache.clear()
+    assert cache.stats["misses"] == len(cache) == 0
+
+
+def test_plan_cache_shared():
+    ops = [
+        operation(str, "op1", needs="a", provides="b"),
+        operation(str, "op2", needs="b", provides="c"),
+    ]
+    with plan_caches_shared():
+        p1, p2 = compose("p1", *ops), compose("p2", *ops)
+        assert Network(*ops[::-1]).plan_cache is not p1.net.plan_cache
+    cache = p1.net.plan_cache
+    assert p2.net.plan_cache is cache
+    assert Network(*ops, plan_cache=shared_plan_cache(ops)).plan_cache is cache
+    assert Network(*ops, plan_cache=PlanCache()).plan_cache is not cache
+
+    plan1 = p1.net.compile("a")
+    plan2 = p2.net.compile("a")
+    assert cache.stats["hits"] == 1 and len(cache) == 1
+    assert plan1.net is p1.net
+    assert plan2.net is p2.net
+    assert plan2.steps == plan1.steps
+    assert p2.compute({"a": 1}) == {"a": 1, "b": "1", "c": "1"}
+
+
+def test_export_load_plans(tmp_path):
+    def make_ops(fn=str):
+        return [
+            operation(fn, "op1", needs="a", provides="b"),
+            operation(lambda b: b, "op2", needs="b", provides="c"),
+        ]
+
+    net = Network(*make_ops())
+    plans = [net.compile("a"), net.compile("a", "b")]
+    net.compile("a", predicate=lambda op, data: True)
+    fpath = tmp_path / "plans.pkl"
+    assert net.export_plans(fpath) == 2
+
+    net2 = Network(*make_ops(repr))
+    assert net2.fingerprint == net.fingerprint
+    assert net2.load_plans(fpath) == 2
+    assert net2.plan_cache.compile_sec == 0
+    plan = net2.compile("a")
+    assert net2.plan_cache.stats["hits"] == 1
+    assert plan.net is net2
+    assert plan.steps == plans[0].steps
+    assert plan.dag.edges == plans[0].dag.edges
+    assert plan.execute({"a": 1}) == {"a": 1, "b": "1", "c": "1"}
+    assert net2.compile("a", "b").steps == plans[1].steps
+
+    net3 = Network(*make_ops(), operation(str, "op3", needs="c", provides="d"))
+    assert net3.fingerprint != net.fingerprint
+    assert net3.load_plans(fpath) == 0
+    assert len(net3.plan_cache) == 0
+
+
+@pytest.mark.parametrize(
+    "ops",
+    [
+        lambda: [
+            operation(str, "f1", needs="a", provides="b"),
+            operation(str, "f2", needs="b", provides="a"),
+            operation(str, "f3", needs=["b", optional("x")], provides="c"),
+            operation(str, "f4", needs=["c", "x"], provides=["d", "e"]),
+        ],
+        lambda: [
+            operation(str, "f1", needs="a", provides=[modify("A/b"), "b"]),
+            operation(str, "f2", needs=modify("A/b"), provides=[sfxed("S", "s"), "c"]),
+            operation(str, "f3", needs=[sfxed("S", "s"), "b"], provides="d"),
+            operation(str, "f4", needs=[modify("A/c")], provides="e"),
+        ],
+    ],
+)
+def test_compact_planning(ops):
+    net = Network(*ops())
+    deps = sorted(str(d) for d in (*net.needs, *net.provides))
+    io_pairs = [
+        (inputs, outputs)
+        for inputs in [None, *combinations(deps, 1), *combinations(deps, 2)]
+        for outputs in [None, *combinations(deps, 1)]
+    ]
+    for predicate in [None, lambda op, data: op.name != "f3"]:
+        for inputs, outputs in io_pairs:
+            results = []
+            for compact in (False, True):
+                with planning_compacted(compact):
+                    try:
+                        res = net._prune_graph(inputs, outputs, predicate)
+                    except Exception as ex:
+                        res = type(ex)
+                results.append(res)
+            if isinstance(results[0], type):
+                assert results[0] is results[1]
+                continue
+            (dag1, sorted1, *io1, com1), (dag2, sorted2, *io2, com2) = results
+            assert dict(dag1.nodes.items()) == dict(dag2.nodes.items())
+            assert dict(dag1.edges.items()) == dict(dag2.edges.items())
+            assert set(sorted1) == set(sorted2)
+            assert io1 == io2
+            # Nodes in messages may be given/asked equal strings (without modifiers).
+            assert {k: v.split("[")[0] for k, v in com1.items()} == {
+                k: v.split("[")[0] for k, v in com2.items()
+            }
+
+
+def test_compact_planning_cycles():
+    pipe = compose(
+        ..., operation(str, "cyclic1", "a", "b"), operation(str, "cyclic2", "b", "a")
+    )
+    with planning_compacted(), pytest.raises(nx.NetworkXUnfeasible, match="TIP:"):
+        pipe.compute()
+    with planning_compacted():
+        assert pipe.compute({"a": 1}, "b") == {"b": "1"}
+
+
+def test_eviction_steps_long_chain():
+    n = 300
+    ops = [operation(str, f"op{i}", f"d{i}", f"d{i+1}") for i in range(n)]
+    ops.append(operation(str, "last", ["d0", f"d{n}"], "out"))
+    plan = compose("chain", *ops).compile("d0", "out")
+
+    expected = ["op0", "op1", "d1"]
+    for i in range(2, n):
+        expected.extend((f"op{i}", f"d{i}"))
+    expected.extend(("last", "d0", f"d{n}"))
+    assert [getattr(s, "name", s) for s in plan.steps] == expected
@@ -0,0 +1,80 @@
+# Copyright 2023-2023, Kostis Anagnostopoulos;
+# Licensed under the terms of the Apache License, Version 2.0. See the LICENSE file associated with the project for terms.
+"""Test :term:`profiling` of operations across runs."""
+import asyncio
+import json
+import time
+
+from graphtik import compose, operation
+from graphtik.config import profiler_plugged
+from graphtik.profiling import Profiler, percentile
+
+
+def _slow(x):
+    time.sleep(0.02)
+    return x
+
+
+def test_percentile():
+    assert percentile([], 50) is None
+    samples = list(range(1, 101))
+    assert percentile(samples, 50) == 50
+    assert percentile(samples, 95) == 95
+    assert percentile(samples, 99) == 99
+    assert percentile([7], 99) == 7
+
+
+def test_profile_report(exemethod):
+    pipe = compose(
+        "t",
+        operation(_slow, "slow", "x", "y"),
+        operation(str, "fast", "y", "z"),
+        operation(str, "side", "x", "w"),
+        parallel=exemethod,
+    )
+    assert not pipe.compute({"x": 1}).profiles, "profiling off by default"
+
+    report = pipe.profile({"x": 1}, runs=3)
+
+    assert report.critical_path == ["slow", "fast"]
+    rows = {r["op"]: r for r in report.rows}
+    assert set(rows) == {"slow", "fast", "side"}
+    assert all(r["count"] == 3 for r in rows.values())
+    slow = rows["slow"]
+    assert slow["self_ms"] >= 20
+    assert slow["p50_ms"] <= slow["p95_ms"] <= slow["p99_ms"]
+    assert slow["output_size"] > 0
+    assert 0.9 < slow["critical_share"] <= 1
+    assert rows["side"]["critical_share"] == 0
+    assert [r["op"] for r in report.by_self_time()][0] == "slow"
+    assert [r["op"] for r in report.by_critical_path()][:2] == ["slow", "fast"]
+
+    assert json.loads(report.to_json())["critical_path"] == ["slow", "fast"]
+    lines = str(report).splitlines()
+    assert lines[0].split()[:2] == ["op", "count"]
+    assert len(lines) == 5
+
+
+def test_profiler_across_runs():
+    pipe = compose(
+        "t",
+        operation(_slow, "slow", "x", "y"),
+        operation(str, "fast", "y", "z"),
+        operation(str, "side", "x", "w"),
+    )
+    profiler = Profiler(max_samples=2)
+    with profiler_plugged(profiler):
+        sol = pipe.compute({"x": 1}, "z")
+        assert set(sol.profiles) == {pipe.ops[0], pipe.ops[1]}
+        assert set(sol.profiles[pipe.ops[0]]) >= {"compute_ms", "queue_ms"}
+        asyncio.run(pipe.compute_async({"x": 1}))
+
+    assert profiler.stats()["slow"]["count"] == 2
+    assert profiler.stats()["side"]["count"] == 1
+    report = pipe.profile({"x": 1}, profiler=profiler)
+    assert {r["op"]: r["count"] for r in report.rows} == {
+        "slow": 3,
+        "fast": 3,
+        "side": 2,
+    }
+    assert len(profiler._stats["slow"].samples) == 2
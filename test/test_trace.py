@@ -0,0 +1,68 @@
+# Copyright 2023-2023, Kostis Anagnostopoulos;
+# Licensed under the terms of the Apache License, Version 2.0. See the LICENSE file associated with the project for terms.
+"""Test Chrome-trace export of the :term:`execution timeline`."""
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from graphtik import compose, operation
+from graphtik.config import execution_pool_plugged, profiler_plugged
+from graphtik.profiling import Profiler
+
+
+def _fail(x):
+    raise ValueError("Boom!")
+
+
+def _by_phase(events, ph):
+    return [e for e in events if e["ph"] == ph]
+
+
+def test_trace_sequential(tmp_path):
+    pipe = compose(
+        "t",
+        operation(str, "a", "x", "y"),
+        operation(str, "b", "y", "z"),
+        operation(_fail, "bad", "x", "w", endured=True),
+        operation(str, "c", "w", "v"),
+    )
+    sol = pipe.compute({"x": 1}, ["z", "v"])
+    fpath = tmp_path / "trace.json"
+    trace = sol.to_chrome_trace(str(fpath))
+    assert json.loads(fpath.read_text()) == json.loads(json.dumps(trace))
+
+    events = trace["traceEvents"]
+    begins = _by_phase(events, "b")
+    assert [e["name"] for e in begins] == ["a", "b", "bad"]
+    assert begins[-1]["args"] == {"status": "failed"}
+    assert len(_by_phase(events, "e")) == 3
+    assert not _by_phase(events, "X"), "worker spans only while profiling"
+
+    instants = {e["name"]: e for e in _by_phase(events, "i")}
+    assert {"evict y", "failed bad", "reschedule bad"} <= set(instants)
+    assert instants["reschedule bad"]["args"]["canceled"] == ["c"]
+    assert all(e["ts"] >= 0 for e in events if "ts" in e)
+
+
+def test_trace_pooled_profiled():
+    pipe = compose(
+        "t",
+        operation(str, "a", "x", "y"),
+        operation(str, "b", "y", "z"),
+        parallel=True,
+    )
+    with ThreadPoolExecutor(2) as pool, execution_pool_plugged(
+        pool
+    ), profiler_plugged(Profiler()):
+        sol = pipe.compute({"x": 1}, "z")
+
+    events = sol.to_chrome_trace()["traceEvents"]
+    ops = [e for e in _by_phase(events, "X") if e["cat"] == "op"]
+    assert {e["name"] for e in ops} == {"a", "b"}
+    computes = [e for e in _by_phase(events, "X") if e["name"] == "compute"]
+    assert len(computes) == 2
+    threads = {
+        e["args"]["name"] for e in _by_phase(events, "M") if e["name"] == "thread_name"
+    }
+    assert "solution" in threads
+    assert any(t.startswith("ThreadPoolExecutor") for t in threads)
+    assert {e["name"] for e in _by_phase(events, "b")} >= {"a", "b"}